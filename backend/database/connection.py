@@ -1,4 +1,5 @@
 ﻿from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ReturnDocument
 from datetime import datetime
 from dotenv import load_dotenv, find_dotenv
 from typing import List
@@ -39,6 +40,24 @@ def get_db() -> AsyncIOMotorDatabase:
     assert db is not None, "DB is not connected. Did you call connect_to_mongo()?"
     return db
 
+async def get_data_version(key: str) -> int:
+    """data_versions 컬렉션에 저장된 데이터 버전 카운터를 읽는다(없으면 0)."""
+    doc = await get_db().data_versions.find_one({"_id": key})
+    return int((doc or {}).get("version", 0) or 0)
+
+async def bump_data_version(key: str) -> int:
+    """
+    데이터 버전 카운터를 1 올리고 새 버전을 반환.
+    여러 워커가 이 값을 폴링해서 각자의 인메모리 캐시를 갱신한다.
+    """
+    doc = await get_db().data_versions.find_one_and_update(
+        {"_id": key},
+        {"$inc": {"version": 1}, "$set": {"updated_at": now_iso()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return int(doc["version"])
+
 async def get_course_collections() -> List[AsyncIOMotorCollection]:
     """
     1) COURSE_COLLECTIONS=.env??吏?뺣뤌 ?덉쑝硫?洹?紐⑸줉 ?ъ슜
@@ -47,23 +66,28 @@ async def get_course_collections() -> List[AsyncIOMotorCollection]:
        - ?뱀떆 ?곕뒗 援먯뼇??而щ젆?섏씠 ?곕줈 ?덉쑝硫?異붽?
     """
     database = get_db()
+    names = COURSE_COLLECTIONS or select_course_collections(await database.list_collection_names())
+    return [database[name] for name in names]
+
+def select_course_collections(all_names: List[str]) -> List[str]:
+    """
+    COURSE_COLLECTIONS가 있으면 그 목록, 없으면 all_names 중 과목 컬렉션을 골라낸다.
+    (database.course_registry도 같은 정책을 쓴다)
+    """
     # Use configured COURSE_COLLECTIONS; ignore any single-collection overrides
-    names = COURSE_COLLECTIONS
+    names = list(COURSE_COLLECTIONS)
     if not names:
-        all_names = await database.list_collection_names()
         names = [n for n in all_names if n.startswith("courses_")]
         # ?꾩슂?섎㈃ ?꾨옒 異붽?:
         for extra in ("core_general", "balance_general", "basic_general", "courses_NormalStudy"):
-            if extra in all_names:
+            if extra in all_names and extra not in names:
                 names.append(extra)
-
-    return [database[name] for name in names]
+    return names
 
 async def ensure_indexes():
     for coll in await get_course_collections():
         await coll.create_index("course_code")
         await coll.create_index([("year", 1), ("group", 1), ("category", 1)])
-        try:
-            await coll.create_index([("course_name", "text"), ("professor", "text"), ("category", "text")]) 
-        except Exception:
-            pass
+        # /courses 전역 정렬 + keyset 커서 seek 용
+        await coll.create_index([("requirement_id", 1), ("course_code", 1), ("_id", 1)])
+        # q 검색은 routers.courses의 n-gram 색인이 담당 (텍스트 인덱스는 한글 토큰화를 못 해 쓰지 않음)
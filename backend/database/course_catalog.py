@@ -0,0 +1,254 @@
+# backend/database/course_catalog.py
+#
+# 과목 데이터는 courses_<연도>_major[_sci|_sw|_bd], core_general, balance_general,
+# basic_general, courses_NormalStudy 등 여러 컬렉션에 흩어져 있다.
+# 이 모듈은 그 원본 컬렉션들을 정규화된 하나의 course_catalog 컬렉션으로 합친다.
+# 문자열 캐스팅과 컬렉션명 기반 기본값 주입, 필드명 보정(normalize_course)을 적재할 때 한 번만 한다.
+# 카탈로그에서 읽는 쪽(routers.courses._response_doc)은 다시 정규화하지 않는다.
+#
+# db.courses는 싣지 않는다. 수강 기록/졸업요건이 읽는 과목표로, category가 MAJOR/GENERAL/ELECTIVE인
+# 다른 스키마이고 외부 ETL이 채운다. 읽기 경로와 버전 카운터("course_table")는
+# database.course_lookup 한 곳에 있다.
+#
+# 적재는 임시 컬렉션에 전부 쓰고 인덱스까지 만든 뒤 renameCollection(dropTarget)으로
+# 통째로 교체하므로, 읽는 쪽은 빌드 중에도 이전 카탈로그를 온전히 본다.
+from typing import Any, Dict, List, Optional
+import logging
+import os
+import re
+import time
+
+from bson import Binary, ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from database.connection import get_course_collections, bump_data_version, now_iso
+from utils.timeslot import mask_from_bytes, mask_to_bytes, timeslot_mask
+
+logger = logging.getLogger("app.course_catalog")
+
+CATALOG_COLLECTION = os.getenv("COURSE_CATALOG_COLLECTION", "course_catalog")
+# 과목 데이터 버전 키 (routers.courses의 스냅샷이 이 값을 폴링)
+COURSES_VERSION_KEY = "courses"
+# timeslot을 해석한 주간 비트마스크 (utils.timeslot, BinData). 해석할 수 없으면 필드가 없다
+TIMESLOT_MASK_FIELD = "timeslot_mask"
+# 마스크를 만들 때 보는 필드 (normalize_course의 timeslot backfill 순서 + 대시보드 schedule 배열)
+TIMESLOT_SOURCE_KEYS = ("timeslot", "time", "times", "schedule", "시간표")
+
+CATALOG_INDEXES = [
+    [("course_code", 1)],
+    [("year", 1), ("group", 1), ("category", 1)],
+    # /courses 전역 정렬 + keyset 커서 seek 용
+    [("requirement_id", 1), ("course_code", 1), ("_id", 1)],
+    # ?collection= 필터 + 같은 정렬
+    [("source_collection", 1), ("requirement_id", 1), ("course_code", 1), ("_id", 1)],
+]
+
+# --- 컬렉션명으로 기본값 추론 ---------------------------------------------------
+
+def defaults_from_collection(name: str) -> Dict[str, Any]:
+    """
+    예) courses_2025_major, courses_2023_major_sci, core_general ...
+    컬렉션명으로부터 year/group/major_track/general_type/source_collection 기본값 추론
+    """
+    d: Dict[str, Any] = {"source_collection": name}
+
+    if name.startswith("courses_") and "_major" in name:
+        # year
+        m = re.search(r"courses_(\d{4})_major", name)
+        if m:
+            try:
+                d["year"] = int(m.group(1))
+            except Exception:
+                pass
+        d["group"] = "전공"
+
+        # track suffix (선택)
+        if name.endswith("_sci"):
+            d["major_track"] = "컴퓨터 과학"
+        elif name.endswith("_sw"):
+            d["major_track"] = "컴퓨터 소프트웨어"
+        elif name.endswith("_bd"):
+            d["major_track"] = "빅데이터"
+
+    elif name == "courses_NormalStudy":
+        d["group"] = "일반선택/교직"
+        d["general_type"] = "일반선택/교직"
+
+    elif name == "core_general":
+        d["group"] = "교양"
+        d["general_type"] = "핵심 교양"
+
+    elif name == "balance_general":
+        d["group"] = "교양"
+        d["general_type"] = "균형 교양"
+
+    elif name == "basic_general":
+        d["group"] = "교양"
+        d["general_type"] = "기초 교양"
+
+    return d
+
+# --- 타입 캐스팅 + 기본값 주입 --------------------------------------------------
+
+STRING_KEYS = ("course_code", "requirement_id", "category", "course_name", "professor")
+
+def coerce_and_fill(doc: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    - 숫자/기타 타입으로 저장된 문자열 필드들을 str로 강제 캐스팅
+    - 컬렉션명에서 유도한 기본값들을 비어있을 때만 주입
+    """
+    if not doc:
+        return doc
+
+    # 문자열 강제 변환
+    for k in STRING_KEYS:
+        if k in doc and doc[k] is not None and not isinstance(doc[k], str):
+            doc[k] = str(doc[k])
+
+    # 기본값 주입
+    if "source_collection" not in doc or doc.get("source_collection") is None:
+        if "source_collection" in defaults:
+            doc["source_collection"] = defaults["source_collection"]
+
+    for k in ("year", "group", "major_track", "general_type"):
+        if doc.get(k) is None and defaults.get(k) is not None:
+            doc[k] = defaults[k]
+
+    # _id 제거 (응답 모델과 일치)
+    doc.pop("_id", None)
+    return doc
+
+# --- 응답용 정규화 (필드명 변형 보정) -------------------------------------------
+
+def normalize_course(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not isinstance(doc, Dict):
+        return None
+    d = dict(doc)
+    # course_name backfill
+    if not d.get("course_name"):
+        for k in ("name", "title", "courseTitle", "과목명"):
+            v = d.get(k)
+            if isinstance(v, str) and v.strip():
+                d["course_name"] = v.strip()
+                break
+    if not d.get("course_name"):
+        return None
+    # timeslot backfill
+    if not d.get("timeslot"):
+        for k in ("time", "times", "schedule", "시간표"):
+            v = d.get(k)
+            if isinstance(v, str) and v.strip():
+                d["timeslot"] = v.strip()
+                break
+    # class backfill (normalize into key 'class')
+    if not d.get("class"):
+        for k in ("class", "section", "분반"):
+            v = d.get(k)
+            if isinstance(v, str) and v.strip():
+                d["class"] = v.strip()
+                break
+    # credits backfill
+    if d.get("credits") is None:
+        v = d.get("credit")
+        if isinstance(v, (int, float)):
+            d["credits"] = int(v)
+        else:
+            try:
+                d["credits"] = int(str(v)) if v is not None else None
+            except Exception:
+                pass
+    # course_code cast to string if numeric
+    cc = d.get("course_code")
+    if isinstance(cc, (int, float)):
+        d["course_code"] = str(int(cc))
+    return d
+
+# --- 강의 시간 비트마스크 -------------------------------------------------------
+
+def course_timeslot_mask(doc: Dict[str, Any]) -> Optional[int]:
+    """저장된 timeslot_mask가 있으면 그 값, 없으면 시간 필드를 해석한 값. 모르면 None."""
+    stored = doc.get(TIMESLOT_MASK_FIELD)
+    if isinstance(stored, bytes):
+        return mask_from_bytes(stored)
+    for k in TIMESLOT_SOURCE_KEYS:
+        mask = timeslot_mask(doc.get(k))
+        if mask is not None:
+            return mask
+    return None
+
+
+def timeslot_mask_value(mask: int) -> Binary:
+    # 140비트라 int64에 안 들어가므로 BinData로 저장 ($bitsAllClear는 BinData 비트 위치를 그대로 본다)
+    return Binary(mask_to_bytes(mask))
+
+# --- ETL: 원본 컬렉션들 → course_catalog -----------------------------------------
+
+def catalog_document(raw: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """
+    원본 문서 하나를 카탈로그 문서로 변환.
+    과목명이 없어 응답에서 빠지는 문서도 개수 집계가 원본과 같도록 그대로 싣는다.
+    """
+    doc = coerce_and_fill(dict(raw), defaults_from_collection(source))
+    doc = normalize_course(doc) or doc
+    doc["source_id"] = raw.get("_id")  # 원본 컬렉션의 _id (추적용)
+    mask = course_timeslot_mask(doc)
+    if mask is not None:
+        doc[TIMESLOT_MASK_FIELD] = timeslot_mask_value(mask)
+    return doc
+
+
+async def build_course_catalog(
+    db: AsyncIOMotorDatabase,
+    sources: Optional[List[str]] = None,
+    batch_size: int = 1000,
+) -> Dict[str, Any]:
+    """
+    원본 과목 컬렉션들을 읽어 course_catalog를 새로 만들고 교체한다.
+    sources가 없으면 get_course_collections() 정책을 따른다. 적재할 문서가 하나도
+    없으면 기존 카탈로그를 지우지 않고 ValueError.
+    """
+    started = time.monotonic()
+    if sources is None:
+        sources = [col.name for col in await get_course_collections()]
+    sources = [s for s in sources if s != CATALOG_COLLECTION]
+
+    staging = db[f"{CATALOG_COLLECTION}__build_{ObjectId()}"]
+    counts: Dict[str, int] = {}
+    try:
+        for name in sources:
+            n = 0
+            batch: List[Dict[str, Any]] = []
+            async for raw in db[name].find({}):
+                batch.append(catalog_document(raw, name))
+                if len(batch) >= batch_size:
+                    await staging.insert_many(batch, ordered=False)
+                    n += len(batch)
+                    batch = []
+            if batch:
+                await staging.insert_many(batch, ordered=False)
+                n += len(batch)
+            counts[name] = n
+
+        total = sum(counts.values())
+        if total == 0:
+            raise ValueError("no course documents found in source collections")
+
+        for keys in CATALOG_INDEXES:
+            await staging.create_index(keys)
+        # 같은 DB 안의 renameCollection은 원자적: 읽는 쪽은 이전/새 카탈로그 중 하나만 본다
+        await staging.rename(CATALOG_COLLECTION, dropTarget=True)
+    except BaseException:
+        await staging.drop()
+        raise
+
+    version = await bump_data_version(COURSES_VERSION_KEY)
+    result = {
+        "collection": CATALOG_COLLECTION,
+        "sources": counts,
+        "total": total,
+        "version": version,
+        "built_at": now_iso(),
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+    logger.info("course catalog built total=%d sources=%d version=%d", total, len(counts), version)
+    return result
@@ -0,0 +1,87 @@
+# backend/database/course_lookup.py
+#
+# 수강 기록(enrollments)의 course_code로 db.courses 과목 정보를 찾는 공용 리졸버.
+# 예전에는 수강 기록마다 db.courses.find_one을 따로 보냈다(N+1).
+# 지금은 같은 틱에 요청된 코드를 모아 {"course_code": {"$in": [...]}} 한 번으로 조회하고,
+# 요청 하나 동안은 결과를 메모한다.
+#
+# db.courses 버전 카운터
+# db.courses는 과목 카탈로그(courses_* 컬렉션, database.course_catalog / routers.courses의
+# "courses" 카운터)와 별개 컬렉션이라 카운터도 따로 둔다 (data_versions의 "course_table").
+# 이 저장소에는 db.courses에 쓰는 코드가 없다 — 외부 시드/ETL이 채운다. 그래서 db.courses를 바꾼 쪽이
+# course_table_changed()를 부르거나 `python -m scripts.mark_course_table_changed`를 돌려 카운터를 올린다.
+# db.courses를 읽는 곳은 모두 이 모듈을 거친다. 프로세스 메모리에 들고 있는 곳은 이 카운터로 다시 읽는다:
+#   - routers.graduation 추천 색인 (list_courses)
+# 요청마다/실행마다 새로 읽는 곳은 카운터가 필요 없다:
+#   - 이 리졸버 (졸업요건 현황/시뮬레이션, 수강 기록 생성/수정/삭제)
+#   - database.student_progress 재계산 (fetch_courses_by_code, 스냅샷 없는 옛 기록만)
+#   - routers.mypage 필수 과목 목록 (list_courses)
+#   - scripts.audit_graduation / scripts.rebuild_student_progress 일괄 작업 (load_course_table,
+#     결과 요약에 읽은 시점의 course_table 버전을 싣는다)
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+from database.connection import bump_data_version, get_data_version, get_db
+from utils.batch_loader import BatchLoader
+
+CourseResolver = BatchLoader[str, Dict[str, Any]]
+
+COURSE_TABLE_VERSION_KEY = "course_table"
+CURSOR_BATCH_SIZE = 2000
+
+
+def code_variants(codes: List[str]) -> List[Any]:
+    """course_code가 숫자로 저장된 문서도 찾도록 숫자형 코드는 int 값도 함께 넣는다."""
+    variants: List[Any] = list(codes)
+    for code in codes:
+        if code.isdigit():
+            variants.append(int(code))
+    return variants
+
+
+async def fetch_courses_by_code(collection: AsyncIOMotorCollection, codes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """코드별 첫 문서 (find_one과 같은 자연 순서 기준). 키는 문자열 코드."""
+    found: Dict[str, Dict[str, Any]] = {}
+    async for doc in collection.find({"course_code": {"$in": code_variants(codes)}}):
+        found.setdefault(str(doc.get("course_code")), doc)
+    return found
+
+
+async def load_course_table(
+    db: AsyncIOMotorDatabase, projection: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """db.courses 전체 → course_code(문자열) → 첫 과목 문서 (fetch_courses_by_code와 같은 기준). 일괄 작업용."""
+    courses: Dict[str, Dict[str, Any]] = {}
+    async for doc in db.courses.find({}, projection).batch_size(CURSOR_BATCH_SIZE):
+        if doc.get("course_code") is not None:
+            courses.setdefault(str(doc["course_code"]), doc)
+    return courses
+
+
+async def list_courses(
+    db: AsyncIOMotorDatabase, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """db.courses 문서 목록 (자연 순서 그대로)."""
+    return await db.courses.find(query or {}, projection).to_list(None)
+
+
+def course_resolver(db: Optional[AsyncIOMotorDatabase] = None) -> CourseResolver:
+    """db.courses용 리졸버. 요청마다 새로 만들어야 메모가 요청 범위로 한정된다."""
+    collection = (db if db is not None else get_db()).courses
+    return BatchLoader(lambda codes: fetch_courses_by_code(collection, codes))
+
+
+async def get_course_resolver() -> CourseResolver:
+    """FastAPI 의존성: Depends(get_course_resolver)"""
+    return course_resolver()
+
+
+async def course_table_version() -> int:
+    """db.courses 버전 카운터 (없으면 0)."""
+    return await get_data_version(COURSE_TABLE_VERSION_KEY)
+
+
+async def course_table_changed() -> int:
+    """db.courses가 바뀌었음을 알린다: 카운터를 올려 캐시를 들고 있는 워커들이 다시 읽게 한다."""
+    return await bump_data_version(COURSE_TABLE_VERSION_KEY)
@@ -0,0 +1,130 @@
+# backend/database/course_registry.py
+#
+# 과목 컬렉션 레지스트리: 어떤 컬렉션들이 과목 데이터인지, 컬렉션명에서 유도한 기본값,
+# 대략의 문서 수, 인덱스 목록을 startup 때 한 번 모아 두고 주기적으로 갱신한다.
+# 요청 경로는 list_collection_names()/index_information() 같은 메타데이터 명령을
+# 보내지 않고 여기서 읽기만 한다. 갱신은 새 객체를 다 만든 뒤 참조만 교체한다.
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional
+import asyncio
+import logging
+import os
+import time
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from database.connection import get_db, now_iso, select_course_collections
+from database.course_catalog import CATALOG_COLLECTION, defaults_from_collection
+
+logger = logging.getLogger("app.course_registry")
+
+# 주기적 갱신 간격(초). 0 이하면 startup/수동 갱신 때만
+REGISTRY_REFRESH_SECONDS = float(os.getenv("COURSE_REGISTRY_REFRESH_SECONDS", "300"))
+
+
+class CourseCollectionInfo(NamedTuple):
+    name: str
+    defaults: Dict[str, Any]         # defaults_from_collection(name)
+    count: int                       # estimated_document_count (메타데이터 기준 근사치)
+    indexes: List[List[List[Any]]]   # 인덱스별 [[필드, 방향], ...]
+
+
+class CourseRegistry:
+    def __init__(
+        self,
+        sources: List[CourseCollectionInfo],
+        catalog: Optional[CourseCollectionInfo],
+        existing: FrozenSet[str],
+    ):
+        self.sources = sources  # 과목 원본 컬렉션 (조회 순서)
+        self.by_name: Dict[str, CourseCollectionInfo] = {info.name: info for info in sources}
+        self.catalog = catalog  # course_catalog가 있으면 그 정보
+        self.existing = existing  # DB에 실제로 있는 컬렉션명 (?collection= 검증용)
+        self.refreshed_at = now_iso()
+        self.refreshed_monotonic = time.monotonic()
+
+    def names(self) -> List[str]:
+        return [info.name for info in self.sources]
+
+    def exists(self, name: str) -> bool:
+        return name in self.existing
+
+    def defaults(self, name: str) -> Dict[str, Any]:
+        info = self.by_name.get(name)
+        return info.defaults if info is not None else defaults_from_collection(name)
+
+
+_registry: Optional[CourseRegistry] = None
+_registry_lock = asyncio.Lock()
+_registry_task: Optional[asyncio.Task] = None
+
+
+def get_registry() -> Optional[CourseRegistry]:
+    return _registry
+
+
+async def _describe(db: AsyncIOMotorDatabase, name: str) -> CourseCollectionInfo:
+    col = db[name]
+    count, indexes = await asyncio.gather(col.estimated_document_count(), col.index_information())
+    return CourseCollectionInfo(
+        name=name,
+        defaults=defaults_from_collection(name),
+        count=int(count),
+        indexes=[[list(k) for k in spec["key"]] for spec in indexes.values()],
+    )
+
+
+async def refresh_registry() -> CourseRegistry:
+    """컬렉션 목록/문서 수/인덱스를 다시 읽어 레지스트리를 통째로 교체."""
+    global _registry
+    async with _registry_lock:
+        db = get_db()
+        existing = await db.list_collection_names()
+        names = [n for n in select_course_collections(existing) if n != CATALOG_COLLECTION]
+        targets = names + ([CATALOG_COLLECTION] if CATALOG_COLLECTION in existing else [])
+        infos = await asyncio.gather(*(_describe(db, n) for n in targets))
+        catalog = infos[-1] if len(targets) > len(names) else None
+        registry = CourseRegistry(list(infos[:len(names)]), catalog, frozenset(existing))
+        _registry = registry
+    logger.info(
+        "course registry refreshed collections=%d catalog=%s",
+        len(registry.sources), registry.catalog is not None,
+    )
+    return registry
+
+
+async def current_registry() -> CourseRegistry:
+    """요청 경로용: 이미 만든 레지스트리를 반환 (startup 전이면 한 번 만든다)."""
+    return _registry or await refresh_registry()
+
+
+async def _poll_registry() -> None:
+    while True:
+        await asyncio.sleep(REGISTRY_REFRESH_SECONDS)
+        try:
+            await refresh_registry()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("course registry refresh failed")
+
+
+async def start_registry() -> None:
+    """startup 훅: 레지스트리를 만들고 주기적 갱신을 시작."""
+    global _registry_task
+    try:
+        await refresh_registry()
+    except Exception:
+        logger.exception("initial course registry build failed; will build on first request")
+    if REGISTRY_REFRESH_SECONDS > 0:
+        _registry_task = asyncio.create_task(_poll_registry())
+
+
+async def stop_registry() -> None:
+    global _registry_task
+    if _registry_task is not None:
+        _registry_task.cancel()
+        try:
+            await _registry_task
+        except asyncio.CancelledError:
+            pass
+        _registry_task = None
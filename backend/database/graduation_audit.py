@@ -0,0 +1,112 @@
+# backend/database/graduation_audit.py
+#
+# 일괄 졸업 사정용 대량 읽기. 학생마다 졸업요건 현황 API를 부르면 학생/요건/이수 기록/과목을
+# 학생 수만큼 따로 읽는다(N+1). 여기서는
+#   - 졸업요건: 전부 한 번에 읽어 requirement_version별로 묶고
+#   - 과목: db.courses 전체를 한 번 읽어 코드 → 과목 표로 (database.course_lookup.load_course_table, COURSE_PROJECTION)
+#   - 학생 / COMPLETED 수강 기록: 둘 다 student_id 순으로 정렬된 커서 두 개를 나란히 읽으며 맞춘다 (merge join)
+# 그래서 DB 왕복은 학생 수와 상관없이 커서 배치 수만큼이다.
+# 두 커서는 MongoDB 정렬 순서(숫자 < 문자열, 숫자는 수 크기 순)로 오므로 맞출 때도 같은 순서
+# (utils.bson_order)로 비교한다. student_id가 숫자/문자열로 섞여 있어도 되고, MongoDB 동등 비교처럼
+# 9와 "9"는 다른 학생이다. requirement_version 필터는 학생 커서가 아니라 여기서 걸러서, 다른 버전 학생의
+# 기록도 주인을 찾은 것으로 친다 — 그래서 stats["orphan_enrollments"]는 학생 문서가 없는 기록만 센다.
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from utils.bson_order import bson_order
+from utils.graduation_audit import AuditInput
+from utils.graduation_rules import TranscriptEntry, transcript_entry
+
+CURSOR_BATCH_SIZE = 2000
+# 이수 내역(transcript_entry)에 쓰는 과목 필드
+COURSE_PROJECTION = {"_id": 0, "course_code": 1, "category": 1, "sub_category": 1, "credits": 1}
+
+
+async def load_requirement_docs(db: AsyncIOMotorDatabase) -> Dict[str, List[Dict[str, Any]]]:
+    """requirement_version → 요건 문서 목록 (버전 없는 문서는 뺀다)."""
+    by_version: Dict[str, List[Dict[str, Any]]] = {}
+    async for doc in db.requirements.find({}, {"_id": 0}):
+        version = doc.get("requirement_version")
+        if version:
+            by_version.setdefault(str(version), []).append(doc)
+    return by_version
+
+
+def _student_filter(student_prefix: Optional[str]) -> Dict[str, Any]:
+    # 앞이 고정된 정규식이라 student_id 인덱스 범위 조회로 풀린다
+    return {"student_id": {"$regex": "^" + re.escape(student_prefix)}} if student_prefix else {}
+
+
+async def stream_audit_inputs(
+    db: AsyncIOMotorDatabase,
+    courses: Dict[str, Dict[str, Any]],
+    student_prefix: Optional[str] = None,
+    requirement_version: Optional[str] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> AsyncIterator[AuditInput]:
+    """
+    학생마다 (학생 정보 + 이수 내역) 하나씩, student_id 순으로.
+    stats를 주면 어느 학생 문서와도 맞춰지지 않은 COMPLETED 기록 수를 "orphan_enrollments"에 센다.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("orphan_enrollments", 0)
+    id_filter = _student_filter(student_prefix)
+    students = (
+        db.students
+          .find(id_filter, {"_id": 0, "student_id": 1, "requirement_version": 1, "major_track": 1, "certifications": 1})
+          .sort("student_id", 1)
+          .batch_size(CURSOR_BATCH_SIZE)
+    )
+    enrollments = (
+        db.enrollments
+          .find({**id_filter, "status": "COMPLETED"}, {"_id": 0, "student_id": 1, "course_code": 1, "grade_point": 1})
+          .sort("student_id", 1)
+          .batch_size(CURSOR_BATCH_SIZE)
+    )
+    pending: Optional[Dict[str, Any]] = None   # 아직 주인을 못 찾은 수강 기록 하나 (한 칸 미리 읽기)
+    exhausted = False
+
+    async for student in students:
+        raw_id = student.get("student_id")
+        key = bson_order(raw_id)
+        wanted = not requirement_version or str(student.get("requirement_version")) == requirement_version
+        entries: List[TranscriptEntry] = []
+        while not exhausted:
+            if pending is None:
+                try:
+                    pending = await enrollments.next()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+            owner = bson_order(pending.get("student_id"))
+            if owner > key:
+                break              # 다음 학생 것
+            if owner == key:
+                code = pending.get("course_code")
+                course = courses.get(str(code)) if code is not None else None
+                # 과목 정보를 못 찾은 기록은 student_progress처럼 빠진다
+                if course is not None and wanted:
+                    entries.append(transcript_entry(str(code), course, pending.get("grade_point")))
+            else:
+                # owner < 지금 학생: 학생 문서가 없는 기록
+                stats["orphan_enrollments"] += 1
+            pending = None
+        if not wanted:
+            continue
+        yield AuditInput(
+            str(raw_id),
+            student.get("requirement_version"),
+            student.get("major_track"),
+            student.get("certifications") or {},
+            entries,
+        )
+
+    # 마지막 학생 뒤에 남은 기록도 주인이 없는 것
+    if pending is not None:
+        stats["orphan_enrollments"] += 1
+    if not exhausted:
+        async for _ in enrollments:
+            stats["orphan_enrollments"] += 1
@@ -0,0 +1,114 @@
+# backend/database/requirement_cache.py
+#
+# requirement_version별 졸업요건 캐시 (프로세스 메모리).
+# 졸업요건 문서는 1년에 한 번 바뀔까 말까인데 졸업요건 현황/마이페이지 학점 요약이 요청마다
+# db.requirements를 다시 읽었다. 버전별로 한 번 읽어 카테고리 → 요구 학점/평점/인증 횟수로 풀고
+# 규칙 트리(utils.graduation_rules)로 컴파일해 두고, data_versions의 "requirements" 카운터가 바뀌면 통째로 비운다.
+#
+# - 요건을 쓰는 쪽(routers.requirements)은 카운터를 올리고 자기 워커 캐시를 바로 비운다
+# - 다른 워커는 REQUIREMENT_CACHE_CHECK_SECONDS마다(요청이 올 때) 카운터를 읽어 바뀌었으면 비운다
+#   (0이면 매 요청 확인)
+import asyncio
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from database.connection import bump_data_version, get_data_version
+from utils.category_buckets import SUMMARY_KEYS, bucket_category
+from utils.graduation_rules import RuleTree, compile_rules
+
+REQUIREMENTS_VERSION_KEY = "requirements"
+REQUIREMENT_CACHE_CHECK_SECONDS = float(os.getenv("REQUIREMENT_CACHE_CHECK_SECONDS", "30"))
+
+
+def _as_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class RequirementSet(NamedTuple):
+    version: str
+    docs: Dict[str, dict]             # category → 요건 문서 (같은 category가 여럿이면 마지막 것)
+    credits: Dict[str, int]           # category → required_credits (없으면 0)
+    min_gpa: float                    # MIN_GPA.required_gpa
+    bucket_credits: Dict[str, int]    # 마이페이지 요약 버킷 → required_credits
+    total_override: int               # TOTAL 카테고리의 required_credits (없으면 0)
+    rules: RuleTree                   # 컴파일된 졸업요건 규칙 트리
+
+    def required_credits(self, category: str) -> int:
+        return self.credits.get(category, 0)
+
+
+def parse_requirements(version: str, docs) -> RequirementSet:
+    docs = list(docs)
+    by_category: Dict[str, dict] = {}
+    bucket_credits = {key: 0 for key in SUMMARY_KEYS}
+    total_override = 0
+    for r in docs:
+        cat = r.get("category")
+        if cat:
+            by_category[cat] = r
+        required = _as_int(r.get("required_credits"))
+        bucket = bucket_category(cat)
+        if bucket and bucket in bucket_credits:
+            bucket_credits[bucket] = required
+        elif (cat or "").strip().upper().replace(" ", "_") == "TOTAL":
+            total_override = required
+    credits = {cat: _as_int(doc.get("required_credits")) for cat, doc in by_category.items()}
+    min_gpa = float((by_category.get("MIN_GPA") or {}).get("required_gpa", 0.0) or 0.0)
+    return RequirementSet(version, by_category, credits, min_gpa, bucket_credits, total_override, compile_rules(docs))
+
+
+_cache: Dict[str, RequirementSet] = {}
+_counter: Optional[int] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+def invalidate_requirements(counter: Optional[int] = None) -> None:
+    """이 워커의 캐시를 비운다. counter를 주면 그 버전을 본 것으로 기록 (바로 다시 확인하지 않음)."""
+    global _counter, _checked_at
+    _cache.clear()
+    _counter = counter
+    _checked_at = time.monotonic() if counter is not None else 0.0
+
+
+async def requirements_changed() -> int:
+    """요건이 바뀌었음을 알린다: 카운터를 올리고 이 워커 캐시를 비운다. 새 카운터 값."""
+    counter = await bump_data_version(REQUIREMENTS_VERSION_KEY)
+    invalidate_requirements(counter)
+    return counter
+
+
+async def _check_counter() -> None:
+    global _counter, _checked_at
+    now = time.monotonic()
+    if _counter is not None and now - _checked_at < REQUIREMENT_CACHE_CHECK_SECONDS:
+        return
+    counter = await get_data_version(REQUIREMENTS_VERSION_KEY)
+    if counter != _counter:
+        _cache.clear()
+    _counter = counter
+    _checked_at = now
+
+
+async def get_requirements(db: AsyncIOMotorDatabase, version: str) -> RequirementSet:
+    """version의 졸업요건 (캐시에 없을 때만 db.requirements를 읽는다)."""
+    await _check_counter()
+    cached = _cache.get(version)
+    if cached is not None:
+        return cached
+    async with _lock:
+        cached = _cache.get(version)
+        if cached is None:
+            counter = _counter
+            docs = await db.requirements.find({"requirement_version": version}).to_list(None)
+            cached = parse_requirements(version, docs)
+            # 읽는 동안 카운터가 바뀌었으면(캐시를 비웠으면) 이전 내용일 수 있으니 넣지 않는다
+            if counter == _counter:
+                _cache[version] = cached
+        return cached
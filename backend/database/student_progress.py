@@ -0,0 +1,309 @@
+# backend/database/student_progress.py
+#
+# 학생별 이수 합계를 미리 모아 둔 student_progress 문서 (_id = student_id).
+# 졸업요건 현황 / 마이페이지 학점 요약 / 학기별 평점이 요청마다 원본 enrollments를 다시 합산하던 것을
+# _id find_one 한 번으로 바꾼다. 수강 기록을 추가/수정/삭제할 때 그 기록의 기여분 차이만
+# $inc로 반영하고, 어긋나면(직접 넣은 데이터, 쓰기 도중 실패 등) scripts.rebuild_student_progress로 다시 만든다.
+#
+#   {
+#     "_id": "20231234",
+#     "categories": {"MAJOR": {"credits": 42, "gpa_points": 150.0, "gpa_credits": 39}, ...},  # 과목 category 기준
+#     "buckets": {"MAJOR_REQUIRED": 18, "CORE_GENERAL": 12, ...},                             # 요약 버킷 기준
+#     "semesters": {"2024-1": {"count": 6, "credits": 18, "gpa_points": 66.0}, ...},           # grade_point 있는 기록
+#     "updated_at": "..."
+#   }
+#
+# 세 묶음은 각 엔드포인트가 예전에 쓰던 규칙을 그대로 따른다 (COMPLETED 기록만).
+# - categories: 과목 정보의 category/credits, 과목을 못 찾으면 빠짐 (course_lookup과 같은 코드 매칭)
+# - buckets: 기록의 credits/category가 우선, 없으면 과목 정보 (bucket_category로 매핑)
+# - semesters: 기록의 credits와 grade_point (year/semester는 문자열로 저장돼 있어도 정수로)
+#
+# 과목 정보는 기록을 넣을 때 기록 문서에 스냅샷(PROGRESS_COURSE_FIELD: category/credits)으로 남기고,
+# 수정/삭제 때 빼는 값과 재구성 때 더하는 값을 모두 이 스냅샷에서 만든다. 그래서 나중에 db.courses의
+# 학점/카테고리가 바뀌어도 더한 값과 빼는 값이 어긋나지 않는다. 바뀐 과목 정보를 반영하려면
+# scripts.rebuild_student_progress --refresh-course-snapshots.
+#
+# 동시성: 기록 쓰기는 progress_write 블록으로 감싼다.
+#   1) 쓰기 전에 진행 문서의 pending에 이 쓰기의 토큰을 넣고 seq를 올린다 (문서가 없으면 partial 문서로 만든다)
+#   2) 수강 기록을 쓴다
+#   3) 토큰이 아직 남아 있을 때만 기여분을 $inc하고 토큰을 뺀다. 토큰이 없어졌으면(재구성이 오래된 토큰으로
+#      보고 치웠으면) 더하지 않고 partial로 표시한다
+# 재구성은 시작할 때 본 seq가 그대로이고 진행 중인 쓰기(pending)가 없을 때만 바꿔 넣는다.
+# 진행 중인 쓰기가 있으면 계산한 값을 돌려주기만 하고 저장하지 않는다 — 2)와 3) 사이에 재구성이 끝나
+# 새 기록을 이미 센 문서에 3)이 한 번 더 더하는 일을 막는다. PENDING_WRITE_TIMEOUT_SECONDS보다 오래된
+# 토큰은 쓰던 프로세스가 죽은 것으로 보고 무시한다.
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from database.connection import now_iso
+from database.course_lookup import fetch_courses_by_code
+from utils.category_buckets import bucket_category
+
+logger = logging.getLogger("app.student_progress")
+
+PROGRESS_COLLECTION = "student_progress"
+# 수강 기록에 남기는 과목 스냅샷 필드 ({"category": ..., "credits": ...})
+PROGRESS_COURSE_FIELD = "progress_course"
+# 재구성 중 쓰기가 계속 끼어들 때 다시 시도하는 횟수
+REBUILD_ATTEMPTS = 5
+# 이보다 오래 끝나지 않은 쓰기 토큰은 재구성이 무시한다 (쓰던 프로세스가 죽은 경우)
+PENDING_WRITE_TIMEOUT_SECONDS = float(os.getenv("PENDING_WRITE_TIMEOUT_SECONDS", "30"))
+
+Increments = Dict[str, float]
+
+
+class SemesterTotals(NamedTuple):
+    year: int
+    semester: int
+    credits: int
+    gpa_points: float
+
+
+class StudentProgress(NamedTuple):
+    categories: Dict[str, Tuple[int, float, int]]   # category → (학점, Σ평점×학점, 평점 계산 학점)
+    buckets: Dict[str, int]
+    semesters: List[SemesterTotals]                  # 연도/학기 순
+
+
+def _key(name: str) -> str:
+    # 필드 경로에 못 쓰는 문자 ('.', 맨 앞 '$')는 전각 문자로
+    name = name.replace(".", "．")
+    return "＄" + name[1:] if name.startswith("$") else name
+
+
+def _unkey(key: str) -> str:
+    return key.replace("．", ".").replace("＄", "$")
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def course_snapshot(course: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """기록에 남길 과목 스냅샷 (진행 합계가 쓰는 필드만). 과목을 못 찾았으면 None."""
+    if not course:
+        return None
+    return {"category": course.get("category"), "credits": course.get("credits")}
+
+
+def enrollment_course(enrollment: Dict[str, Any], current: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """기록이 더할 때 쓴 과목 정보: 스냅샷이 있으면 그것, 없으면(예전 기록) 지금 과목 정보."""
+    snapshot = enrollment.get(PROGRESS_COURSE_FIELD)
+    return snapshot if isinstance(snapshot, dict) else current
+
+
+def progress_increments(enrollment: Optional[Dict[str, Any]], course: Optional[Dict[str, Any]]) -> Increments:
+    """
+    수강 기록 하나가 student_progress에 더하는 값 (필드 경로 → 증가량). COMPLETED가 아니면 빈 dict.
+    course는 보통 enrollment_course(enrollment, 지금 과목 정보).
+    """
+    inc: Increments = {}
+    if not enrollment or enrollment.get("status") != "COMPLETED":
+        return inc
+    gp = enrollment.get("grade_point")
+
+    if course:
+        credits = _as_int(course.get("credits"))
+        base = f"categories.{_key(course.get('category') or 'OTHER')}"
+        inc[f"{base}.credits"] = credits
+        if gp is not None:
+            inc[f"{base}.gpa_points"] = gp * credits
+            inc[f"{base}.gpa_credits"] = credits
+
+    credits = _as_int(enrollment.get("credits"))
+    bucket = bucket_category(enrollment.get("category"))
+    if course and (not credits or not bucket):
+        credits = credits or _as_int(course.get("credits"))
+        bucket = bucket or bucket_category(course.get("category"))
+    if bucket and credits:
+        inc[f"buckets.{bucket}"] = credits
+
+    if gp is not None:
+        # 예전 집계처럼 저장된 값 그대로 묶되, "2024" 같은 문자열도 같은 학기로
+        year, semester = _as_int(enrollment.get("year")), _as_int(enrollment.get("semester"))
+        own_credits = enrollment.get("credits")
+        base = f"semesters.{year}-{semester}"
+        inc[f"{base}.count"] = 1
+        if isinstance(own_credits, (int, float)):
+            inc[f"{base}.credits"] = own_credits
+            inc[f"{base}.gpa_points"] = gp * own_credits
+    return inc
+
+
+def progress_delta(before: Increments, after: Increments) -> Increments:
+    """after - before (0인 항목은 뺌)."""
+    delta: Increments = {}
+    for path in set(before) | set(after):
+        d = after.get(path, 0) - before.get(path, 0)
+        if d:
+            delta[path] = d
+    return delta
+
+
+class ProgressWrite:
+    """progress_write 블록 안에서 수강 기록을 쓴 뒤, 진행 문서에 더할 값을 delta에 담는다."""
+
+    __slots__ = ("delta",)
+
+    def __init__(self):
+        self.delta: Increments = {}
+
+
+@asynccontextmanager
+async def progress_write(db: AsyncIOMotorDatabase, student_id: str) -> AsyncIterator[ProgressWrite]:
+    """
+    수강 기록 쓰기 하나를 진행 문서와 맞춘다 (위 "동시성" 참고).
+
+        async with progress_write(db, student_id) as write:
+            await db.enrollments.insert_one(doc)
+            write.delta = progress_increments(doc, course)
+
+    블록이 예외로 끝나면 기록이 쓰였는지 알 수 없으니 더하지 않고 partial로 표시한다.
+    """
+    collection = db[PROGRESS_COLLECTION]
+    token = ObjectId()
+    await collection.update_one(
+        {"_id": student_id},
+        {"$push": {"pending": {"token": token, "at": time.time()}}, "$inc": {"seq": 1}, "$setOnInsert": {"partial": True}},
+        upsert=True,
+    )
+    write = ProgressWrite()
+    try:
+        yield write
+    except BaseException:
+        await _mark_partial(collection, student_id, token)
+        raise
+    res = await collection.update_one(
+        {"_id": student_id, "pending.token": token},
+        {
+            "$inc": {**write.delta, "seq": 1},
+            "$pull": {"pending": {"token": token}},
+            "$set": {"updated_at": now_iso()},
+        },
+    )
+    if not res.matched_count:
+        # 재구성이 이 토큰을 오래된 것으로 보고 치웠다: 기록을 셌는지 알 수 없으니 다음 조회가 다시 만든다
+        logger.warning("student_progress write outlived its pending token: student_id=%s", student_id)
+        await _mark_partial(collection, student_id, token)
+
+
+async def _mark_partial(collection: AsyncIOMotorCollection, student_id: str, token: ObjectId) -> None:
+    await collection.update_one(
+        {"_id": student_id},
+        {"$pull": {"pending": {"token": token}}, "$inc": {"seq": 1}, "$set": {"partial": True, "updated_at": now_iso()}},
+        upsert=True,
+    )
+
+
+def _live_pending(doc: Optional[Dict[str, Any]]) -> bool:
+    cutoff = time.time() - PENDING_WRITE_TIMEOUT_SECONDS
+    return any(float(p.get("at") or 0) >= cutoff for p in (doc or {}).get("pending") or ())
+
+
+def _nested(increments: Increments) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {}
+    for path, value in increments.items():
+        node = doc
+        *parents, leaf = path.split(".")
+        for p in parents:
+            node = node.setdefault(p, {})
+        node[leaf] = node.get(leaf, 0) + value
+    return doc
+
+
+def _sum_increments(parts: Iterable[Increments]) -> Increments:
+    total: Increments = {}
+    for inc in parts:
+        for path, value in inc.items():
+            total[path] = total.get(path, 0) + value
+    return total
+
+
+async def compute_student_progress(
+    db: AsyncIOMotorDatabase,
+    student_id: str,
+    courses: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    원본 enrollments에서 진행 문서를 처음부터 계산한다 (저장하지 않음).
+    courses(코드 → 과목 문서)를 주면 과목 조회를 건너뛴다 (일괄 재구성용).
+    """
+    enrollments = await db.enrollments.find({"student_id": student_id, "status": "COMPLETED"}).to_list(None)
+    if courses is None:
+        # 스냅샷이 없는 기록의 과목만 조회
+        codes = list({
+            str(e["course_code"]) for e in enrollments
+            if e.get("course_code") is not None and not isinstance(e.get(PROGRESS_COURSE_FIELD), dict)
+        })
+        courses = await fetch_courses_by_code(db.courses, codes) if codes else {}
+    total = _sum_increments(
+        progress_increments(e, enrollment_course(e, courses.get(str(e.get("course_code"))))) for e in enrollments
+    )
+    doc = {"_id": student_id, "categories": {}, "buckets": {}, "semesters": {}, **_nested(total)}
+    doc["updated_at"] = now_iso()
+    return doc
+
+
+async def rebuild_student_progress(
+    db: AsyncIOMotorDatabase,
+    student_id: str,
+    courses: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    진행 문서를 다시 계산해 저장하고 돌려준다. 계산하는 동안 쓰기가 시작되면(seq가 바뀌면) 다시 계산한다.
+    진행 중인 쓰기가 있거나 REBUILD_ATTEMPTS번 모두 밀리면 저장하지 않고 계산한 값만 돌려준다
+    (쓰기가 끝나며 더하거나, 다음 조회/재구성이 다시 만든다).
+    """
+    collection = db[PROGRESS_COLLECTION]
+    for _ in range(REBUILD_ATTEMPTS):
+        current = await collection.find_one({"_id": student_id}, {"seq": 1, "pending": 1})
+        seq = (current or {}).get("seq", 0)
+        doc = await compute_student_progress(db, student_id, courses)
+        doc["seq"] = seq
+        if _live_pending(current):
+            return doc
+        if current is None:
+            try:
+                await collection.insert_one(doc)
+                return doc
+            except DuplicateKeyError:
+                continue   # 그 사이 쓰기(partial 문서)나 다른 재구성이 먼저 넣었다
+        res = await collection.replace_one({"_id": student_id, "seq": current.get("seq")}, doc)
+        if res.matched_count:
+            return doc
+    logger.warning("student_progress rebuild kept racing with writes: student_id=%s", student_id)
+    return doc
+
+
+async def load_student_progress(db: AsyncIOMotorDatabase, student_id: str) -> StudentProgress:
+    """진행 문서 (_id find_one 한 번). 없거나 partial이면 원본에서 만들어 저장한다."""
+    doc = await db[PROGRESS_COLLECTION].find_one({"_id": student_id})
+    if doc is None or doc.get("partial"):
+        doc = await rebuild_student_progress(db, student_id)
+    return parse_progress(doc)
+
+
+def parse_progress(doc: Dict[str, Any]) -> StudentProgress:
+    categories = {
+        _unkey(k): (_as_int(v.get("credits")), float(v.get("gpa_points") or 0.0), _as_int(v.get("gpa_credits")))
+        for k, v in (doc.get("categories") or {}).items()
+    }
+    buckets = {k: _as_int(v) for k, v in (doc.get("buckets") or {}).items()}
+    semesters: List[SemesterTotals] = []
+    for key, v in (doc.get("semesters") or {}).items():
+        if _as_int(v.get("count")) <= 0:
+            continue  # 기록이 다 지워진 학기
+        year, _, semester = key.partition("-")
+        semesters.append(SemesterTotals(int(year), int(semester), _as_int(v.get("credits")), float(v.get("gpa_points") or 0.0)))
+    semesters.sort(key=lambda s: (s.year, s.semester))
+    return StudentProgress(categories, buckets, semesters)
@@ -1,10 +1,10 @@
 ﻿from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import connection
+from database import connection, course_registry
 from routers import courses, evaluations, requirements
 from routers import auth, users
 from routers import enrollments, dashboard, graduation
-from routers import mypage
+from routers import mypage, timetable
 
 
 app = FastAPI(title="gnu_sys")
@@ -16,6 +16,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[courses.NEXT_CURSOR_HEADER, courses.PARTIAL_RESULTS_HEADER],
 )
 
 # 라우터 등록
@@ -28,6 +29,7 @@ app.include_router(enrollments.router, prefix="", tags=["Enrollments"]) # 수강
 app.include_router(dashboard.router,   prefix="", tags=["Dashboard"]) # 대시보드 관련
 app.include_router(graduation.router, prefix="/graduation", tags=["Graduation"]) # 졸업 관리
 app.include_router(mypage.router,     prefix="/mypage", tags=["MyPage"]) # 마이페이지 관련
+app.include_router(timetable.router,  prefix="/timetable", tags=["Timetable"]) # 시간표 자동 생성
 
 
 @app.on_event("startup")
@@ -58,12 +60,23 @@ async def on_startup():
     await db.requirements.create_index("requirement_id", unique=True)
     await db.requirements.create_index("department_scope")
     await db.requirements.create_index("year")
+    # 학생별 수강 기록 조회 + 일괄 졸업 사정(scripts.audit_graduation)의 student_id 순 커서
+    await db.students.create_index("student_id")
+    await db.enrollments.create_index([("student_id", 1), ("status", 1)])
 
     
     await connection.ensure_indexes()
 
+    # 과목 컬렉션 레지스트리 (요청 경로는 메타데이터 명령 없이 이것만 읽음)
+    await course_registry.start_registry()
+
+    # 과목 카탈로그 스냅샷 적재 + 버전 폴링 시작
+    await courses.start_catalog()
+
 @app.on_event("shutdown")
 async def on_shutdown():
+    await courses.stop_catalog()
+    await course_registry.stop_registry()
     await connection.close_mongo_connection()
 
 @app.get("/")
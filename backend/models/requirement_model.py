@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 class RequirementBase(BaseModel):
@@ -8,6 +8,10 @@ class RequirementBase(BaseModel):
     major_track: Optional[str] = Field(None, description="세부 전공 (컴퓨터과학/소프트웨어/빅데이터 등)")
     group: Optional[str] = Field(None, description="전공/교양/일반선택 등 구분")
     required_credits: Optional[int] = Field(None, description="필요 이수 학점")
+    courses: Optional[List[str]] = Field(None, description="이 과목들 중 min_courses개 이수 (과목코드 목록)")
+    min_courses: Optional[int] = Field(None, ge=0, description="courses 중 이수해야 하는 과목 수 (없으면 전부)")
+    sub_areas: Optional[Dict[str, int]] = Field(None, description="세부 영역별 최소 학점 (예: {\"문학과문화\": 3})")
+    min_areas: Optional[int] = Field(None, ge=0, description="sub_areas 중 채워야 하는 영역 수 (없으면 전부)")
     description: Optional[str] = Field(None, description="요건 설명")
     updated_at: Optional[str] = Field(None, description="마지막 갱신 일시 (ISO8601)")
 
@@ -18,6 +22,10 @@ class RequirementCreate(RequirementBase):
 class RequirementUpdate(BaseModel):
     """졸업요건 수정용 모델"""
     required_credits: Optional[int] = None
+    courses: Optional[List[str]] = None
+    min_courses: Optional[int] = Field(None, ge=0)
+    sub_areas: Optional[Dict[str, int]] = None
+    min_areas: Optional[int] = Field(None, ge=0)
     description: Optional[str] = None
 
 class RequirementPublic(RequirementBase):
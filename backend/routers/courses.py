@@ -1,11 +1,46 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Query, HTTPException, Request, Response
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Literal, NamedTuple, Optional, Tuple, TypeVar
+from contextvars import ContextVar
+import asyncio
+import base64
+import bisect
+import hashlib
+import itertools
+import logging
+import os
 import re
-from database.connection import get_db, get_course_collections
-from pydantic import BaseModel, Field
+import time
+from utils.hangul import is_chosung_query
+from utils.jamo_index import JamoIndex
+from utils.ngram_index import NgramIndex
+from utils.prefix_index import PrefixIndex
+from utils.batch_loader import BatchLoader
+from utils.bson_order import bson_order as _bson_order
+from utils.bitset_index import BitsetIndex, from_positions, iter_positions
+from utils.result_cache import ResultCache
+from utils.timeslot import mask_from_bytes, parse_timeslot, FULL_MASK
+from utils.fast_response import FAST_RESPONSES_ENABLED, dumps, json_array, json_object, json_response
+from database.connection import (
+    get_db, get_data_version, bump_data_version, now_iso,
+)
+from database.course_lookup import code_variants
+from database.course_registry import (
+    CourseCollectionInfo, CourseRegistry, current_registry, get_registry, refresh_registry,
+)
+from database.course_catalog import (
+    CATALOG_COLLECTION, TIMESLOT_MASK_FIELD, TIMESLOT_SOURCE_KEYS, build_course_catalog,
+    course_timeslot_mask, timeslot_mask_value,
+    coerce_and_fill as _coerce_and_fill,
+    defaults_from_collection,
+    normalize_course as _normalize_course_for_response,
+)
+from pydantic import BaseModel, Field, TypeAdapter
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo.errors import OperationFailure, PyMongoError
+from bson import json_util
 
 router = APIRouter(tags=["Courses"])
+logger = logging.getLogger("app.courses")
 
 # --- Pydantic 모델 (응답) ------------------------------------------------------
 
@@ -27,50 +62,57 @@ class CourseOut(BaseModel):
     설명란: Optional[str] = None
     비고: Optional[str] = None
 
-# --- 유틸: 컬렉션명으로 기본값 추론 --------------------------------------------
 
-def _defaults_from_collection(name: str) -> Dict[str, Any]:
-    """
-    예) courses_2025_major, courses_2023_major_sci, core_general ...
-    컬렉션명으로부터 year/group/major_track/general_type/source_collection 기본값 추론
-    """
-    d: Dict[str, Any] = {"source_collection": name}
-
-    if name.startswith("courses_") and "_major" in name:
-        # year
-        m = re.search(r"courses_(\d{4})_major", name)
-        if m:
-            try:
-                d["year"] = int(m.group(1))
-            except Exception:
-                pass
-        d["group"] = "전공"
+# FAST_RESPONSES 경로에서 직접 검증/직렬화할 때 (FastAPI 기본 출력처럼 by_alias=True)
+_COURSE_ADAPTER = TypeAdapter(CourseOut)
+_COURSE_LIST_ADAPTER = TypeAdapter(List[CourseOut])
 
-        # track suffix (선택)
-        if name.endswith("_sci"):
-            d["major_track"] = "컴퓨터 과학"
-        elif name.endswith("_sw"):
-            d["major_track"] = "컴퓨터 소프트웨어"
-        elif name.endswith("_bd"):
-            d["major_track"] = "빅데이터"
 
-    elif name == "courses_NormalStudy":
-        d["group"] = "일반선택/교직"
-        d["general_type"] = "일반선택/교직"
+def _encode_courses(docs: List[Dict[str, Any]], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    if fields is None:
+        return _COURSE_LIST_ADAPTER.dump_json(_COURSE_LIST_ADAPTER.validate_python(docs), by_alias=True)
+    # 고른 키만 남긴 dict를 검증하고, 나머지 필드(기본값 None)는 직렬화에서 뺀다
+    items = _COURSE_LIST_ADAPTER.validate_python([{k: d[k] for k in fields if k in d} for d in docs])
+    include = {_COURSE_FIELDS[k] for k in fields}
+    return _COURSE_LIST_ADAPTER.dump_json(items, by_alias=True, include={"__all__": include})
 
-    elif name == "core_general":
-        d["group"] = "교양"
-        d["general_type"] = "핵심 교양"
+# --- 유틸: 필드 선택 (fields=) -------------------------------------------------
+#
+# 목록 화면은 과목명/교수/학점 정도만 쓰는데 CourseOut은 긴 자유 텍스트(설명란, 비고)까지
+# 16개 필드를 보낸다. ?fields=course_name,professor,credits 로 고르면 MongoDB 프로젝션과
+# 응답 모양을 함께 줄인다. 응답은 고른 키만 담은 객체 배열 (없는 값은 null).
 
-    elif name == "balance_general":
-        d["group"] = "교양"
-        d["general_type"] = "균형 교양"
+# 응답 키(serialization alias) → CourseOut 필드명
+_COURSE_FIELDS: Dict[str, str] = {
+    (f.serialization_alias or name): name for name, f in CourseOut.model_fields.items()
+}
+# 고른 필드와 상관없이 읽는 키: course_name(없는 행은 응답에서 빠짐), 정렬/커서 키
+_PROJECTION_ALWAYS = ("course_name", "requirement_id", "course_code")
+_FIELDS_DESCRIPTION = (
+    "응답에 담을 필드 (쉼표 구분, 예: course_name,professor,credits). "
+    "주면 각 항목이 고른 키만 가진 객체가 된다"
+)
 
-    elif name == "basic_general":
-        d["group"] = "교양"
-        d["general_type"] = "기초 교양"
 
-    return d
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    fields= 값 → 응답 키 튜플 (CourseOut 필드 순서, 중복 제거). 없거나 전부 고르면 None.
+    모르는 필드가 있으면 400.
+    """
+    if fields is None:
+        return None
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(wanted - _COURSE_FIELDS.keys())
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown fields: {', '.join(unknown)} (allowed: {', '.join(_COURSE_FIELDS)})",
+        )
+    if not wanted:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    if len(wanted) == len(_COURSE_FIELDS):
+        return None
+    return tuple(k for k in _COURSE_FIELDS if k in wanted)
 
 # --- 유틸: 쿼리 빌더 -----------------------------------------------------------
 
@@ -102,245 +144,1628 @@ def _build_match(
         ]
     return cond
 
-# --- 유틸: 타입 캐스팅 + 기본값 주입 -------------------------------------------
 
-_STRING_KEYS = ("course_code", "requirement_id", "category", "course_name", "professor")
+_TIME_FORMAT = "예) 월1,2,3/수09:00-12:00 (교시 또는 시각 범위, 요일은 / 로 구분)"
+_FREE_SLOTS_DESCRIPTION = f"이 시간 안에 모두 들어가는 과목만. {_TIME_FORMAT}"
+_CONFLICTS_DESCRIPTION = f"이 시간표와 겹치는 과목 제외. {_TIME_FORMAT}"
+
 
-def _coerce_and_fill(doc: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+def _apply_time_filter(
+    match: Dict[str, Any],
+    free_slots: Optional[str],
+    exclude_conflicts_with: Optional[str],
+) -> Dict[str, Any]:
     """
-    - 숫자/기타 타입으로 저장된 문자열 필드들을 str로 강제 캐스팅
-    - 컬렉션명에서 유도한 기본값들을 비어있을 때만 주입
+    free_slots: 이 시간 안에 모두 들어가는 과목만 / exclude_conflicts_with: 이 시간표와 겹치는 과목 제외.
+    둘 다 주간 비트마스크로 바꿔 timeslot_mask에 $bitsAllClear 하나로 건다
+    (과목 칸 중 빈 시간 밖이거나 내 시간표와 겹치는 칸이 하나도 없어야 함).
+    강의 시간을 해석할 수 없는 과목은 시간 조건이 있으면 빠진다.
     """
-    if not doc:
-        return doc
+    if not free_slots and not exclude_conflicts_with:
+        return match
+    blocked = 0
+    try:
+        if free_slots:
+            blocked |= FULL_MASK & ~parse_timeslot(free_slots)
+        if exclude_conflicts_with:
+            blocked |= parse_timeslot(exclude_conflicts_with)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"invalid time filter: {e}")
+    return dict(match, **{TIMESLOT_MASK_FIELD: {"$bitsAllClear": timeslot_mask_value(blocked)}})
 
-    # 문자열 강제 변환
-    for k in _STRING_KEYS:
-        if k in doc and doc[k] is not None and not isinstance(doc[k], str):
-            doc[k] = str(doc[k])
+# --- 유틸: 단일 컬렉션 조회(find) -----------------------------------------------
 
-    # 기본값 주입
-    if "source_collection" not in doc or doc.get("source_collection") is None:
-        if "source_collection" in defaults:
-            doc["source_collection"] = defaults["source_collection"]
+_COURSE_PROJECTION: Dict[str, int] = {
+    "_id": 0,  # 그래도 혹시 모르니 _response_doc에서 한번 더 pop
+    "requirement_id": 1,
+    "category": 1,
+    "course_name": 1,
+    "course_code": 1,
+    "professor": 1,
+    "timeslot": 1,
+    "credits": 1,
+    "class": 1,
+    "group": 1,
+    "year": 1,
+    "major_track": 1,
+    "general_type": 1,
+    "source_collection": 1,
+    "source_sheet": 1,
+    "설명란": 1,
+    "비고": 1,
+}
 
-    for k in ("year", "group", "major_track", "general_type"):
-        if doc.get(k) is None and defaults.get(k) is not None:
-            doc[k] = defaults[k]
+def _course_projection(fields: Optional[Tuple[str, ...]] = None) -> Dict[str, int]:
+    if fields is None:
+        return _COURSE_PROJECTION
+    return {"_id": 0, **{k: 1 for k in fields + _PROJECTION_ALWAYS}}
 
-    # _id 제거 (응답 모델과 일치)
-    doc.pop("_id", None)
-    return doc
-
-# --- 유틸: 단일 컬렉션 조회(find) -----------------------------------------------
 
 async def _fetch_from_collection(
     col: AsyncIOMotorCollection,
-    defaults: Dict[str, Any],
     match: Dict[str, Any],
     skip: int,
     limit: int,
+    max_time_ms: Optional[int] = None,
+    fields: Optional[Tuple[str, ...]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Aggregate 없이 find()만 사용. Mongo 버전 독립.
+    fields를 주면 그 필드(+ _PROJECTION_ALWAYS)만 읽는다.
     """
-    cur = col.find(match, {
-        "_id": 0,  # 그래도 혹시 모르니 아래에서 한번 더 pop
-        "requirement_id": 1,
-        "category": 1,
-        "course_name": 1,
-        "course_code": 1,
-        "professor": 1,
-        "group": 1,
-        "year": 1,
-        "major_track": 1,
-        "general_type": 1,
-        "source_collection": 1,
-        "source_sheet": 1,
-        "설명란": 1,
-        "비고": 1,
-    }).skip(skip).limit(limit)
+    cur = col.find(match, _course_projection(fields)).skip(skip).limit(limit)
+    if max_time_ms:
+        cur = cur.max_time_ms(max_time_ms)
 
     docs = await cur.to_list(length=limit)
-    return [_coerce_and_fill(d, defaults) for d in docs]
+    return [d for d in (_response_doc(d, col.name) for d in docs) if d]
+
+# --- 유틸: 컬렉션별 병렬 팬아웃 -------------------------------------------------
+#
+# $unionWith를 못 쓰는 경로는 컬렉션마다 count/find를 따로 보낸다. 순서대로 기다리면
+# 지연이 왕복 수(~14)만큼 더해지므로 세마포어로 동시 실행 수를 제한해 한꺼번에 보내고,
+# 컬렉션마다 maxTimeMS 예산을 준다. 예산을 넘기거나 실패한 컬렉션은 결과에서 빼고
+# 응답 헤더 X-Partial-Results에 컬렉션명을 실어 부분 결과임을 알린다.
+
+PARTIAL_RESULTS_HEADER = "X-Partial-Results"
+FANOUT_CONCURRENCY = max(1, int(os.getenv("COURSE_FANOUT_CONCURRENCY", "6")))
+# 컬렉션별 서버 실행 시간 예산(ms). 0이면 제한 없음
+FANOUT_MAX_TIME_MS = int(os.getenv("COURSE_FANOUT_MAX_TIME_MS", "2000"))
+
+T = TypeVar("T")
+
+# 요청마다 결과에서 빠진 컬렉션명을 모은다 (_partial_scope로 시작)
+_partial_sources: ContextVar[Optional[List[str]]] = ContextVar("course_partial_sources", default=None)
+
+
+def _partial_scope() -> List[str]:
+    partial: List[str] = []
+    _partial_sources.set(partial)
+    return partial
+
+
+def _set_partial_header(response: Response, partial: List[str]) -> None:
+    if partial:
+        response.headers[PARTIAL_RESULTS_HEADER] = ",".join(sorted(set(partial)))
+
+
+async def _fan_out(names: List[str], fn: Callable[[str], Awaitable[T]]) -> Dict[str, T]:
+    """
+    names 각각에 fn(name)을 최대 FANOUT_CONCURRENCY개씩 동시에 실행.
+    결과는 names 순서의 dict이고, 시간 초과/실패한 컬렉션은 빠진다.
+    """
+    sem = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+    async def _one(name: str) -> Tuple[bool, Any]:
+        async with sem:
+            try:
+                return True, await fn(name)
+            except PyMongoError as e:
+                logger.warning("course collection %s skipped: %s", name, e)
+                partial = _partial_sources.get()
+                if partial is not None:
+                    partial.append(name)
+                return False, None
+
+    results = await asyncio.gather(*(_one(name) for name in names))
+    return {name: value for name, (ok, value) in zip(names, results) if ok}
+
+
+def _max_time_kwargs() -> Dict[str, int]:
+    return {"maxTimeMS": FANOUT_MAX_TIME_MS} if FANOUT_MAX_TIME_MS > 0 else {}
+
+
+async def _count_each(db: AsyncIOMotorDatabase, names: List[str], match: Dict[str, Any]) -> Dict[str, int]:
+    async def _count(name: str) -> int:
+        return int(await db[name].count_documents(match, **_max_time_kwargs()))
+
+    return await _fan_out(names, _count)
+
+# --- 유틸: $unionWith + $facet 집계 (한 번의 명령으로 페이지 + 전체 개수) ---------
+#
+# 모든 과목 컬렉션을 $unionWith로 이어 붙인 뒤 (requirement_id, course_code) 순으로
+# 전역 정렬하고 $facet으로 페이지와 전체 개수를 한 번에 받는다.
+# 정렬 동률은 (컬렉션명, _id)로 끊어서 페이지가 바뀌어도 순서가 흔들리지 않게 한다.
+# $unionWith가 없는 서버(4.4 미만)에서는 아래 find 기반 경로로 대체한다.
+
+_UNION_SORT = {"requirement_id": 1, "course_code": 1, "_source": 1, "_id": 1}
+_union_with_supported = True
+
+
+def _can_aggregate(names: List[str]) -> bool:
+    # 컬렉션이 하나면 $unionWith 없이 같은 파이프라인이 돈다 (course_catalog)
+    return bool(names) and (_union_with_supported or len(names) == 1)
+
+
+def _union_pipeline(names: List[str], match: Dict[str, Any], tail: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _branch(name: str) -> List[Dict[str, Any]]:
+        return [{"$match": match}, {"$addFields": {"_source": {"$literal": name}}}]
+
+    pipeline = _branch(names[0])
+    for name in names[1:]:
+        pipeline.append({"$unionWith": {"coll": name, "pipeline": _branch(name)}})
+    return pipeline + tail
+
+
+def _is_unsupported_stage(e: OperationFailure) -> bool:
+    # 40324: Unrecognized pipeline stage name
+    return e.code == 40324 or "$unionWith" in str(e)
+
+
+def _collection_defaults(name: str) -> Dict[str, Any]:
+    # 레지스트리에 미리 계산해 둔 값 (문서마다 컬렉션명 정규식을 다시 돌리지 않도록)
+    registry = get_registry()
+    return registry.defaults(name) if registry is not None else defaults_from_collection(name)
+
+
+def _response_doc(doc: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """
+    name 컬렉션에서 읽은 문서 → 응답 문서 (과목명이 없으면 None). 원본 컬렉션 문서는 여기서
+    캐스팅/기본값 주입/필드명 보정을 하고, course_catalog 문서는 적재할 때(catalog_document)
+    이미 했으므로 _id만 뺀다.
+    """
+    if name == CATALOG_COLLECTION:
+        doc.pop("_id", None)
+        return doc if doc.get("course_name") else None
+    return _normalize_course_for_response(_coerce_and_fill(doc, _collection_defaults(name)))
+
+
+def _from_union_doc(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return _response_doc(doc, doc.pop("_source", None) or "")
+
+
+def _from_union_docs(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [d for d in map(_from_union_doc, items) if d]
+
+
+def _union_projection(fields: Optional[Tuple[str, ...]] = None) -> Dict[str, int]:
+    # _id는 커서 생성용으로 남겨두고 _response_doc에서 제거
+    return dict(_course_projection(fields), _id=1, _source=1)
+
+
+# /courses/search 패싯(필터 칩) 대상 필드
+FACET_FIELDS = ("group", "category", "year", "major_track", "general_type")
+
+FacetCounts = Dict[str, Dict[Any, int]]
+
+
+class UnionPage(NamedTuple):
+    items: List[Dict[str, Any]]
+    total: int
+    next_cursor: Optional[str]
+    facets: FacetCounts
+
+
+def _facet_stages(fields: Tuple[str, ...]) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        f: [{"$match": {f: {"$ne": None}}}, {"$group": {"_id": "$" + f, "count": {"$sum": 1}}}]
+        for f in fields
+    }
+
+
+def _read_facets(facet: Dict[str, Any], fields: Tuple[str, ...]) -> FacetCounts:
+    return {f: {b["_id"]: int(b["count"]) for b in facet.get(f, [])} for f in fields}
+
+
+async def _aggregate_union_page(
+    db: AsyncIOMotorDatabase,
+    names: List[str],
+    match: Dict[str, Any],
+    skip: int,
+    limit: int,
+    facet_fields: Tuple[str, ...] = (),
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Optional[UnionPage]:
+    """
+    전역 정렬된 페이지, 전체 개수, 다음 페이지 커서(+ 요청 시 패싯 개수)를 한 번의 집계로 반환.
+    $unionWith를 지원하지 않으면 None.
+    """
+    global _union_with_supported
+    if not _can_aggregate(names):
+        return None
+
+    projection = _union_projection(fields)
+    pipeline = _union_pipeline(names, match, [
+        {"$sort": _UNION_SORT},
+        {"$facet": {
+            "items": [{"$skip": skip}, {"$limit": limit}, {"$project": projection}],
+            "total": [{"$count": "n"}],
+            **_facet_stages(facet_fields),
+        }},
+    ])
+    try:
+        out = await db[names[0]].aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+    except OperationFailure as e:
+        if not _is_unsupported_stage(e):
+            raise
+        logger.warning("$unionWith unsupported; using find-based union: %s", e)
+        _union_with_supported = False
+        return None
+
+    facet = out[0] if out else {}
+    total = facet.get("total") or [{"n": 0}]
+    items = facet.get("items", [])
+    next_cursor = _doc_cursor(items[-1]) if len(items) == limit else None
+    return UnionPage(
+        _from_union_docs(items), int(total[0]["n"]), next_cursor,
+        _read_facets(facet, facet_fields),
+    )
+
+
+async def _count_and_facets(
+    db: AsyncIOMotorDatabase,
+    names: List[str],
+    match: Dict[str, Any],
+    fields: Tuple[str, ...],
+) -> Tuple[int, FacetCounts]:
+    """전체 개수 + 패싯 개수. $unionWith가 없으면 컬렉션별 $facet 결과를 합산."""
+    global _union_with_supported
+    stages = {"total": [{"$count": "n"}], **_facet_stages(fields)}
+    if _can_aggregate(names):
+        try:
+            out = await db[names[0]].aggregate(_union_pipeline(names, match, [{"$facet": stages}])).to_list(length=1)
+        except OperationFailure as e:
+            if not _is_unsupported_stage(e):
+                raise
+            logger.warning("$unionWith unsupported; using per-collection facets: %s", e)
+            _union_with_supported = False
+        else:
+            facet = out[0] if out else {}
+            total = facet.get("total") or [{"n": 0}]
+            return int(total[0]["n"]), _read_facets(facet, fields)
+
+    async def _facets(name: str) -> Dict[str, Any]:
+        pipeline = [{"$match": match}, {"$facet": stages}]
+        out = await db[name].aggregate(pipeline, **_max_time_kwargs()).to_list(length=1)
+        return out[0] if out else {}
+
+    total = 0
+    merged: FacetCounts = {f: {} for f in fields}
+    for facet in (await _fan_out(names, _facets)).values():
+        total += int((facet.get("total") or [{"n": 0}])[0]["n"])
+        for f, counts in _read_facets(facet, fields).items():
+            for value, n in counts.items():
+                merged[f][value] = merged[f].get(value, 0) + n
+    return total, merged
+
+
+async def _aggregate_union_count(
+    db: AsyncIOMotorDatabase,
+    names: List[str],
+    match: Dict[str, Any],
+) -> Optional[int]:
+    global _union_with_supported
+    if not _can_aggregate(names):
+        return None
+    pipeline = _union_pipeline(names, match, [{"$count": "n"}])
+    try:
+        out = await db[names[0]].aggregate(pipeline).to_list(length=1)
+    except OperationFailure as e:
+        if not _is_unsupported_stage(e):
+            raise
+        logger.warning("$unionWith unsupported; using per-collection counts: %s", e)
+        _union_with_supported = False
+        return None
+    return int(out[0]["n"]) if out else 0
+
+# --- 유틸: keyset 커서 페이지네이션 ---------------------------------------------
+#
+# 커서는 마지막으로 내려준 행의 (source_collection, requirement_id, course_code, _id)
+# 원본 값을 담은 불투명 문자열이다. 다음 페이지는 각 컬렉션에서
+# (requirement_id, course_code, _id) 인덱스를 커서 위치부터 seek 해서 limit개만 읽으므로
+# 500페이지째도 첫 페이지와 비용이 같다.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_KEYSET_SORT = [("requirement_id", 1), ("course_code", 1), ("_id", 1)]
+# BSON 비교 순서에서 숫자/문자열보다 뒤에 오는 타입들
+_TYPES_AFTER_NUMBER = ["string", "object", "binData", "objectId", "bool", "date", "timestamp", "regex"]
+_TYPES_AFTER_STRING = _TYPES_AFTER_NUMBER[1:]
+
+CursorKey = Tuple[str, Any, Any, Any]
+
+
+def _encode_cursor(
+    source: str, requirement_id: Any, course_code: Any, _id: Any, score: Optional[float] = None,
+) -> str:
+    key = [source, requirement_id, course_code, _id]
+    if score is not None:
+        key.append(score)  # 검색어 관련도 순 페이지의 커서
+    raw = json_util.dumps(key).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[CursorKey, Optional[float]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json_util.loads(raw.decode("utf-8"))
+        source, requirement_id, course_code, _id = key[:4]
+        score = float(key[4]) if len(key) > 4 else None
+        if not isinstance(source, str) or len(key) > 5:
+            raise ValueError("cursor")
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return (source, requirement_id, course_code, _id), score
+
+
+def _doc_cursor(doc: Dict[str, Any]) -> str:
+    # 캐스팅 전 원본 값이어야 다음 페이지 조건과 정렬이 맞는다
+    return _encode_cursor(doc.get("_source") or "", doc.get("requirement_id"), doc.get("course_code"), doc.get("_id"))
+
+
+def _cursor_sort_key(after: CursorKey) -> Tuple[Any, ...]:
+    source, requirement_id, course_code, _id = after
+    return (_bson_order(requirement_id), _bson_order(course_code), source, _bson_order(_id))
+
+
+def _union_doc_key(doc: Dict[str, Any]) -> Tuple[Any, ...]:
+    # 컬렉션별 결과를 파이썬에서 합칠 때 쓰는 _UNION_SORT와 같은 순서의 키
+    return (
+        _bson_order(doc.get("requirement_id")), _bson_order(doc.get("course_code")),
+        doc["_source"], _bson_order(doc.get("_id")),
+    )
+
+
+def _bson_gt(field: str, value: Any) -> Dict[str, Any]:
+    """BSON 타입 간 순서까지 고려한 field > value 조건."""
+    if value is None:
+        return {field: {"$ne": None}}
+    if isinstance(value, bool):
+        return {field: {"$gt": value}}
+    if isinstance(value, (int, float)):
+        return {"$or": [{field: {"$gt": value}}, {field: {"$type": _TYPES_AFTER_NUMBER}}]}
+    if isinstance(value, str):
+        return {"$or": [{field: {"$gt": value}}, {field: {"$type": _TYPES_AFTER_STRING}}]}
+    return {field: {"$gt": value}}
+
+
+def _keyset_after(name: str, after: Optional[CursorKey]) -> Dict[str, Any]:
+    """컬렉션 name의 문서 중 전역 정렬 순서상 커서보다 뒤에 오는 문서 조건 (커서가 없으면 전부)."""
+    if after is None:
+        return {}
+    source, requirement_id, course_code, _id = after
+    if name > source:
+        tail: Optional[Dict[str, Any]] = {}
+    elif name == source:
+        tail = {"_id": {"$gt": _id}}
+    else:
+        tail = None
+
+    same_code = [{"requirement_id": requirement_id}, {"course_code": course_code}]
+    branches = [
+        _bson_gt("requirement_id", requirement_id),
+        {"$and": [{"requirement_id": requirement_id}, _bson_gt("course_code", course_code)]},
+    ]
+    if tail is not None:
+        branches.append({"$and": same_code + ([tail] if tail else [])})
+    return {"$or": branches}
+
+
+async def _fetch_after(
+    db: AsyncIOMotorDatabase,
+    names: List[str],
+    match: Dict[str, Any],
+    after: Optional[CursorKey],
+    limit: int,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    커서 다음 페이지(after가 None이면 첫 페이지).
+    컬렉션마다 인덱스 seek 후 limit개만 읽어 전역 순서로 병합한다.
+    """
+    global _union_with_supported
+
+    def _branch_match(name: str) -> Dict[str, Any]:
+        keyset = _keyset_after(name, after)
+        if match and keyset:
+            return {"$and": [match, keyset]}
+        return match or keyset
+
+    if not names:
+        return [], None
+
+    if _can_aggregate(names):
+        def _branch(name: str) -> List[Dict[str, Any]]:
+            return [
+                {"$match": _branch_match(name)},
+                {"$sort": dict(_KEYSET_SORT)},
+                {"$limit": limit},
+                {"$addFields": {"_source": {"$literal": name}}},
+            ]
+
+        pipeline = _branch(names[0])
+        for name in names[1:]:
+            pipeline.append({"$unionWith": {"coll": name, "pipeline": _branch(name)}})
+        pipeline += [{"$sort": _UNION_SORT}, {"$limit": limit}, {"$project": _union_projection(fields)}]
+        try:
+            items = await db[names[0]].aggregate(pipeline).to_list(length=limit)
+        except OperationFailure as e:
+            if not _is_unsupported_stage(e):
+                raise
+            logger.warning("$unionWith unsupported; using per-collection keyset finds: %s", e)
+            _union_with_supported = False
+        else:
+            next_cursor = _doc_cursor(items[-1]) if len(items) == limit else None
+            return _from_union_docs(items), next_cursor
+
+    async def _seek(name: str) -> List[Dict[str, Any]]:
+        cur = db[name].find(_branch_match(name), _union_projection(fields)).sort(_KEYSET_SORT).limit(limit)
+        if FANOUT_MAX_TIME_MS > 0:
+            cur = cur.max_time_ms(FANOUT_MAX_TIME_MS)
+        docs = await cur.to_list(length=limit)
+        for d in docs:
+            d["_source"] = name
+        return docs
+
+    items = [d for docs in (await _fan_out(names, _seek)).values() for d in docs]
+    items.sort(key=_union_doc_key)
+    items = items[:limit]
+    next_cursor = _doc_cursor(items[-1]) if len(items) == limit else None
+    return _from_union_docs(items), next_cursor
 
 # --- 유틸: 다수 컬렉션 union + 글로벌 skip/limit --------------------------------
 
 async def _fetch_union_collections(
     db: AsyncIOMotorDatabase,
+    names: List[str],
     match: Dict[str, Any],
     skip: int,
     limit: int,
+    fields: Optional[Tuple[str, ...]] = None,
 ) -> List[Dict[str, Any]]:
     """
     여러 컬렉션을 union 하되, Mongo 집계 사용 없이 파이썬에서 합침.
-    글로벌 페이지네이션(skip/limit) 보장.
+    글로벌 페이지네이션(skip/limit) 보장. ($unionWith 미지원 서버용 대체 경로,
+    순서는 컬렉션 순서 그대로이고 전역 정렬은 하지 않음)
+
+    1) 모든 컬렉션의 count를 동시에 받고
+    2) 도착 순서와 무관하게 names 순서로 누적해 컬렉션별 (local_skip, take)를 정한 뒤
+    3) 가져올 게 있는 컬렉션만 동시에 find.
+    count가 실패한 컬렉션은 위치를 정할 수 없으므로 빼고 부분 결과로 표시한다.
     """
-    result: List[Dict[str, Any]] = []
-    if limit <= 0:
-        return result
+    if limit <= 0 or not names:
+        return []
 
-    # connection.get_course_collections(): 애플리케이션 정책대로 수집
-    colls = await get_course_collections()
-    if not colls:
-        return result
+    counts = await _count_each(db, names, match)
 
+    plan: Dict[str, Tuple[int, int]] = {}
     remaining_to_skip = skip
     remaining_to_take = limit
+    for name in names:
+        count = counts.get(name)
+        if count is None:
+            continue
+        if remaining_to_skip >= count:
+            remaining_to_skip -= count
+            continue
+        take_here = min(remaining_to_take, count - remaining_to_skip)
+        plan[name] = (remaining_to_skip, take_here)
+        remaining_to_skip = 0
+        remaining_to_take -= take_here
+        if remaining_to_take <= 0:
+            break
+
+    async def _fetch(name: str) -> List[Dict[str, Any]]:
+        local_skip, take_here = plan[name]
+        return await _fetch_from_collection(
+            db[name], match,
+            skip=local_skip, limit=take_here, max_time_ms=FANOUT_MAX_TIME_MS, fields=fields,
+        )
+
+    chunks = await _fan_out(list(plan), _fetch)
+    return [d for chunk in chunks.values() for d in chunk]
+
+# --- 인메모리 카탈로그 스냅샷 ---------------------------------------------------
+#
+# 과목 데이터는 학기 중 거의 바뀌지 않으므로 모든 과목 컬렉션을 한 번 읽어
+# 캐스팅/정규화까지 끝낸 스냅샷을 프로세스 메모리에 두고 /courses, /courses/count를
+# 여기서 바로 응답한다. 새 스냅샷은 전부 만든 뒤 참조만 교체하므로, 요청이
+# 반쯤 만들어진 카탈로그를 보는 일은 없다.
+
+CATALOG_VERSION_KEY = "courses"
+CATALOG_SNAPSHOT_ENABLED = os.getenv("COURSE_CATALOG_SNAPSHOT", "1").lower() not in ("0", "false", "no")
+# data_versions 폴링 주기(초). 0 이하면 폴링하지 않음
+CATALOG_POLL_SECONDS = float(os.getenv("COURSE_CATALOG_POLL_SECONDS", "30"))
+# 버전 변화가 없어도 이 시간(초)이 지나면 다시 적재. 0이면 버전 변화 때만 적재
+CATALOG_MAX_AGE_SECONDS = float(os.getenv("COURSE_CATALOG_MAX_AGE_SECONDS", "0"))
+
+
+# q 검색 필드별 가중치 (_build_match의 $or 대상 필드와 같음)
+_SEARCH_WEIGHTS: Dict[str, float] = {
+    "course_code": 5.0,
+    "course_name": 4.0,
+    "professor": 3.0,
+    "category": 2.0,
+    "requirement_id": 1.0,
+    "비고": 0.5,
+}
+_JAMO_WEIGHTS: Dict[str, float] = {"course_name": 4.0, "professor": 3.0}
+_SUGGEST_KINDS = ("course_name", "professor", "course_code")
+# 이 문자가 없으면 q를 정규식이 아닌 리터럴로 보고 색인 검색
+_REGEX_META = set(".^$*+?{}[]()|\\")
+# 열 비트셋으로 필터/패싯을 계산하는 필드 (_build_match의 동등 조건 + ?collection=)
+_COLUMN_FIELDS = FACET_FIELDS + ("source_collection",)
+_COLLECTION_COLUMN = "$collection"  # CatalogRow.collection (조건 키와 겹치지 않게 $로 시작)
+
+
+class CatalogRow:
+    __slots__ = ("collection", "raw", "doc", "key", "json")
+
+    def __init__(self, collection: str, raw: Dict[str, Any], doc: Optional[Dict[str, Any]]):
+        self.collection = collection
+        self.raw = raw  # 필터 평가용 원본 값 (캐스팅/기본값 주입 전, Mongo와 같은 기준)
+        self.doc = doc  # 응답용 정규화 문서 (course_name이 없으면 None)
+        # $unionWith 경로의 _UNION_SORT와 같은 전역 정렬 키
+        self.key = (
+            _bson_order(raw.get("requirement_id")),
+            _bson_order(raw.get("course_code")),
+            collection,
+            _bson_order(raw.get("_id")),
+        )
+        self.json: Optional[bytes] = None  # doc의 CourseOut JSON (FAST_RESPONSES, 처음 응답할 때 채움)
+
+
+class CatalogSnapshot:
+    def __init__(self, version: int, collections: List[str], rows: List[CatalogRow], materialized: bool = False):
+        self.version = version
+        self.collections = collections
+        self.materialized = materialized  # course_catalog 한 컬렉션에서 적재했는지
+        self.rows = sorted(rows, key=lambda r: r.key)
+        self.by_code: Dict[str, List[CatalogRow]] = {}  # 정규화된 course_code → 분반들 (/courses/batch)
+        for row in self.rows:
+            if row.doc and row.doc.get("course_code"):
+                self.by_code.setdefault(row.doc["course_code"], []).append(row)
+        # 필터/개수/패싯용 열 비트셋 (행 위치 = self.rows 내 위치, 즉 전역 정렬 순서)
+        self.columns = BitsetIndex(len(self.rows))
+        self.columns.add_values(_COLLECTION_COLUMN, [row.collection for row in self.rows])
+        for field in _COLUMN_FIELDS:
+            self.columns.add_values(field, [row.raw.get(field) for row in self.rows])
+        self.columns.add_bits(TIMESLOT_MASK_FIELD, [row.raw.get(TIMESLOT_MASK_FIELD) for row in self.rows])
+        # q 검색용 n-gram 역색인 (문서 id = self.rows 내 위치)
+        self.search_index = NgramIndex(_SEARCH_WEIGHTS, exact_fields=("course_code",))
+        for pos, row in enumerate(self.rows):
+            for field in _SEARCH_WEIGHTS:
+                value = row.raw.get(field)
+                for text in (value if isinstance(value, list) else [value]):
+                    self.search_index.add(pos, field, text)
+        # 초성/오타 허용 검색용 자모 색인
+        self.jamo_index = JamoIndex(_JAMO_WEIGHTS)
+        for pos, row in enumerate(self.rows):
+            for field in _JAMO_WEIGHTS:
+                self.jamo_index.add(pos, field, row.raw.get(field))
+        # /courses/suggest 자동완성용 (가중치 = 같은 이름을 가진 분반 수)
+        self.suggest_index = PrefixIndex()
+        for row in self.rows:
+            if not row.doc:
+                continue
+            for kind in _SUGGEST_KINDS:
+                value = row.doc.get(kind)
+                if isinstance(value, str):
+                    self.suggest_index.add(kind, value)
+        self.suggest_index.freeze()
+        self.loaded_at = time.monotonic()
+        self.loaded_at_iso = now_iso()
+
 
-    for col in colls:
-        defaults = _defaults_from_collection(col.name)
+_catalog: Optional[CatalogSnapshot] = None
+_catalog_lock = asyncio.Lock()
+_catalog_task: Optional[asyncio.Task] = None
+# 이 워커가 마지막으로 확인한 과목 데이터 버전 (ETag / 결과 캐시 무효화 기준)
+_data_version: Optional[int] = None
 
-        # 각 컬렉션에서 먼저 개수 확인(가벼운 count)
+
+def get_catalog() -> Optional[CatalogSnapshot]:
+    return _catalog if CATALOG_SNAPSHOT_ENABLED else None
+
+
+async def _load_catalog_snapshot(version: int) -> CatalogSnapshot:
+    names: List[str] = []
+    rows: List[CatalogRow] = []
+    projection = dict(_COURSE_PROJECTION, _id=1, **{k: 1 for k in TIMESLOT_SOURCE_KEYS + (TIMESLOT_MASK_FIELD,)})
+    db = get_db()
+    # 데이터가 바뀐 시점이므로 컬렉션 구성도 다시 읽는다
+    registry = await refresh_registry()
+    if _uses_materialized(registry):
+        # 이미 정규화된 문서: 정렬/필터도 Mongo의 course_catalog 조회와 같은 값 기준
+        async for d in db[CATALOG_COLLECTION].find({}, projection):
+            raw = _with_timeslot_mask(d)
+            rows.append(CatalogRow(CATALOG_COLLECTION, raw, _response_doc(d, CATALOG_COLLECTION)))
+        return CatalogSnapshot(version, [CATALOG_COLLECTION], rows, materialized=True)
+
+    for info in registry.sources:
+        names.append(info.name)
+        async for d in db[info.name].find({}, projection):
+            raw = _with_timeslot_mask(d)
+            rows.append(CatalogRow(info.name, raw, _response_doc(d, info.name)))
+    return CatalogSnapshot(version, names, rows)
+
+
+def _with_timeslot_mask(d: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    필터 평가용 raw 사본. timeslot_mask는 매번 BinData를 풀지 않도록 int로 둔다
+    (원본 컬렉션이면 여기서 해석). d에서는 마스크 계산에만 쓴 필드를 빼서
+    응답 문서가 Mongo 경로(_COURSE_PROJECTION)와 같게 한다.
+    """
+    raw = dict(d)
+    mask = course_timeslot_mask(d)
+    raw.pop(TIMESLOT_MASK_FIELD, None)
+    if mask is not None:
+        raw[TIMESLOT_MASK_FIELD] = mask
+    for k in TIMESLOT_SOURCE_KEYS + (TIMESLOT_MASK_FIELD,):
+        if k not in _COURSE_PROJECTION:
+            d.pop(k, None)
+    return raw
+
+
+async def reload_catalog(version: Optional[int] = None) -> CatalogSnapshot:
+    """모든 과목 컬렉션을 다시 읽어 스냅샷을 통째로 교체한다."""
+    global _catalog
+    async with _catalog_lock:
+        if version is None:
+            version = await get_data_version(CATALOG_VERSION_KEY)
+        snapshot = await _load_catalog_snapshot(version)
+        _catalog = snapshot
+        _observe_data_version(snapshot.version)
+        _result_cache.invalidate()
+    logger.info(
+        "course catalog loaded version=%s collections=%d rows=%d",
+        snapshot.version, len(snapshot.collections), len(snapshot.rows),
+    )
+    return snapshot
+
+
+def _observe_data_version(version: int) -> None:
+    """새 데이터 버전을 기록. 바뀌었으면 결과 캐시를 비운다."""
+    global _data_version
+    if _data_version is not None and version != _data_version:
+        _result_cache.invalidate()
+    _data_version = version
+
+
+async def _poll_catalog() -> None:
+    while True:
+        await asyncio.sleep(CATALOG_POLL_SECONDS)
         try:
-            count = await col.count_documents(match)
-        except Exception:
-            # count가 안 될 경우라도 그냥 넘어가서 find 시도
-            count = None
-
-        # 스킵 처리
-        local_skip = 0
-        if count is not None:
-            if remaining_to_skip >= count:
-                remaining_to_skip -= count
+            version = await get_data_version(CATALOG_VERSION_KEY)
+            if not CATALOG_SNAPSHOT_ENABLED:
+                # 스냅샷 없이 Mongo에서 조회하는 경우에도 버전은 따라간다 (결과 캐시, ETag)
+                _observe_data_version(version)
                 continue
+            current = _catalog
+            expired = (
+                current is not None
+                and CATALOG_MAX_AGE_SECONDS > 0
+                and time.monotonic() - current.loaded_at >= CATALOG_MAX_AGE_SECONDS
+            )
+            if current is None or current.version != version or expired:
+                await reload_catalog(version)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("course catalog refresh failed")
+
+
+async def start_catalog() -> None:
+    """startup 훅: 첫 스냅샷을 적재하고 버전 폴링을 시작 (스냅샷을 끄면 결과 캐시 무효화용으로만 폴링)."""
+    global _catalog_task
+    if CATALOG_SNAPSHOT_ENABLED:
+        try:
+            await reload_catalog()
+        except Exception:
+            # 적재 실패 시에도 서버는 뜨고, 폴링이 성공할 때까지 Mongo에서 직접 조회
+            logger.exception("initial course catalog load failed; falling back to MongoDB")
+    else:
+        try:
+            _observe_data_version(await get_data_version(CATALOG_VERSION_KEY))
+        except Exception:
+            logger.exception("reading course data version failed")
+    if CATALOG_POLL_SECONDS > 0:
+        _catalog_task = asyncio.create_task(_poll_catalog())
+
+
+async def stop_catalog() -> None:
+    global _catalog_task
+    if _catalog_task is not None:
+        _catalog_task.cancel()
+        try:
+            await _catalog_task
+        except asyncio.CancelledError:
+            pass
+        _catalog_task = None
+
+# --- 유틸: _build_match 조건을 메모리에서 평가 ----------------------------------
+
+def _compile_match(match: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    _build_match가 만드는 Mongo 조건(동등 비교, $regex, $or/$and)을 파이썬 판정 함수로 변환.
+    Mongo와 같은 의미를 보장할 수 없는 연산자/정규식이면 ValueError.
+    """
+    preds: List[Callable[[Dict[str, Any]], bool]] = []
+    for key, cond in match.items():
+        if key in ("$or", "$and"):
+            subs = [_compile_match(c) for c in cond]
+            if key == "$or":
+                preds.append(lambda d, subs=subs: any(p(d) for p in subs))
             else:
-                local_skip = remaining_to_skip
-                remaining_to_skip = 0
+                preds.append(lambda d, subs=subs: all(p(d) for p in subs))
+        elif key.startswith("$"):
+            raise ValueError(f"unsupported operator {key}")
+        elif isinstance(cond, dict) and set(cond) == {"$bitsAllClear"}:
+            mask = cond["$bitsAllClear"]
+            mask = mask_from_bytes(mask) if isinstance(mask, bytes) else mask
+            preds.append(lambda d, k=key, m=mask: _bits_clear(d.get(k), m))
+        elif isinstance(cond, dict):
+            if set(cond) - {"$regex", "$options"}:
+                raise ValueError(f"unsupported condition on {key}")
+            flags = re.IGNORECASE if "i" in cond.get("$options", "") else 0
+            try:
+                pattern = re.compile(cond["$regex"], flags)
+            except re.error as e:
+                raise ValueError(str(e))
+            preds.append(lambda d, k=key, p=pattern: _regex_hit(d.get(k), p))
         else:
-            # count 실패 시, local_skip은 remaining_to_skip로 추정
-            local_skip = remaining_to_skip
-            remaining_to_skip = 0
+            preds.append(lambda d, k=key, v=cond: _eq_hit(d.get(k), v))
+    return lambda d: all(p(d) for p in preds)
 
-        # 이 컬렉션에서 가져올 양
-        take_here = remaining_to_take
-        chunk = await _fetch_from_collection(col, defaults, match, skip=local_skip, limit=take_here)
-        result.extend(chunk)
 
-        remaining_to_take -= len(chunk)
-        if remaining_to_take <= 0:
-            break
+def _eq_hit(value: Any, expected: Any) -> bool:
+    # Mongo: 배열 필드는 원소 중 하나라도 같으면 일치
+    if isinstance(value, list):
+        return expected in value
+    return value == expected
 
-    return result
 
-# --- Normalize course document for response -----------------------------------
-def _normalize_course_for_response(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    if not isinstance(doc, Dict):
+def _bits_clear(value: Any, mask: int) -> bool:
+    # Mongo: 정수/BinData가 아닌 값(필드 없음 포함)에는 비트 연산자가 일치하지 않음
+    if isinstance(value, bytes):
+        value = mask_from_bytes(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return False
+    return value & mask == 0
+
+
+def _regex_hit(value: Any, pattern: "re.Pattern[str]") -> bool:
+    # Mongo: 문자열이 아닌 값에는 $regex가 일치하지 않음
+    if isinstance(value, str):
+        return pattern.search(value) is not None
+    if isinstance(value, list):
+        return any(isinstance(v, str) and pattern.search(v) for v in value)
+    return False
+
+
+def _is_literal(q: str) -> bool:
+    return not any(ch in _REGEX_META for ch in q)
+
+
+def _search_scores(snapshot: CatalogSnapshot, q: str, mode: str) -> Optional[Dict[int, float]]:
+    """
+    q를 색인으로 검색한 (행 위치 → 점수). 색인으로 처리할 수 없으면 None ($regex 사용).
+    - substring: n-gram 색인 (리터럴 q의 $regex와 같은 결과)
+    - chosung: 과목명/교수명 초성 접두 일치 ('ㅈㄹㄱㅈ' → 자료구조)
+    - fuzzy: substring 결과 + 과목명/교수명 자모 편집 거리 1~2 이내 부분 일치
+    - auto: q가 자음으로만 되어 있으면 chosung, 아니면 substring
+    """
+    if mode == "auto":
+        mode = "chosung" if is_chosung_query(q) else "substring"
+    if mode == "chosung":
+        return snapshot.jamo_index.search_chosung(q)
+    scores = snapshot.search_index.search(q) if _is_literal(q) else None
+    if mode == "fuzzy":
+        scores = dict(scores or {})
+        for pos, score in snapshot.jamo_index.search_fuzzy(q).items():
+            if score > scores.get(pos, 0.0):
+                scores[pos] = score
+    return scores
+
+
+def _select_bits(
+    snapshot: CatalogSnapshot,
+    match: Dict[str, Any],
+    collection: Optional[str],
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    (열 비트셋으로 푼 조건들의 AND, 비트셋으로 못 푼 나머지 조건).
+    동등 비교와 $bitsAllClear는 비트셋 연산으로, $regex/$or 등은 나머지로 남긴다.
+    """
+    columns = snapshot.columns
+    bits = columns.eq(_COLLECTION_COLUMN, collection) if collection else columns.all
+    residual: Dict[str, Any] = {}
+    for key, cond in match.items():
+        if isinstance(cond, dict):
+            if set(cond) == {"$bitsAllClear"} and columns.has_bits(key):
+                mask = cond["$bitsAllClear"]
+                bits &= columns.bits_all_clear(key, mask_from_bytes(mask) if isinstance(mask, bytes) else mask)
+                continue
+        elif not key.startswith("$") and not isinstance(cond, list) and columns.has_values(key):
+            bits &= columns.eq(key, cond)
+            continue
+        residual[key] = cond
+    return bits, residual
+
+
+class CatalogSelection:
+    """
+    스냅샷 조회 결과: 조건에 맞는 행 위치 비트셋 + (관련도 순이면) 정렬된 (점수, 행) 목록.
+    비트셋으로 못 푼 조건(pred)은 행을 꺼낼 때 평가하고, 개수/패싯이 필요할 때 한 번 훑어
+    비트셋을 확정한다. 응답 문서는 페이지에 든 행만 꺼낸다.
+    """
+
+    def __init__(
+        self,
+        snapshot: CatalogSnapshot,
+        bits: int,
+        pred: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        hits: Optional[List[Tuple[float, CatalogRow]]] = None,
+    ):
+        self.snapshot = snapshot
+        self.bits = bits
+        self.pred = pred
+        self.hits = hits
+
+    def rows(
+        self,
+        after: Optional[CursorKey] = None,
+        after_score: Optional[float] = None,
+    ) -> Iterator[Tuple[Optional[float], CatalogRow]]:
+        """(검색 점수, 행)을 순서대로. after(커서)가 있으면 이진 탐색으로 그 다음 행부터."""
+        if self.hits is not None:
+            rank_key = lambda t: (-t[0], t[1].key)
+            start = bisect.bisect_right(self.hits, (-after_score, _cursor_sort_key(after)), key=rank_key) if after else 0
+            return iter(self.hits[start:])
+        rows = self.snapshot.rows
+        start = bisect.bisect_right(rows, _cursor_sort_key(after), key=lambda r: r.key) if after else 0
+        if self.pred is None:
+            return ((None, rows[pos]) for pos in iter_positions(self.bits, start))
+        pred = self.pred
+        return ((None, rows[pos]) for pos in iter_positions(self.bits, start) if pred(rows[pos].raw))
+
+    def _exact_bits(self) -> int:
+        if self.pred is not None:
+            rows, pred = self.snapshot.rows, self.pred
+            self.bits = from_positions([pos for pos in iter_positions(self.bits) if pred(rows[pos].raw)], len(rows))
+            self.pred = None
+        return self.bits
+
+    def count(self) -> int:
+        return self._exact_bits().bit_count()
+
+    def facets(self, fields: Tuple[str, ...]) -> FacetCounts:
+        bits = self._exact_bits()
+        return {f: self.snapshot.columns.count_by(f, bits) for f in fields}
+
+
+def _catalog_select(
+    match: Dict[str, Any],
+    collection: Optional[str],
+    q: Optional[str] = None,
+    mode: str = "auto",
+    rank: bool = True,
+) -> Optional[CatalogSelection]:
+    """
+    스냅샷으로 응답할 수 있으면 조건에 맞는 행 선택, 아니면 None.
+
+    - q를 색인으로 검색할 수 있으면(_search_scores) $regex 대신 색인 후보만 보고 관련도 순
+      (course_code 완전 일치 > 필드 가중치 합 > 전역 정렬 키)으로 정렬한다.
+    - 그 외에는 전역 정렬 순서이며 점수는 None.
+    rank=False면 항상 전역 정렬 순서 (점수 없는 커서로 이어 가는 경우).
+    """
+    snapshot = get_catalog()
+    if snapshot is None:
         return None
-    d = dict(doc)
-    # course_name backfill
-    if not d.get("course_name"):
-        for k in ("name", "title", "courseTitle", "과목명"):
-            v = d.get(k)
-            if isinstance(v, str) and v.strip():
-                d["course_name"] = v.strip()
-                break
-    if not d.get("course_name"):
+    if collection and snapshot.materialized:
+        match, collection = dict(match, source_collection=collection), None
+    if collection and collection not in snapshot.collections:
         return None
-    # timeslot backfill
-    if not d.get("timeslot"):
-        for k in ("time", "times", "schedule", "시간표"):
-            v = d.get(k)
-            if isinstance(v, str) and v.strip():
-                d["timeslot"] = v.strip()
-                break
-    # class backfill (normalize into key 'class')
-    if not d.get("class"):
-        for k in ("class", "section", "분반"):
-            v = d.get(k)
-            if isinstance(v, str) and v.strip():
-                d["class"] = v.strip()
-                break
-    # credits backfill
-    if d.get("credits") is None:
-        v = d.get("credit")
-        if isinstance(v, (int, float)):
-            d["credits"] = int(v)
-        else:
-            try:
-                d["credits"] = int(str(v)) if v is not None else None
-            except Exception:
-                pass
-    # course_code cast to string if numeric
-    cc = d.get("course_code")
-    if isinstance(cc, (int, float)):
-        d["course_code"] = str(int(cc))
-    return d
+
+    scores = _search_scores(snapshot, q, mode) if q and rank else None
+    ranked = scores is not None
+    # _build_match의 $or는 q 조건이므로 색인 검색으로 대체
+    bits, residual = _select_bits(snapshot, {k: v for k, v in match.items() if k != "$or"} if ranked else match, collection)
+    try:
+        pred = _compile_match(residual) if residual else None
+    except ValueError:
+        return None
+
+    if not ranked:
+        return CatalogSelection(snapshot, bits, pred)
+
+    rows = snapshot.rows
+    bits &= from_positions(list(scores), len(rows))
+    hits = [(scores[pos], rows[pos]) for pos in iter_positions(bits) if pred is None or pred(rows[pos].raw)]
+    if pred is not None:
+        bits = from_positions([pos for pos in iter_positions(bits) if pred(rows[pos].raw)], len(rows))
+    hits.sort(key=lambda t: (-t[0], t[1].key))
+    return CatalogSelection(snapshot, bits, hits=hits)
+
+
+def _row_json(row: CatalogRow) -> bytes:
+    # 스냅샷 행은 바뀌지 않으므로 한 번 검증/인코딩한 조각을 재사용
+    if row.json is None:
+        row.json = _COURSE_ADAPTER.dump_json(_COURSE_ADAPTER.validate_python(row.doc), by_alias=True)
+    return row.json
+
+
+def _row_cursor(row: CatalogRow, score: Optional[float] = None) -> str:
+    return _encode_cursor(
+        row.collection, row.raw.get("requirement_id"), row.raw.get("course_code"), row.raw.get("_id"), score,
+    )
+
+
+def _sort_key(d: Dict[str, Any]) -> Tuple[str, str]:
+    # 문자열 캐스팅이 끝났으므로 안전
+    return (d.get("requirement_id") or "", d.get("course_code") or "")
+
+# --- 조회 대상: course_catalog 또는 원본 컬렉션들 ----------------------------------
+#
+# ETL(database.course_catalog)로 만든 course_catalog가 있으면 원본 컬렉션들을 팬아웃하지 않고
+# 그 한 컬렉션만 조회한다. ?collection= 은 source_collection 조건으로 바뀐다.
+# COURSE_CATALOG_SOURCE=collections 이면 항상 원본 컬렉션들을 조회.
+
+CATALOG_SOURCE = os.getenv("COURSE_CATALOG_SOURCE", "auto")
+
+
+def _uses_materialized(registry: CourseRegistry) -> bool:
+    return CATALOG_SOURCE != "collections" and registry.catalog is not None
+
+
+async def _course_sources(
+    db: AsyncIOMotorDatabase,
+    collection: Optional[str],
+    match: Dict[str, Any],
+) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+    """
+    (조회할 컬렉션명 목록, 조건). collection을 지정했는데 없는 컬렉션이면 None.
+    컬렉션 구성은 레지스트리에서 읽으므로 메타데이터 명령을 보내지 않는다.
+    """
+    registry = await current_registry()
+    if _uses_materialized(registry):
+        if collection:
+            match = dict(match, source_collection=collection)
+        return [CATALOG_COLLECTION], match
+    if TIMESLOT_MASK_FIELD in match:
+        # 원본 컬렉션에는 timeslot_mask가 없다 (스냅샷은 적재할 때 직접 해석)
+        raise HTTPException(
+            status_code=409,
+            detail="time filters need the course catalog; run POST /courses/catalog/build first",
+        )
+    if collection:
+        if not registry.exists(collection):
+            return None
+        return [collection], match
+    return registry.names(), match
+
+# --- 조회 결과 캐시 ---------------------------------------------------------------
+#
+# 수강신청 시작 직후엔 group=전공&year=2025 같은 같은 조건이 분당 수천 번 들어온다.
+# (_build_match 조건, skip/limit/collection/cursor/mode)를 키로 결과를 LRU+TTL로 보관하고,
+# 같은 키가 동시에 들어오면 DB 조회는 한 번만 한다. 과목 데이터 버전이 바뀌면
+# (스냅샷 재적재, 카탈로그 빌드, 폴링에서 버전 변화 감지) 통째로 비운다.
+# 부분 결과(X-Partial-Results)는 캐시하지 않는다.
+
+RESULT_CACHE_SIZE = int(os.getenv("COURSE_RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("COURSE_RESULT_CACHE_TTL_SECONDS", "60"))
+_result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS)
+
+
+class CachedResult(NamedTuple):
+    body: Any
+    next_cursor: Optional[str] = None
+    partial: Tuple[str, ...] = ()
+
+
+def _match_key(match: Dict[str, Any]) -> str:
+    return json_util.dumps(match, sort_keys=True)
+
+
+async def _cached(
+    response: Response,
+    key: Tuple[Any, ...],
+    load: Callable[[], Awaitable[CachedResult]],
+    etag: Optional[str] = None,
+) -> Any:
+    async def _load() -> CachedResult:
+        result = await load()
+        if FAST_RESPONSES_ENABLED and isinstance(result.body, BaseModel):
+            # 이미 검증된 모델: 한 번 인코딩해서 바이트로 캐시
+            result = result._replace(body=result.body.model_dump_json(by_alias=True).encode("utf-8"))
+        return result
+
+    result = await _result_cache.get_or_load(key, _load, cacheable=lambda r: not r.partial)
+    if result.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = result.next_cursor
+    _set_partial_header(response, list(result.partial))
+    _set_cache_headers(response, etag)
+    if isinstance(result.body, bytes):
+        # FAST_RESPONSES: response_model 재검증/직렬화 없이 그대로 (헤더는 옮겨 싣는다)
+        return json_response(result.body, response)
+    return result.body
+
+# --- 조건부 GET (ETag) -------------------------------------------------------------
+#
+# 과목 데이터는 학기 중 거의 그대로이므로, 이 워커가 아는 데이터 버전 + 조회 경로(스냅샷/Mongo)
+# + 정규화한 쿼리 문자열로 강한 ETag를 만든다. If-None-Match가 맞으면 MongoDB 조회와
+# 직렬화 없이 바로 304. 버전을 아직 모르거나 부분 결과면 ETag를 붙이지 않는다.
+
+HTTP_MAX_AGE_SECONDS = int(os.getenv("COURSE_HTTP_MAX_AGE_SECONDS", "30"))
+_CACHE_CONTROL = f"public, max-age={HTTP_MAX_AGE_SECONDS}, must-revalidate"
+
+
+def _course_etag(request: Request) -> Optional[str]:
+    version = _catalog.version if get_catalog() is not None else _data_version
+    if version is None:
+        return None
+    source = "s" if get_catalog() is not None else "m"
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(f"{request.url.path}?{query}".encode("utf-8"), digest_size=8).hexdigest()
+    return f'"c{version}{source}-{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _not_modified(request: Request) -> Tuple[Optional[str], Optional[Response]]:
+    """(ETag, 304 응답). If-None-Match가 현재 ETag와 맞을 때만 304 응답이 있다."""
+    etag = _course_etag(request)
+    if etag is not None and _etag_matches(request.headers.get("if-none-match"), etag):
+        return etag, Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+    return etag, None
+
+
+def _set_cache_headers(response: Response, etag: Optional[str]) -> None:
+    if PARTIAL_RESULTS_HEADER in response.headers:
+        response.headers["Cache-Control"] = "no-store"
+    elif etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = _CACHE_CONTROL
 
 # --- 엔드포인트: 목록 -----------------------------------------------------------
 
+SearchMode = Literal["auto", "substring", "chosung", "fuzzy"]
+_SEARCH_MODE_DESCRIPTION = (
+    "q 검색 방식: auto(자음만 있으면 chosung)/substring/chosung(초성 접두)/fuzzy(자모 오타 허용). "
+    "chosung/fuzzy는 카탈로그 스냅샷이 있을 때만 적용"
+)
+
 @router.get("", response_model=List[CourseOut])
 async def list_courses(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
     year: Optional[int] = None,
     group: Optional[str] = Query(None, description="전공/교양/일반선택/교직"),
     category: Optional[str] = None,                   # 전공필수/전공선택/핵심/균형/기초 등
     major_track: Optional[str] = None,                # 컴퓨터 과학/컴퓨터 소프트웨어/빅데이터
     general_type: Optional[str] = None,               # 핵심 교양/균형 교양/기초 교양/일반선택·교직
+    free_slots: Optional[str] = Query(None, description=_FREE_SLOTS_DESCRIPTION),
+    exclude_conflicts_with: Optional[str] = Query(None, description=_CONFLICTS_DESCRIPTION),
     limit: int = Query(20, ge=1, le=100), 
     skip: int = Query(0, ge=0), 
     collection: Optional[str] = Query(None, description="특정 컬렉션만"),
+    cursor: Optional[str] = Query(None, description=f"이전 응답의 {NEXT_CURSOR_HEADER} 헤더 값 (주면 skip 무시)"),
+    mode: SearchMode = Query("auto", description=_SEARCH_MODE_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
 ):
-    db = get_db()
+    etag, not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
     match = _build_match(q, year, group, category, major_track, general_type)
+    match = _apply_time_filter(match, free_slots, exclude_conflicts_with)
+    selected = _parse_fields(fields)
+    after, after_score = _decode_cursor(cursor) if cursor else (None, None)
+    if after is not None:
+        skip = 0
 
-    # 특정 컬렉션만
-    if collection:
-        if collection not in (await db.list_collection_names()):
-            # 컬렉션명이 잘못된 경우에도 200/빈배열로 줄 수 있지만,
-            # 디버깅 편의상 404가 더 명확할 수 있음. 여기선 빈 배열 반환으로 둠.
-            return []
-        defaults = _defaults_from_collection(collection)
-        col = db[collection]
-        docs = await _fetch_from_collection(col, defaults, match, skip=skip, limit=limit)
-        docs = [_normalize_course_for_response(d) for d in (docs or [])]
-        docs = [d for d in docs if d]
-        return docs
+    key = ("list", _match_key(match), skip, limit, collection, cursor, mode, selected)
+    return await _cached(
+        response, key,
+        lambda: _list_courses(match, collection, skip, limit, after, after_score, q, mode, selected),
+        etag,
+    )
 
-    # 여러 컬렉션 union
-    docs = await _fetch_union_collections(db, match, skip=skip, limit=limit)
 
-    # (선택) 간단 정렬: requirement_id -> course_code
-    # 문자열 캐스팅이 끝났으므로 안전
-    def _key(d: Dict[str, Any]) -> Tuple[str, str]:
-        return (d.get("requirement_id") or "", d.get("course_code") or "")
-    docs.sort(key=_key)
+async def _list_courses(
+    match: Dict[str, Any],
+    collection: Optional[str],
+    skip: int,
+    limit: int,
+    after: Optional[CursorKey],
+    after_score: Optional[float],
+    q: Optional[str],
+    mode: str,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> CachedResult:
+    """fields를 고르면 모양이 CourseOut과 달라지므로 FAST_RESPONSES와 상관없이 바이트로 돌려준다."""
+    db = get_db()
+
+    # 스냅샷이 있으면 메모리에서 응답 (검색어가 있으면 관련도 순, 없으면 $unionWith 경로와 같은 전역 순서)
+    # 관련도 순 페이지는 관련도 커서로만 이어 간다
+    selection = _catalog_select(match, collection, q=q, mode=mode, rank=after is None or after_score is not None)
+    if selection is not None:
+        page = list(itertools.islice(selection.rows(after, after_score), skip, skip + limit))
+        next_cursor = _row_cursor(page[-1][1], page[-1][0]) if len(page) == limit else None
+        if fields is not None:
+            return CachedResult(_encode_courses([r.doc for _, r in page if r.doc], fields), next_cursor)
+        if FAST_RESPONSES_ENABLED:
+            return CachedResult(json_array(_row_json(r) for _, r in page if r.doc), next_cursor)
+        return CachedResult([r.doc for _, r in page if r.doc], next_cursor)
 
-    docs = [_normalize_course_for_response(d) for d in (docs or [])]
-    docs = [d for d in docs if d]
-    return docs
+    sources = await _course_sources(db, collection, match)
+    if sources is None:
+        # 컬렉션명이 잘못된 경우에도 200/빈배열로 줄 수 있지만,
+        # 디버깅 편의상 404가 더 명확할 수 있음. 여기선 빈 배열 반환으로 둠.
+        return CachedResult(b"[]" if fields is not None else [])
+
+    names, match = sources
+    partial = _partial_scope()
+    docs, next_cursor = await _list_from_db(db, names, match, skip, limit, after, fields)
+    if FAST_RESPONSES_ENABLED or fields is not None:
+        return CachedResult(_encode_courses(docs, fields), next_cursor, tuple(partial))
+    return CachedResult(docs, next_cursor, tuple(partial))
+
+
+async def _list_from_db(
+    db: AsyncIOMotorDatabase,
+    names: List[str],
+    match: Dict[str, Any],
+    skip: int,
+    limit: int,
+    after: Optional[CursorKey],
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """MongoDB에서 한 페이지를 읽어 응답용으로 정규화. (문서 목록, 다음 커서)"""
+    next_cursor: Optional[str] = None
+    page = None if after is not None else await _aggregate_union_page(db, names, match, skip, limit, fields=fields)
+    if after is not None or (page is None and skip == 0):
+        # 커서 위치부터 컬렉션별 인덱스 seek ($unionWith가 없어도 첫 페이지는 같은 순서로)
+        docs, next_cursor = await _fetch_after(db, names, match, after, limit, fields)
+    elif page is not None:
+        # 한 번의 집계로 전역 정렬된 페이지
+        docs, next_cursor = page.items, page.next_cursor
+    elif len(names) == 1:
+        docs = await _fetch_from_collection(db[names[0]], match, skip=skip, limit=limit, fields=fields)
+    else:
+        # 여러 컬렉션 union (find 기반 대체 경로)
+        docs = await _fetch_union_collections(db, names, match, skip=skip, limit=limit, fields=fields)
+        # (선택) 간단 정렬: requirement_id -> course_code
+        docs.sort(key=_sort_key)
+    return docs, next_cursor
 
 # --- 엔드포인트: 개수 -----------------------------------------------------------
 
 @router.get("/count", response_model=int)
 async def count_courses(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
     year: Optional[int] = None,
     group: Optional[str] = None,
     category: Optional[str] = None,
     major_track: Optional[str] = None,
     general_type: Optional[str] = None,
+    free_slots: Optional[str] = Query(None, description=_FREE_SLOTS_DESCRIPTION),
+    exclude_conflicts_with: Optional[str] = Query(None, description=_CONFLICTS_DESCRIPTION),
     collection: Optional[str] = None,
+    mode: SearchMode = Query("auto", description=_SEARCH_MODE_DESCRIPTION),
 ):
-    db = get_db()
+    etag, not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
     match = _build_match(q, year, group, category, major_track, general_type)
+    match = _apply_time_filter(match, free_slots, exclude_conflicts_with)
+    key = ("count", _match_key(match), collection, mode)
+    return await _cached(response, key, lambda: _count_courses(match, collection, q, mode), etag)
 
-    # 특정 컬렉션만
-    if collection:
-        if collection not in (await db.list_collection_names()):
-            return 0
-        try:
-            n = await db[collection].count_documents(match)
-            return int(n)
-        except Exception:
-            return 0
 
-    # union 모드: 모든 과목 컬렉션 합산
-    total = 0
-    colls = await get_course_collections()
-    for col in colls:
+async def _count_courses(
+    match: Dict[str, Any],
+    collection: Optional[str],
+    q: Optional[str],
+    mode: str,
+) -> CachedResult:
+    db = get_db()
+    selection = _catalog_select(match, collection, q=q, mode=mode)
+    if selection is not None:
+        return CachedResult(selection.count())
+
+    sources = await _course_sources(db, collection, match)
+    if sources is None:
+        return CachedResult(0)
+    names, match = sources
+
+    # 특정 컬렉션(또는 course_catalog) 하나
+    if len(names) == 1:
         try:
-            total += int(await col.count_documents(match))
+            n = await db[names[0]].count_documents(match)
+            return CachedResult(int(n))
         except Exception:
-            continue
-    return total
+            return CachedResult(0)
+
+    # union 모드: 한 번의 집계로 합산, 안 되면 컬렉션별 count를 동시에 받아 합산
+    n = await _aggregate_union_count(db, names, match)
+    if n is not None:
+        return CachedResult(n)
+    partial = _partial_scope()
+    total = sum((await _count_each(db, names, match)).values())
+    return CachedResult(total, partial=tuple(partial))
+
+# --- 엔드포인트: 목록 + 개수 + 패싯 한 번에 ---------------------------------------
+
+class FacetValue(BaseModel):
+    value: Any
+    count: int
+
+
+class CourseSearchResponse(BaseModel):
+    items: List[CourseOut]
+    total: int
+    facets: Dict[str, List[FacetValue]]  # 필드 → 값별 개수 (개수 많은 순)
+    next_cursor: Optional[str] = None
+
+
+_FACETS_ADAPTER = TypeAdapter(Dict[str, List[FacetValue]])
+
+
+def _facet_response(counts: FacetCounts) -> Dict[str, List[FacetValue]]:
+    return {
+        f: [
+            FacetValue(value=v, count=n)
+            for v, n in sorted(values.items(), key=lambda t: (-t[1], _bson_order(t[0])))
+        ]
+        for f, values in counts.items()
+    }
+
+
+def _search_from_catalog(
+    selection: CatalogSelection,
+    skip: int,
+    limit: int,
+    after: Optional[CursorKey],
+    after_score: Optional[float],
+) -> Any:
+    """
+    페이지는 커서 다음부터 필요한 행만 꺼내고, 전체 개수와 패싯 개수는 비트셋으로 센다.
+    FAST_RESPONSES면 행 JSON 조각을 이어 붙인 바이트 (CourseSearchResponse와 같은 모양).
+    """
+    page = list(itertools.islice(selection.rows(after, after_score), skip, skip + limit))
+    next_cursor = _row_cursor(page[-1][1], page[-1][0]) if len(page) == limit else None
+    rows = [r for _, r in page if r.doc]
+    total = selection.count()
+    facets = _facet_response(selection.facets(FACET_FIELDS))
+    if FAST_RESPONSES_ENABLED:
+        return json_object([
+            ("items", json_array(_row_json(r) for r in rows)),
+            ("total", dumps(total)),
+            ("facets", _FACETS_ADAPTER.dump_json(facets)),
+            ("next_cursor", dumps(next_cursor)),
+        ])
+    return CourseSearchResponse(items=[r.doc for r in rows], total=total, facets=facets, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=CourseSearchResponse)
+async def search_courses(
+    request: Request,
+    response: Response,
+    q: Optional[str] = None,
+    year: Optional[int] = None,
+    group: Optional[str] = Query(None, description="전공/교양/일반선택/교직"),
+    category: Optional[str] = None,
+    major_track: Optional[str] = None,
+    general_type: Optional[str] = None,
+    free_slots: Optional[str] = Query(None, description=_FREE_SLOTS_DESCRIPTION),
+    exclude_conflicts_with: Optional[str] = Query(None, description=_CONFLICTS_DESCRIPTION),
+    limit: int = Query(20, ge=1, le=100),
+    skip: int = Query(0, ge=0),
+    collection: Optional[str] = Query(None, description="특정 컬렉션만"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (주면 skip 무시)"),
+    mode: SearchMode = Query("auto", description=_SEARCH_MODE_DESCRIPTION),
+):
+    """
+    /courses 페이지 + /courses/count 전체 개수 + 필터 칩용 패싯 개수
+    (group/category/year/major_track/general_type)를 한 번에 반환.
+    패싯은 현재 조건에 맞는 결과 안에서 센 값이다.
+    """
+    etag, not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    match = _build_match(q, year, group, category, major_track, general_type)
+    match = _apply_time_filter(match, free_slots, exclude_conflicts_with)
+    after, after_score = _decode_cursor(cursor) if cursor else (None, None)
+    if after is not None:
+        skip = 0
+
+    key = ("search", _match_key(match), skip, limit, collection, cursor, mode)
+    return await _cached(
+        response, key, lambda: _search_courses(match, collection, skip, limit, after, after_score, q, mode), etag,
+    )
+
+
+async def _search_courses(
+    match: Dict[str, Any],
+    collection: Optional[str],
+    skip: int,
+    limit: int,
+    after: Optional[CursorKey],
+    after_score: Optional[float],
+    q: Optional[str],
+    mode: str,
+) -> CachedResult:
+    db = get_db()
+
+    # 스냅샷: 처음부터 한 번 훑으면서 페이지/개수/패싯을 함께 계산
+    # (점수 없는 커서면 list_courses와 같이 전역 정렬 순서로 이어 간다)
+    selection = _catalog_select(match, collection, q=q, mode=mode, rank=after is None or after_score is not None)
+    if selection is not None:
+        return CachedResult(_search_from_catalog(selection, skip, limit, after, after_score))
+
+    sources = await _course_sources(db, collection, match)
+    if sources is None:
+        return CachedResult(CourseSearchResponse(items=[], total=0, facets=_facet_response({f: {} for f in FACET_FIELDS})))
+    names, match = sources
+
+    # $unionWith: 페이지 + 개수 + 패싯을 한 번의 집계로
+    if after is None:
+        page = await _aggregate_union_page(db, names, match, skip, limit, FACET_FIELDS)
+        if page is not None:
+            return CachedResult(CourseSearchResponse(
+                items=page.items,
+                total=page.total,
+                facets=_facet_response(page.facets),
+                next_cursor=page.next_cursor,
+            ))
+
+    partial = _partial_scope()
+    docs, next_cursor = await _list_from_db(db, names, match, skip, limit, after)
+    total, counts = await _count_and_facets(db, names, match, FACET_FIELDS)
+    body = CourseSearchResponse(items=docs, total=total, facets=_facet_response(counts), next_cursor=next_cursor)
+    return CachedResult(body, partial=tuple(partial))
+
+
+# --- 엔드포인트: 과목코드 일괄 조회 -------------------------------------------------
+
+class CourseBatchRequest(BaseModel):
+    codes: List[str] = Field(..., min_length=1, max_length=200)
+
+
+async def course_rows_by_code(codes: List[str]) -> Dict[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """
+    코드별 분반 목록 (전역 정렬 순서)의 (응답 문서, 원본 값) 쌍. 스냅샷이 있으면 메모리에서,
+    없으면 $in 한 번(컬렉션별). 원본 값에는 timeslot_mask(int)와 시간 원본 필드가 남아 있다
+    (응답 문서는 _COURSE_PROJECTION 기준이라 schedule 등만 있는 분반의 시간을 알 수 없다).
+    """
+    snapshot = get_catalog()
+    if snapshot is not None:
+        return {code: [(r.doc, r.raw) for r in snapshot.by_code.get(code, [])] for code in codes}
+
+    db = get_db()
+    found: Dict[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]] = {code: [] for code in codes}
+    sources = await _course_sources(db, None, {"course_code": {"$in": code_variants(codes)}})
+    if sources is None:
+        return found
+    names, match = sources
+    projection = dict(_union_projection(), **{k: 1 for k in TIMESLOT_SOURCE_KEYS + (TIMESLOT_MASK_FIELD,)})
+
+    async def _find(name: str) -> List[Dict[str, Any]]:
+        cur = db[name].find(match, projection).sort(_KEYSET_SORT)
+        if FANOUT_MAX_TIME_MS > 0:
+            cur = cur.max_time_ms(FANOUT_MAX_TIME_MS)
+        docs = await cur.to_list(length=None)
+        for d in docs:
+            d["_source"] = name
+        return docs
+
+    items = [d for docs in (await _fan_out(names, _find)).values() for d in docs]
+    items.sort(key=_union_doc_key)
+    for d in items:
+        raw = _with_timeslot_mask(d)
+        doc = _from_union_doc(d)
+        if doc and doc.get("course_code") in found:
+            found[doc["course_code"]].append((doc, raw))
+    return found
+
+
+async def courses_by_code(codes: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """코드별 분반 목록 (전역 정렬 순서). /courses/batch에서 사용."""
+    rows = await course_rows_by_code(codes)
+    return {code: [doc for doc, _ in pairs] for code, pairs in rows.items()}
+
+
+@router.post("/batch", response_model=Dict[str, List[CourseOut]])
+async def batch_courses(payload: CourseBatchRequest):
+    """
+    과목코드 목록 → 코드별 분반 목록 (없는 코드는 빈 배열).
+    프론트에서 수강 기록/시간표의 코드들을 한 번에 채울 때 사용.
+    """
+    codes = [c.strip() for c in payload.codes if c and c.strip()]
+    loader: BatchLoader[str, List[Dict[str, Any]]] = BatchLoader(courses_by_code)
+    found = await loader.load_many(codes)
+    return {code: docs or [] for code, docs in found.items()}
+
+# --- 엔드포인트: 자동완성 -------------------------------------------------------
+
+class CourseSuggestion(BaseModel):
+    text: str
+    kind: Literal["course_name", "professor", "course_code"]
+    count: int  # 같은 값을 가진 분반(행) 수
+
+
+@router.get("/suggest", response_model=List[CourseSuggestion])
+async def suggest_courses(
+    request: Request,
+    response: Response,
+    prefix: str = Query(..., min_length=1, max_length=50, description="입력 중인 문자열 (초성만 입력해도 됨)"),
+    limit: int = Query(10, ge=1, le=30),
+):
+    """
+    과목명/교수명/과목코드 접두 자동완성. 카탈로그 스냅샷의 접두 색인만 보고
+    MongoDB는 조회하지 않는다(스냅샷이 없으면 빈 목록).
+    """
+    snapshot = get_catalog()
+    if snapshot is None:
+        return []
+    etag, not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    _set_cache_headers(response, etag)
+    return [
+        CourseSuggestion(text=text, kind=kind, count=count)
+        for kind, text, count in snapshot.suggest_index.complete(prefix, limit)
+    ]
+
+# --- 엔드포인트: 카탈로그 스냅샷 관리 -------------------------------------------
+
+class CatalogStatus(BaseModel):
+    enabled: bool
+    version: Optional[int] = None
+    collections: int = 0
+    rows: int = 0
+    loaded_at: Optional[str] = None
+
+
+def _catalog_status() -> CatalogStatus:
+    snapshot = get_catalog()
+    if snapshot is None:
+        return CatalogStatus(enabled=CATALOG_SNAPSHOT_ENABLED)
+    return CatalogStatus(
+        enabled=True,
+        version=snapshot.version,
+        collections=len(snapshot.collections),
+        rows=len(snapshot.rows),
+        loaded_at=snapshot.loaded_at_iso,
+    )
+
+
+@router.get("/catalog", response_model=CatalogStatus)
+async def get_catalog_status():
+    return _catalog_status()
+
+
+@router.post("/catalog/reload", response_model=CatalogStatus)
+async def reload_course_catalog():
+    """
+    과목 데이터를 바꾼 뒤 호출: 버전을 올려 다른 워커들도 다음 폴링 때 다시 적재하게 하고,
+    이 워커는 즉시 다시 적재한다.
+    """
+    version = await bump_data_version(CATALOG_VERSION_KEY)
+    _observe_data_version(version)
+    if CATALOG_SNAPSHOT_ENABLED:
+        await reload_catalog(version)
+    return _catalog_status()
+
+
+class CatalogBuildResult(BaseModel):
+    collection: str
+    sources: Dict[str, int]  # 원본 컬렉션별 적재 문서 수
+    total: int
+    version: int
+    built_at: str
+    elapsed_ms: float
+
+
+@router.post("/catalog/build", response_model=CatalogBuildResult)
+async def build_catalog_collection():
+    """
+    원본 과목 컬렉션들을 정규화해 course_catalog로 다시 만든다 (CLI: python -m scripts.build_course_catalog).
+    버전을 올리므로 다른 워커들도 다음 폴링 때 새 카탈로그로 다시 적재한다.
+    """
+    db = get_db()
+    try:
+        result = await build_course_catalog(db)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    await refresh_registry()
+    _observe_data_version(result["version"])
+    _result_cache.invalidate()
+    if CATALOG_SNAPSHOT_ENABLED:
+        await reload_catalog(result["version"])
+    return result
+
+# --- 엔드포인트: 과목 컬렉션 레지스트리 -------------------------------------------
+
+class CourseCollectionOut(BaseModel):
+    name: str
+    count: int                         # 추정 문서 수
+    indexes: List[List[List[Any]]]     # 인덱스별 [[필드, 방향], ...]
+    defaults: Dict[str, Any]           # 컬렉션명에서 유도한 기본값
+
+
+class CourseRegistryOut(BaseModel):
+    refreshed_at: str
+    collections: List[CourseCollectionOut]
+    catalog: Optional[CourseCollectionOut] = None  # course_catalog (있으면 이것만 조회)
+    source: str                                    # 실제 조회 대상: "catalog" | "collections"
+
+
+def _collection_out(info: CourseCollectionInfo) -> CourseCollectionOut:
+    return CourseCollectionOut(name=info.name, count=info.count, indexes=info.indexes, defaults=info.defaults)
+
+
+def _registry_out(registry: CourseRegistry) -> CourseRegistryOut:
+    return CourseRegistryOut(
+        refreshed_at=registry.refreshed_at,
+        collections=[_collection_out(info) for info in registry.sources],
+        catalog=_collection_out(registry.catalog) if registry.catalog else None,
+        source="catalog" if _uses_materialized(registry) else "collections",
+    )
+
+
+@router.get("/collections", response_model=CourseRegistryOut)
+async def get_course_registry():
+    return _registry_out(await current_registry())
+
+
+@router.post("/collections/refresh", response_model=CourseRegistryOut)
+async def refresh_course_registry():
+    """컬렉션을 추가/삭제하거나 인덱스를 바꾼 뒤 다음 주기를 기다리지 않고 즉시 반영."""
+    return _registry_out(await refresh_registry())
+
+# --- 엔드포인트: 조회 결과 캐시 -----------------------------------------------------
+
+class ResultCacheStats(BaseModel):
+    enabled: bool
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    coalesced: int      # 진행 중인 조회를 기다려 받은 요청 수
+    evictions: int
+    expirations: int
+    invalidations: int
+    hit_ratio: Optional[float] = None
+
+
+@router.get("/cache", response_model=ResultCacheStats)
+async def get_result_cache_stats():
+    return _result_cache.stats()
+
+
+@router.post("/cache/invalidate", response_model=ResultCacheStats)
+async def invalidate_result_cache():
+    _result_cache.invalidate()
+    return _result_cache.stats()
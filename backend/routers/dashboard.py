@@ -3,8 +3,9 @@ from pydantic import BaseModel
 from typing import List, Dict, Optional
 from datetime import datetime
 
-from database.connection import db
+from database.connection import get_db
 from routers.auth import get_current_user
+from utils.fast_response import FAST_RESPONSES_ENABLED, json_response
 
 router = APIRouter(tags=["Dashboard"])
 
@@ -67,7 +68,7 @@ async def get_dashboard(user=Depends(get_current_user)):
         },
         {"$unwind": "$course"},
     ]
-    docs = await db.enrollments.aggregate(pipeline).to_list(length=None)
+    docs = await get_db().enrollments.aggregate(pipeline).to_list(length=None)
 
     registered_credits = 0
     in_progress_credits = 0
@@ -125,7 +126,7 @@ async def get_dashboard(user=Depends(get_current_user)):
 
     gpa_current = float(total_gp / total_credits_gpa) if total_credits_gpa > 0 else 0.0
 
-    return DashboardResponse(
+    result = DashboardResponse(
         semester=f"{year}-{semester}",
         gpa_current=round(gpa_current, 2),
         registered_credits=registered_credits,
@@ -133,3 +134,6 @@ async def get_dashboard(user=Depends(get_current_user)):
         current_courses=current_courses,
         timetable=timetable,
     )
+    if FAST_RESPONSES_ENABLED:
+        return json_response(result.model_dump_json().encode("utf-8"))
+    return result
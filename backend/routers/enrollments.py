@@ -1,12 +1,24 @@
 #수강/성적 관리
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
-from typing import Optional, Literal, List
+from pydantic import BaseModel, TypeAdapter
+from typing import Optional, Literal, List, Tuple
 from bson import ObjectId
+from pymongo import ReturnDocument
+import asyncio
 
 from database.connection import get_db, now_iso
+from database.course_lookup import CourseResolver, get_course_resolver
+from database.student_progress import (
+    PROGRESS_COURSE_FIELD,
+    course_snapshot,
+    enrollment_course,
+    progress_delta,
+    progress_increments,
+    progress_write,
+)
 from routers.auth import get_current_user
-from routers.mypage import SUMMARY_BUCKETS, bucket_category
+from utils.category_buckets import SUMMARY_BUCKETS, bucket_category
+from utils.fast_response import FAST_RESPONSES_ENABLED, json_response
 
 router = APIRouter(tags=["Enrollments"])
 
@@ -46,6 +58,49 @@ class EnrollmentPublic(EnrollmentBase):
     created_at: str
     updated_at: str
 
+
+_ENROLLMENT_LIST_ADAPTER = TypeAdapter(List[EnrollmentPublic])
+
+# --- 필드 선택 (fields=) ---
+# 목록 화면이 쓰는 필드만 읽고 보낸다. 과목 정보 필드를 고르지 않으면 과목 조회(리졸버)도 하지 않는다.
+_ENROLLMENT_FIELDS = tuple(EnrollmentPublic.model_fields)
+# 과목 정보로 채우는 필드: 하나라도 고르면 채우는 데 필요한 원본 필드를 함께 읽는다
+_COURSE_INFO_FIELDS = ("course_name", "category", "category_label", "category_original")
+_FIELDS_DESCRIPTION = "응답에 담을 필드 (쉼표 구분, 예: course_name,grade,credits). 주면 고른 키만 가진 객체 배열"
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """fields= 값 → 필드 튜플 (모델 필드 순서). 없거나 전부 고르면 None, 모르는 필드면 400."""
+    if fields is None:
+        return None
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(wanted.difference(_ENROLLMENT_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown fields: {', '.join(unknown)} (allowed: {', '.join(_ENROLLMENT_FIELDS)})",
+        )
+    if not wanted:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    if len(wanted) == len(_ENROLLMENT_FIELDS):
+        return None
+    return tuple(f for f in _ENROLLMENT_FIELDS if f in wanted)
+
+
+def _needs_course_info(fields: Optional[Tuple[str, ...]]) -> bool:
+    return fields is None or any(f in _COURSE_INFO_FIELDS for f in fields)
+
+
+def _enrollment_projection(fields: Tuple[str, ...]) -> dict:
+    projection = {"_id": 1 if "id" in fields else 0}
+    for f in fields:
+        if f != "id":
+            projection[f] = 1
+    if _needs_course_info(fields):
+        for f in ("course_code",) + _COURSE_INFO_FIELDS:
+            projection[f] = 1
+    return projection
+
 def _normalize_status(raw: Optional[str]) -> EnrollmentStatus:
     if raw == "ENROLLED":
         return "IN_PROGRESS"   # 기존 seed 데이터 보정
@@ -74,10 +129,10 @@ def _to_public(doc: dict) -> EnrollmentPublic:
     )
 
 
-async def _ensure_course_info(doc: dict, db):
+async def _ensure_course_info(doc: dict, resolver: CourseResolver):
     course = None
     if (not doc.get("course_name") or not doc.get("category")) and doc.get("course_code"):
-        course = await db.courses.find_one({"course_code": doc["course_code"]})
+        course = await resolver.load(str(doc["course_code"]))
         if course:
             if not doc.get("course_name"):
                 doc["course_name"] = course.get("name")
@@ -109,9 +164,12 @@ async def list_my_enrollments(
     status: Optional[EnrollmentStatus] = Query(None),
     year: Optional[int] = Query(None),
     semester: Optional[int] = Query(None),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
     user=Depends(get_current_user),
+    resolver: CourseResolver = Depends(get_course_resolver),
 ):
     db = get_db()
+    selected = _parse_fields(fields)
     q: dict = {"student_id": user["student_id"]}
     if status:
         q["status"] = status
@@ -122,14 +180,21 @@ async def list_my_enrollments(
 
     cursor = (
         db.enrollments
-        .find(q)
+        .find(q, _enrollment_projection(selected) if selected else None)
         .sort([("year", 1), ("semester", 1), ("course_code", 1)])
     )
     docs = await cursor.to_list(length=None)
-    enriched = []
-    for doc in docs:
-        enriched.append(_to_public(await _ensure_course_info(doc, db)))
-    return enriched
+    # 과목 정보가 빠진 기록들의 course_code는 리졸버가 모아서 한 번에 조회
+    if _needs_course_info(selected):
+        docs = await asyncio.gather(*(_ensure_course_info(doc, resolver) for doc in docs))
+    items = [_to_public(doc) for doc in docs]
+    if selected is not None:
+        # 고른 필드만 (모양이 EnrollmentPublic과 달라지므로 항상 직접 직렬화)
+        return json_response(_ENROLLMENT_LIST_ADAPTER.dump_json(items, include={"__all__": set(selected)}))
+    if FAST_RESPONSES_ENABLED:
+        # _to_public에서 이미 검증된 모델이므로 재검증 없이 바로 직렬화
+        return json_response(_ENROLLMENT_LIST_ADAPTER.dump_json(items, by_alias=True))
+    return items
 
 
 @router.post(
@@ -140,10 +205,11 @@ async def list_my_enrollments(
 async def create_enrollment(
     payload: EnrollmentCreate,
     user=Depends(get_current_user),
+    resolver: CourseResolver = Depends(get_course_resolver),
 ):
     db = get_db()
     # 과목 존재 여부 확인
-    course = await db.courses.find_one({"course_code": payload.course_code})
+    course = await resolver.load(payload.course_code)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
 
@@ -160,13 +226,18 @@ async def create_enrollment(
         doc["category"] = bucket or course_category
         if bucket:
             doc["category_label"] = CATEGORY_LABEL_MAP.get(bucket, bucket)
+    # 이수 합계에 더한 과목 정보 (수정/삭제 때 같은 값을 빼도록)
+    doc[PROGRESS_COURSE_FIELD] = course_snapshot(course)
     now = now_iso()
     doc["created_at"] = now
     doc["updated_at"] = now
 
-    res = await db.enrollments.insert_one(doc)
+    # 이수 합계 문서(student_progress)에 이 기록의 기여분을 더한다 (재구성과 겹쳐도 한 번만)
+    async with progress_write(db, user["student_id"]) as write:
+        res = await db.enrollments.insert_one(doc)
+        write.delta = progress_increments(doc, doc[PROGRESS_COURSE_FIELD])
     inserted = await db.enrollments.find_one({"_id": res.inserted_id})
-    return _to_public(await _ensure_course_info(inserted, db))
+    return _to_public(await _ensure_course_info(inserted, resolver))
 
 
 @router.patch(
@@ -178,6 +249,7 @@ async def update_enrollment(
     enrollment_id: str,
     payload: EnrollmentUpdate,
     user=Depends(get_current_user),
+    resolver: CourseResolver = Depends(get_course_resolver),
 ):
     db = get_db()
     updates = payload.model_dump(exclude_unset=True)
@@ -191,15 +263,27 @@ async def update_enrollment(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid enrollment_id")
 
-    res = await db.enrollments.update_one(
-        {"_id": oid, "student_id": user["student_id"]},
-        {"$set": updates},
-    )
-    if res.matched_count == 0:
+    async with progress_write(db, user["student_id"]) as write:
+        before = await db.enrollments.find_one_and_update(
+            {"_id": oid, "student_id": user["student_id"]},
+            {"$set": updates},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is not None:
+            doc = {**before, **updates}
+            # 수정 전/후 기여분 차이만 student_progress에 반영 (상태/학점/평점이 바뀐 경우).
+            # 과목 정보는 넣을 때 남긴 스냅샷 (예전 기록이라 없으면 지금 과목 정보로 만들어 남긴다)
+            course = before.get(PROGRESS_COURSE_FIELD)
+            if not isinstance(course, dict):
+                current = await resolver.load(str(doc["course_code"])) if doc.get("course_code") is not None else None
+                course = course_snapshot(current)
+                if course is not None:
+                    doc[PROGRESS_COURSE_FIELD] = course
+                    await db.enrollments.update_one({"_id": oid}, {"$set": {PROGRESS_COURSE_FIELD: course}})
+            write.delta = progress_delta(progress_increments(before, course), progress_increments(doc, course))
+    if before is None:
         raise HTTPException(status_code=404, detail="Enrollment not found")
-
-    doc = await db.enrollments.find_one({"_id": oid})
-    return _to_public(await _ensure_course_info(doc, db))
+    return _to_public(await _ensure_course_info(doc, resolver))
 
 
 @router.delete(
@@ -210,6 +294,7 @@ async def update_enrollment(
 async def delete_enrollment(
     enrollment_id: str,
     user=Depends(get_current_user),
+    resolver: CourseResolver = Depends(get_course_resolver),
 ):
     db = get_db()
     try:
@@ -217,10 +302,17 @@ async def delete_enrollment(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid enrollment_id")
 
-    res = await db.enrollments.delete_one(
-        {"_id": oid, "student_id": user["student_id"]}
-    )
-    if res.deleted_count == 0:
+    async with progress_write(db, user["student_id"]) as write:
+        deleted = await db.enrollments.find_one_and_delete(
+            {"_id": oid, "student_id": user["student_id"]}
+        )
+        if deleted is not None and deleted.get("status") == "COMPLETED":
+            # 넣을 때 더한 값을 그대로 뺀다 (스냅샷이 없는 예전 기록만 지금 과목 정보로)
+            current = None
+            if not isinstance(deleted.get(PROGRESS_COURSE_FIELD), dict) and deleted.get("course_code") is not None:
+                current = await resolver.load(str(deleted["course_code"]))
+            write.delta = progress_delta(progress_increments(deleted, enrollment_course(deleted, current)), {})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Enrollment not found")
 
     return {"message": "deleted"}
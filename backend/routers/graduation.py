@@ -1,11 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import Dict, List, Literal, Optional
-
-from database.connection import db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+from typing import Dict, List, Literal, Optional, Tuple
+import asyncio
+import logging
+import os
+import time
+
+from database.connection import get_db
+from database.requirement_cache import RequirementSet, get_requirements
+from database.course_lookup import CourseResolver, course_table_version, get_course_resolver, list_courses
+from database.student_progress import load_student_progress
 from routers.auth import get_current_user
+from utils.graduation_rules import (
+    CORE_CATEGORIES,
+    Evaluation,
+    Tally,
+    TranscriptEntry,
+    totals_transcript,
+    transcript_entry,
+)
+from utils.fast_response import json_response
+from utils.recommendation_index import COURSE_FIELDS, RecommendationIndex
 
 router = APIRouter(tags=["Graduation"])
+logger = logging.getLogger("app.graduation")
 
 
 class CategoryStatus(BaseModel):
@@ -29,11 +48,27 @@ class QualificationStatus(BaseModel):
     is_passed: bool           # 둘 다 기준 이상인지
 
 
+class RuleStatus(BaseModel):
+    rule_id: str                 # 요건 ID (기본 규칙은 MAJOR/GENERAL/ELECTIVE/TOTAL/GPA/QUAL_*)
+    kind: str                    # CREDITS / TOTAL / GPA / QUAL / BUCKET / COURSES / AREA / AREAS
+    target: str                  # 카테고리·버킷·영역 이름 등
+    acquired: float              # 학점 / 평점 / 인증 횟수 / 들은 과목 수 / 채운 영역 수
+    required: float
+    remaining: float
+    is_passed: bool
+    track: Optional[str] = None  # 트랙 전용 규칙이면 그 트랙
+
+
 class GraduationStatusResponse(BaseModel):
     total: CategoryStatus                 # 전체 학점 요약
     categories: Dict[str, CategoryStatus] # "MAJOR", "GENERAL", "ELECTIVE" 등
     gpa: GPAStatus
     qualification: QualificationStatus
+    is_passed: bool = False               # 모든 규칙 충족 여부
+    rules: List[RuleStatus] = []          # 규칙별 진행도 (과목 목록/세부 영역/트랙 요건 포함)
+
+
+RecommendGroup = Literal["MUST", "HIGH", "EXPLORE"]
 
 
 class RecommendedCourse(BaseModel):
@@ -45,15 +80,16 @@ class RecommendedCourse(BaseModel):
     credits: int
     schedule: Optional[List[dict]] = None
     score: float                         # 졸업요건 기여 점수
-    group: Literal["MUST", "HIGH", "EXPLORE"]
+    group: RecommendGroup
 
 
 class RecommendedCoursesResponse(BaseModel):
     courses: List[RecommendedCourse]
 
 
-async def _load_student_and_requirements(student_id: str):
-    """학생 문서와 requirement_version에 해당하는 졸업요건 문서들을 불러온다."""
+async def _load_student_and_requirements(student_id: str) -> Tuple[dict, RequirementSet]:
+    """학생 문서와 requirement_version에 해당하는 졸업요건 (요건은 버전별 캐시)."""
+    db = get_db()
     student = await db.students.find_one({"student_id": student_id})
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -62,254 +98,326 @@ async def _load_student_and_requirements(student_id: str):
     if not version:
         raise HTTPException(status_code=400, detail="requirement_version not set")
 
-    requirements: Dict[str, dict] = {}
-    async for r in db.requirements.find({"requirement_version": version}):
-        cat = r.get("category")
-        if cat:
-            requirements[cat] = r
+    return student, await get_requirements(db, version)
+
+
+async def _load_transcript(
+    db,
+    student_id: str,
+    requirements: RequirementSet,
+    resolver: CourseResolver,
+    completed: Optional[List[dict]] = None,
+) -> List[TranscriptEntry]:
+    """
+    규칙 평가에 쓸 이수 내역. 과목 단위 규칙(과목 목록/세부 영역)이 없으면 student_progress의
+    카테고리 합계로 충분하고(find_one 한 번), 있으면 COMPLETED 기록에 과목 정보를 붙인다.
+    """
+    if not requirements.rules.needs_courses:
+        return totals_transcript((await load_student_progress(db, student_id)).categories)
+    if completed is None:
+        completed = await db.enrollments.find(
+            {"student_id": student_id, "status": "COMPLETED"}, {"_id": 0, "course_code": 1, "grade_point": 1},
+        ).to_list(None)
+    courses = await resolver.load_many(str(e["course_code"]) for e in completed if e.get("course_code") is not None)
+    entries: List[TranscriptEntry] = []
+    for e in completed:
+        code = e.get("course_code")
+        course = courses.get(str(code)) if code is not None else None
+        # 과목 정보를 못 찾은 기록은 student_progress처럼 빠진다
+        if course is not None:
+            entries.append(transcript_entry(str(code), course, e.get("grade_point")))
+    return entries
+
+
+def _evaluate(student: dict, requirements: RequirementSet, tally: Tally) -> Evaluation:
+    return requirements.rules.evaluate(
+        tally,
+        track=student.get("major_track"),
+        certifications=student.get("certifications") or {},
+    )
 
-    return student, requirements
+
+def _status_fields(evaluation: Evaluation) -> dict:
+    """
+    규칙 트리 평가 결과(칸 합계와 통과 여부) → GraduationStatusResponse와 같은 모양의 dict.
+    기본 규칙은 기존 응답 필드에도 채운다. 키 순서와 타입(float 필드는 float)을 모델과 맞춰 두어
+    검증 없이 바로 직렬화해도 모델을 거친 JSON과 같다.
+    """
+    rules = evaluation.rules
+
+    def make_status(rule_id: str) -> dict:
+        r = rules[rule_id]
+        return {
+            "acquired": int(r.acquired),
+            "required": int(r.required),
+            "remaining": max(int(r.required - r.acquired), 0),   # 0 이하로 내려가지 않게
+            "is_passed": r.is_passed,
+        }
+
+    gpa = rules["GPA"]
+    # 자격인증제 현황
+    qual_req, qual_opt = rules["QUAL_REQUIRED"], rules["QUAL_OPTIONAL"]
+
+    return {
+        "total": make_status("TOTAL"),
+        "categories": {cat: make_status(cat) for cat in CORE_CATEGORIES},
+        "gpa": {"current": float(gpa.acquired), "required": float(gpa.required), "is_passed": gpa.is_passed},
+        "qualification": {
+            "required_required": int(qual_req.required),
+            "required_optional": int(qual_opt.required),
+            "acquired_required": int(qual_req.acquired),
+            "acquired_optional": int(qual_opt.acquired),
+            "is_passed": qual_req.is_passed and qual_opt.is_passed,
+        },
+        "is_passed": evaluation.is_passed,
+        "rules": [
+            {
+                "rule_id": r.rule_id,
+                "kind": r.kind,
+                "target": r.target,
+                "acquired": float(r.acquired),
+                "required": float(r.required),
+                "remaining": float(round(max(r.required - r.acquired, 0), 2)),
+                "is_passed": r.is_passed,
+                "track": r.track,
+            }
+            for r in rules.values()
+        ],
+    }
 
 
-def _get_required_credits(requirements: Dict[str, dict], category: str) -> int:
-    doc = requirements.get(category)
-    if not doc:
-        return 0
-    # 학점 요건이 없는 카테고리(MIN_GPA 등)는 0으로 처리
-    return int(doc.get("required_credits", 0) or 0)
+def _build_status(evaluation: Evaluation) -> GraduationStatusResponse:
+    """규칙 트리 평가 결과로 졸업요건 현황을 만든다."""
+    return GraduationStatusResponse.model_validate(_status_fields(evaluation))
 
 
 # 졸업요건 현황
+#
+# requirement_version별로 컴파일해 캐시해 둔 규칙 트리(RequirementSet.rules)로 평가한다.
 
 @router.get("/graduation/status", response_model=GraduationStatusResponse)
-async def get_graduation_status(user=Depends(get_current_user)):
-    # 학생 정보 + 졸업요건 문서 로드
+async def get_graduation_status(
+    user=Depends(get_current_user),
+    resolver: CourseResolver = Depends(get_course_resolver),
+):
+    db = get_db()
+    # 학생 정보 + 졸업요건 (규칙 트리)
     student, requirements = await _load_student_and_requirements(user["student_id"])
 
-    # 이수한 과목들
-    enrolls = await db.enrollments.find(
-        {"student_id": user["student_id"], "status": "COMPLETED"}
-    ).to_list(None)
-
-    acquired_by_cat: Dict[str, int] = {}
-    total_credits = 0
-    total_gp = 0.0
-    total_for_gpa = 0
-
-    # 카테고리별 학점 + GPA 계산
-    for e in enrolls:
-        course = await db.courses.find_one({"course_code": e["course_code"]})
-        if not course:
-            continue
-
-        cat = course.get("category", "OTHER")
-        credits = int(course.get("credits", 0))
-
-        if cat not in acquired_by_cat:
-            acquired_by_cat[cat] = 0
-        acquired_by_cat[cat] += credits
-
-        total_credits += credits
-
-        gp = e.get("grade_point")
-        if gp is not None:
-            total_gp += gp * credits
-            total_for_gpa += credits
-
-    # GPA
-    if total_for_gpa > 0:
-        current_gpa = round(total_gp / total_for_gpa, 2)
-    else:
-        current_gpa = 0.0
-    required_gpa = float(requirements.get("MIN_GPA", {}).get("required_gpa", 0.0) or 0.0)
-
-    # 카테고리별 상태
-    def make_status(cat: str) -> CategoryStatus:
-        required = _get_required_credits(requirements, cat)
-        acquired = acquired_by_cat.get(cat, 0)
-        remaining = required - acquired
-        if remaining < 0:
-            remaining = 0
-        if required > 0:
-            passed = acquired >= required
-        else:
-            passed = True
-        return CategoryStatus(
-            acquired=acquired,
-            required=required,
-            remaining=remaining,
-            is_passed=passed,
-        )
+    # 이수 내역을 한 번 훑어 규칙 트리 평가
+    transcript = await _load_transcript(db, user["student_id"], requirements, resolver)
+    return _build_status(_evaluate(student, requirements, requirements.rules.tally(transcript)))
 
-    categories: Dict[str, CategoryStatus] = {
-        "MAJOR": make_status("MAJOR"),
-        "GENERAL": make_status("GENERAL"),
-        "ELECTIVE": make_status("ELECTIVE"),
-    }
 
-    # 전체 학점 요건
-    if "TOTAL" in requirements:
-        total_required = _get_required_credits(requirements, "TOTAL")
-    else:
-        total_required = 0
-        for c in categories.values():
-            total_required += c.required
-
-    total_remaining = total_required - total_credits
-    if total_remaining < 0:
-        total_remaining = 0
-
-    total_status = CategoryStatus(
-        acquired=total_credits,
-        required=total_required,
-        remaining=total_remaining,
-        is_passed=(total_credits >= total_required) if total_required > 0 else True,
-    )
+# 졸업 what-if 시뮬레이션
+#
+# "다음 학기에 이 과목들을 들으면?" 계획 여러 개를 한 번에 받아, 현재 이수 합계에 더한
+# 졸업요건 현황을 계획마다 돌려준다. DB는 요청당 고정 횟수(학생/요건/이수 내역/이수 코드/과목 $in)만
+# 읽는다. 현재 이수 내역은 규칙 트리로 한 번만 훑어 두고(Tally), 계획 전체를 RuleTree.tally_many로
+# (계획 × 과목 표) @ (과목 × 칸 표) 한 번에 더한 뒤 계획마다 평가한다. 계획별 현황은 칸 합계와
+# 통과 여부로 바로 만들어 응답 모델 검증 없이 직렬화한다.
 
-    gpa_status = GPAStatus(
-        current=current_gpa,
-        required=required_gpa,
-        is_passed=current_gpa >= required_gpa,
-    )
+class SimulatedCourse(BaseModel):
+    course_code: str
+    grade_point: Optional[float] = Field(None, ge=0, le=4.5)  # 예상 평점 (없으면 평점 계산에서 제외)
+    credits: Optional[int] = Field(None, ge=0, le=30)         # 안 주면 과목 정보에서
+    category: Optional[str] = None                            # 안 주면 과목 정보에서 (MAJOR/GENERAL/ELECTIVE 등)
+
+
+class SimulationPlan(BaseModel):
+    name: Optional[str] = None
+    courses: List[SimulatedCourse] = Field(..., min_length=1, max_length=40)
 
-    # 자격인증제 현황
-    cert = student.get("certifications", {}) or {}
-    acquired_req = int(cert.get("required_count", 0) or 0)
-    acquired_opt = int(cert.get("optional_count", 0) or 0)
-
-    qual_req_doc = requirements.get("QUAL_REQUIRED", {}) or {}
-    qual_opt_doc = requirements.get("QUAL_OPTIONAL", {}) or {}
-
-    required_req = int(qual_req_doc.get("required_credits", 0) or 0)   # 필수 인증 요건
-    required_opt = int(qual_opt_doc.get("required_credits", 0) or 0)   # 선택 인증 요건
-
-    qualification_status = QualificationStatus(
-        required_required=required_req,
-        required_optional=required_opt,
-        acquired_required=acquired_req,
-        acquired_optional=acquired_opt,
-        is_passed=(acquired_req >= required_req and acquired_opt >= required_opt),
-    )
 
-    return GraduationStatusResponse(
-        total=total_status,
-        categories=categories,
-        gpa=gpa_status,
-        qualification=qualification_status,
+class GraduationSimulateRequest(BaseModel):
+    plans: List[SimulationPlan] = Field(..., min_length=1, max_length=500)
+
+
+class SimulatedPlanResult(BaseModel):
+    name: Optional[str] = None
+    status: GraduationStatusResponse
+    added_credits: int
+    newly_passed: List[str]          # 이 계획으로 새로 충족하는 항목 (TOTAL/GPA/카테고리/요건 ID)
+    already_completed: List[str]     # 이미 이수해서 더하지 않은 과목코드
+    not_found: List[str]             # 과목 정보가 없고 학점/카테고리도 주지 않은 과목코드
+
+
+class GraduationSimulateResponse(BaseModel):
+    current: GraduationStatusResponse
+    plans: List[SimulatedPlanResult]
+
+
+def _passed_items(evaluation: Evaluation) -> Dict[str, bool]:
+    # 응답의 total/gpa/categories 순서 다음에 나머지 규칙
+    rules = evaluation.rules
+    items = {rule_id: rules[rule_id].is_passed for rule_id in ("TOTAL", "GPA") + CORE_CATEGORIES}
+    for rule_id, r in rules.items():
+        items.setdefault(rule_id, r.is_passed)
+    return items
+
+
+@router.post("/graduation/simulate", response_model=GraduationSimulateResponse)
+async def simulate_graduation(
+    payload: GraduationSimulateRequest,
+    user=Depends(get_current_user),
+    resolver: CourseResolver = Depends(get_course_resolver),
+):
+    db = get_db()
+    student_id = user["student_id"]
+    student, requirements = await _load_student_and_requirements(student_id)
+
+    codes = {c.course_code for plan in payload.plans for c in plan.courses}
+    completed, courses = await asyncio.gather(
+        db.enrollments.find(
+            {"student_id": student_id, "status": "COMPLETED"}, {"_id": 0, "course_code": 1, "grade_point": 1},
+        ).to_list(None),
+        resolver.load_many(codes),
     )
+    completed_codes = {str(e["course_code"]) for e in completed if e.get("course_code")}
+    transcript = await _load_transcript(db, student_id, requirements, resolver, completed)
+
+    # 계획마다 이수 내역 줄(카테고리, 학점, 예상 평점)로 풀기. 같은 계획 안 중복 과목은 한 번만
+    plan_courses: List[List[TranscriptEntry]] = []
+    skipped: List[Tuple[List[str], List[str]]] = []
+    for plan in payload.plans:
+        rows: List[TranscriptEntry] = []
+        already: List[str] = []
+        missing: List[str] = []
+        seen = set()
+        for c in plan.courses:
+            if c.course_code in seen:
+                continue
+            seen.add(c.course_code)
+            if c.course_code in completed_codes:
+                already.append(c.course_code)
+                continue
+            course = courses.get(c.course_code) or {}
+            credits = c.credits if c.credits is not None else course.get("credits")
+            category = c.category or course.get("category")
+            if credits is None or not category:
+                missing.append(c.course_code)
+                continue
+            rows.append(transcript_entry(
+                c.course_code,
+                {**course, "credits": int(credits), "category": category},
+                c.grade_point,
+            ))
+        plan_courses.append(rows)
+        skipped.append((already, missing))
+
+    rules = requirements.rules
+    base = rules.tally(transcript)
+    current = _evaluate(student, requirements, base)
+    passed_now = _passed_items(current)
+
+    # 계획 × 칸 표를 한 번에 채우고(RuleTree.tally_many), 계획별 현황은 칸 합계와 통과 여부로
+    # dict를 바로 만든다. 계획 500개면 응답 모델 수천 개를 만들고 검증하는 데 요청 시간 대부분이
+    # 들었으므로, 모델과 같은 모양의 dict를 pydantic-core로 바로 직렬화한다 (response_model은 스키마용)
+    plan_tallies = rules.tally_many(plan_courses, start=base)
+    results: List[dict] = []
+    for plan, rows, tally, (already, missing) in zip(payload.plans, plan_courses, plan_tallies, skipped):
+        evaluation = _evaluate(student, requirements, tally)
+        results.append({
+            "name": plan.name,
+            "status": _status_fields(evaluation),
+            "added_credits": sum(r.credits for r in rows),
+            "newly_passed": [k for k, ok in _passed_items(evaluation).items() if ok and not passed_now.get(k)],
+            "already_completed": already,
+            "not_found": missing,
+        })
+    return json_response(to_json({"current": _status_fields(current), "plans": results}))
 
 
 # 졸업요건 기반 추천 강의 로직
+#
+# db.courses 전체를 요청마다 읽어 점수를 매기고 정렬하던 것을, requirement_version별
+# 후보 색인(utils.recommendation_index)으로 바꿨다. 색인은 db.courses 버전 카운터
+# ("course_table", database.course_lookup — 과목 카탈로그의 "courses" 카운터와 별개)가 바뀌거나
+# 졸업요건 캐시(database.requirement_cache)가 그 버전을 다시 읽으면 다시 만든다.
+# 카운터는 매 요청이 아니라 RECOMMEND_INDEX_CHECK_SECONDS마다 확인한다 (0이면 매 요청).
+
+RECOMMEND_INDEX_CHECK_SECONDS = float(os.getenv("RECOMMEND_INDEX_CHECK_SECONDS", "30"))
+
+# requirement_version → (db.courses 버전, 만들 때 쓴 요건, 색인)
+_recommend_indexes: Dict[str, Tuple[int, RequirementSet, RecommendationIndex]] = {}
+_courses_version: Optional[int] = None
+_courses_checked_at = 0.0
+_recommend_lock = asyncio.Lock()
+
+
+async def _current_courses_version() -> int:
+    """db.courses 버전. 확인 주기 안에서는 마지막으로 읽은 값."""
+    global _courses_version, _courses_checked_at
+    now = time.monotonic()
+    if _courses_version is None or now - _courses_checked_at >= RECOMMEND_INDEX_CHECK_SECONDS:
+        _courses_version = await course_table_version()
+        _courses_checked_at = now
+    return _courses_version
+
+
+async def _recommendation_index(requirements: RequirementSet) -> RecommendationIndex:
+    courses_version = await _current_courses_version()
+
+    def _fresh() -> Optional[RecommendationIndex]:
+        entry = _recommend_indexes.get(requirements.version)
+        # 요건은 캐시 객체가 그대로인지로 판단 (요건 캐시가 비워지면 새 객체가 온다)
+        if entry is not None and entry[0] == courses_version and entry[1] is requirements:
+            return entry[2]
+        return None
+
+    index = _fresh()
+    if index is not None:
+        return index
+    async with _recommend_lock:
+        index = _fresh()
+        if index is not None:
+            return index
+        started = time.perf_counter()
+        projection = {"_id": 0, **{f: 1 for f in COURSE_FIELDS}}
+        courses = await list_courses(get_db(), projection=projection)
+        index = RecommendationIndex(
+            courses,
+            major_required=requirements.required_credits("MAJOR"),
+            general_required=requirements.required_credits("GENERAL"),
+        )
+        _recommend_indexes[requirements.version] = (courses_version, requirements, index)
+        logger.info(
+            "recommendation index built: version=%s courses=%d courses_version=%s in %.1fms",
+            requirements.version, index.size, courses_version, (time.perf_counter() - started) * 1000,
+        )
+        return index
+
 
 @router.get(
     "/graduation/recommended-courses",
     response_model=RecommendedCoursesResponse,
     summary="졸업요건 기반 수강신청 추천 과목 목록",
 )
-async def get_recommended_courses(user=Depends(get_current_user)):
+async def get_recommended_courses(
+    limit: int = Query(50, ge=1, le=200, description="최대 개수 (점수 높은 순)"),
+    group: Optional[RecommendGroup] = Query(None, description="이 그룹만 (MUST/HIGH/EXPLORE)"),
+    user=Depends(get_current_user),
+):
+    db = get_db()
     # 학생 + 졸업요건 정보
     student, requirements = await _load_student_and_requirements(user["student_id"])
 
-    # 이미 수강 완료한 과목 목록 + 카테고리별 이수 학점
-    enrolls = await db.enrollments.find(
-        {"student_id": user["student_id"], "status": "COMPLETED"}
-    ).to_list(None)
-
-    acquired_by_cat: Dict[str, int] = {}
-    taken_codes: set[str] = set()
-
-    for e in enrolls:
-        code = e.get("course_code")
-        if code:
-            taken_codes.add(code)
-
-        course = await db.courses.find_one({"course_code": e.get("course_code")})
-        if not course:
-            continue
-
-        cat = course.get("category", "OTHER")
-        credits = int(course.get("credits", 0))
-
-        if cat not in acquired_by_cat:
-            acquired_by_cat[cat] = 0
-        acquired_by_cat[cat] += credits
-
-    major_required = _get_required_credits(requirements, "MAJOR")
-    general_required = _get_required_credits(requirements, "GENERAL")
-
-    major_acquired = acquired_by_cat.get("MAJOR", 0)
-    general_acquired = acquired_by_cat.get("GENERAL", 0)
-
-    major_remaining = max(major_required - major_acquired, 0)
-    general_remaining = max(general_required - general_acquired, 0)
-
-    # 전체 과목 중 아직 안 들은 과목들
-    courses_cur = db.courses.find({})
-    all_courses = await courses_cur.to_list(None)
-
-    results: List[RecommendedCourse] = []
-
-    for c in all_courses:
-        code = c.get("course_code")
-        if not code:
-            continue
-
-        # 이미 들은 과목은 추천에서 제외
-        if code in taken_codes:
-            continue
-
-        cat = c.get("category", "")
-        sub_cat = c.get("sub_category", "")
-        credits = int(c.get("credits", 0))
-        schedule = c.get("schedule")
-
-        score = 0.0
-
-        # 전공필수/핵심교양필수 등 "Must" 후보
-        if sub_cat == "전공필수" and major_remaining > 0:
-            score += 4.0
-        if sub_cat == "핵심교양필수" and general_remaining > 0:
-            score += 3.5
-
-        # 전공/교양 부족분에 따른 가점
-        if cat == "MAJOR" and major_remaining > 0:
-            score += 2.0
-        if cat == "GENERAL" and general_remaining > 0:
-            score += 1.5
-
-        # 이미 해당 영역을 충분히 채웠으면 감점
-        if cat == "MAJOR" and major_remaining == 0:
-            score -= 1.5
-        if cat == "GENERAL" and general_remaining == 0:
-            score -= 1.0
-
-        # 점수가 너무 낮으면 추천에서 제외
-        if score <= 0:
-            continue
-
-        # 점수에 따른 그룹 분류
-        if score >= 5.0:
-            group: Literal["MUST", "HIGH", "EXPLORE"] = "MUST"
-        elif score >= 3.0:
-            group = "HIGH"
-        else:
-            group = "EXPLORE"
-
-        rec = RecommendedCourse(
-            course_code=code,
-            name=c.get("name", ""),
-            professor=c.get("professor"),
-            category=cat,
-            sub_category=sub_cat,
-            credits=credits,
-            schedule=schedule,
-            score=round(score, 2),
-            group=group,
-        )
-        results.append(rec)
-
-    # 높은 점수 순으로 정렬
-    results.sort(key=lambda x: x.score, reverse=True)
-
-    # 많으면 앞쪽 일부만
-    return RecommendedCoursesResponse(courses=results[:50])
+    # 이미 수강 완료한 과목 코드 + 카테고리별 이수 학점
+    enrolls, progress = await asyncio.gather(
+        db.enrollments.find(
+            {"student_id": user["student_id"], "status": "COMPLETED"}, {"_id": 0, "course_code": 1},
+        ).to_list(None),
+        load_student_progress(db, user["student_id"]),
+    )
+    taken_codes = {str(e["course_code"]) for e in enrolls if e.get("course_code")}
+
+    index = await _recommendation_index(requirements)
+    major_acquired = progress.categories.get("MAJOR", (0, 0.0, 0))[0]
+    general_acquired = progress.categories.get("GENERAL", (0, 0.0, 0))[0]
+    major_open = index.major_required - major_acquired > 0
+    general_open = index.general_required - general_acquired > 0
+
+    picks = index.top(major_open, general_open, taken_codes, limit, group)
+    return RecommendedCoursesResponse(courses=[
+        RecommendedCourse(**c.course, score=c.score, group=c.group) for c in picks
+    ])
@@ -1,72 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List
 
 from database.connection import get_db
+from database.course_lookup import list_courses
+from database.requirement_cache import get_requirements
+from database.student_progress import load_student_progress
 from routers.auth import get_current_user
+from utils.category_buckets import SUMMARY_BUCKETS, SUMMARY_KEYS
 
 router = APIRouter(tags=["MyPage"])
 
-SUMMARY_BUCKETS = [
-    ("MAJOR_REQUIRED", "전공필수"),
-    ("MAJOR_ELECTIVE", "전공선택"),
-    ("CORE_GENERAL", "핵심교양"),
-    ("BALANCE_GENERAL", "균형교양"),
-]
-SUMMARY_KEYS = [key for key, _ in SUMMARY_BUCKETS]
-SUMMARY_KEY_SET = set(SUMMARY_KEYS)
-
-CATEGORY_BUCKETS = {
-    "MAJOR": "MAJOR_REQUIRED",
-    "MAJOR_REQUIRED": "MAJOR_REQUIRED",
-    "MAJOR MANDATORY": "MAJOR_REQUIRED",
-    "전공필수": "MAJOR_REQUIRED",
-    "전공-필수": "MAJOR_REQUIRED",
-    "MAJOR_ELECTIVE": "MAJOR_ELECTIVE",
-    "MAJOR ELECTIVE": "MAJOR_ELECTIVE",
-    "전공선택": "MAJOR_ELECTIVE",
-    "전공": "MAJOR_ELECTIVE",
-    "GENERAL": "CORE_GENERAL",
-    "CORE_GENERAL": "CORE_GENERAL",
-    "LIBERAL": "CORE_GENERAL",
-    "기초교양": "CORE_GENERAL",
-    "핵심교양": "CORE_GENERAL",
-    "글쓰기": "CORE_GENERAL",
-    "글쓰기(필수)": "CORE_GENERAL",
-    "영어": "CORE_GENERAL",
-    "영어(필수)": "CORE_GENERAL",
-    "디지털리터러시": "CORE_GENERAL",
-    "BALANCE_GENERAL": "BALANCE_GENERAL",
-    "균형교양": "BALANCE_GENERAL",
-    "문학과문화": "BALANCE_GENERAL",
-    "역사와철학": "BALANCE_GENERAL",
-    "인간과사회": "BALANCE_GENERAL",
-    "생명과환경": "BALANCE_GENERAL",
-    "과학과기술": "BALANCE_GENERAL",
-    "예술과체육": "BALANCE_GENERAL",
-    "진로와개척": "BALANCE_GENERAL",
-    "융복합": "BALANCE_GENERAL",
-}
-
-
-def bucket_category(raw: Optional[str]) -> Optional[str]:
-    if not raw:
-        return None
-    normalized = raw.strip()
-    if not normalized:
-        return None
-    normalized_key = normalized.upper().replace(" ", "_")
-    if normalized_key in SUMMARY_KEY_SET:
-        return normalized_key
-    mapped = CATEGORY_BUCKETS.get(normalized) or CATEGORY_BUCKETS.get(normalized_key)
-    if not mapped:
-        return None
-    mapped_key = mapped.upper().replace(" ", "_")
-    if mapped_key in SUMMARY_KEY_SET:
-        return mapped_key
-    return None
-
-
 class CreditSummaryItem(BaseModel):
     acquired: int
     required: int
@@ -112,35 +56,13 @@ async def get_credit_summary(user=Depends(get_current_user)):
     if not version:
         return build_empty_summary()
 
-    required_map = {key: 0 for key in SUMMARY_KEYS}
-    total_required_override = 0
-    cursor = db.requirements.find({"requirement_version": version})
-    async for r in cursor:
-        bucket = bucket_category(r.get("category"))
-        required_value = int(r.get("required_credits", 0))
-        if bucket and bucket in required_map:
-            required_map[bucket] = required_value
-        else:
-            raw = (r.get("category") or "").strip().upper().replace(" ", "_")
-            if raw == "TOTAL":
-                total_required_override = required_value
-
-    enrollments = await db.enrollments.find(
-        {"student_id": user["student_id"], "status": "COMPLETED"}
-    ).to_list(None)
-    acquired = {key: 0 for key in SUMMARY_KEYS}
-    for enroll in enrollments:
-        credits = int(enroll.get("credits") or 0)
-        bucket = bucket_category(enroll.get("category"))
-        if (not credits or not bucket) and enroll.get("course_code"):
-            course = await db.courses.find_one({"course_code": enroll["course_code"]})
-            if course:
-                if not credits:
-                    credits = int(course.get("credits", 0))
-                if not bucket:
-                    bucket = bucket_category(course.get("category"))
-        if bucket in acquired and credits:
-            acquired[bucket] += credits
+    requirements = await get_requirements(db, version)
+    required_map = requirements.bucket_credits
+    total_required_override = requirements.total_override
+
+    # 버킷별 이수 학점 (student_progress 문서 하나)
+    progress = await load_student_progress(db, user["student_id"])
+    acquired = {key: progress.buckets.get(key, 0) for key in SUMMARY_KEYS}
 
     total_required = total_required_override or sum(required_map.values())
     total_acquired = sum(acquired.values())
@@ -178,8 +100,7 @@ class RequiredCoursesResponse(BaseModel):
 @router.get("/required-courses", response_model=RequiredCoursesResponse)
 async def get_required_courses(user=Depends(get_current_user)):
     db = get_db()
-    cursor = db.courses.find({"is_required": True})
-    required_courses = [doc async for doc in cursor]
+    required_courses = await list_courses(db, {"is_required": True})
 
     completed_cursor = db.enrollments.find(
         {"student_id": user["student_id"], "status": "COMPLETED"},
@@ -212,39 +133,16 @@ class SemesterGPAResponse(BaseModel):
 @router.get("/semester-gpa", response_model=SemesterGPAResponse)
 async def get_semester_gpa(user=Depends(get_current_user)):
     db = get_db()
-    pipeline = [
-        {
-            "$match": {
-                "student_id": user["student_id"],
-                "status": "COMPLETED",
-                "grade_point": {"$ne": None},
-            }
-        },
-        {
-            "$group": {
-                "_id": {"year": "$year", "semester": "$semester"},
-                "total_gp": {"$sum": {"$multiply": ["$grade_point", "$credits"]}},
-                "total_credits": {"$sum": "$credits"},
-            }
-        },
-        {"$sort": {"_id.year": 1, "_id.semester": 1}},
-    ]
-
-    data = await db.enrollments.aggregate(pipeline).to_list(None)
-    semesters: List[SemesterGPAItem] = []
-    for entry in data:
-        year = entry["_id"]["year"]
-        semester = entry["_id"]["semester"]
-        total_credits = entry["total_credits"] or 0
-        gpa = (entry["total_gp"] / total_credits) if total_credits > 0 else 0.0
-        semesters.append(
-            SemesterGPAItem(
-                year=year,
-                semester=semester,
-                gpa=round(gpa, 2),
-                credits=total_credits,
-            )
+    progress = await load_student_progress(db, user["student_id"])
+    semesters = [
+        SemesterGPAItem(
+            year=s.year,
+            semester=s.semester,
+            gpa=round(s.gpa_points / s.credits, 2) if s.credits > 0 else 0.0,
+            credits=s.credits,
         )
+        for s in progress.semesters
+    ]
 
     return SemesterGPAResponse(semesters=semesters)
 
@@ -1,13 +1,15 @@
 #졸업요건 정리/관리
 
 from fastapi import APIRouter, HTTPException, Query
-from database.connection import db, now_iso
+from database.connection import get_db, now_iso
+from database.requirement_cache import requirements_changed
 from models.requirement_model import RequirementCreate, RequirementPublic, RequirementUpdate
 
 router = APIRouter()
 
 @router.post("/", response_model=dict)
 async def create_requirement(payload: RequirementCreate):
+    db = get_db()
     exists = await db.requirements.find_one({"requirement_id": payload.requirement_id})
     if exists:
         raise HTTPException(status_code=409, detail="requirement_id already exists")
@@ -16,6 +18,8 @@ async def create_requirement(payload: RequirementCreate):
     doc["created_at"] = now_iso()
     doc["updated_at"] = now_iso()
     await db.requirements.insert_one(doc)
+    # 졸업요건 캐시 무효화 (이 워커는 바로, 다른 워커는 버전 카운터로)
+    await requirements_changed()
     return {"message": "Requirement created"}
 
 @router.get("/", response_model=list[RequirementPublic])
@@ -24,6 +28,7 @@ async def list_requirements(
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
+    db = get_db()
     q: dict = {}
     if department:
         q["$or"] = [
@@ -50,7 +55,10 @@ async def update_requirement(requirement_id: str, payload: RequirementUpdate):
         return {"message": "No changes"}
 
     updates["updated_at"] = now_iso()
+    db = get_db()
     res = await db.requirements.update_one({"requirement_id": requirement_id}, {"$set": updates})
     if res.matched_count == 0:
         raise HTTPException(status_code=404, detail="Requirement not found")
+    # 졸업요건 캐시 무효화 (이 워커는 바로, 다른 워커는 버전 카운터로)
+    await requirements_changed()
     return {"message": "Requirement updated"}
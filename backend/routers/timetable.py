@@ -0,0 +1,165 @@
+# 시간표 자동 생성
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from database.course_catalog import TIMESLOT_MASK_FIELD, TIMESLOT_SOURCE_KEYS
+from routers.courses import course_rows_by_code
+from utils.timeslot import DAYS, DAY_START_MINUTES, DAY_END_MINUTES, slot_bits
+from utils.timetable_search import CourseOptions, Section, day_mask, search_timetables
+
+router = APIRouter(tags=["Timetable"])
+logger = logging.getLogger("app.timetable")
+
+# 조합 탐색 시간 예산(ms). 넘기면 그때까지 찾은 상위 결과를 complete=false로 반환
+TIMETABLE_SEARCH_BUDGET_MS = float(os.getenv("TIMETABLE_SEARCH_BUDGET_MS", "1500"))
+
+Weekday = Literal["월", "화", "수", "목", "금"]
+
+
+class TimetableGenerateRequest(BaseModel):
+    course_codes: List[str] = Field(..., min_length=1, max_length=15)  # 넣고 싶은 과목들
+    required_codes: List[str] = Field(default_factory=list)           # 반드시 넣을 과목
+    max_credits: Optional[int] = Field(None, ge=1, le=30)
+    days_off: List[Weekday] = Field(default_factory=list)             # 공강으로 비울 요일
+    earliest_start: Optional[str] = Field(None, pattern=r"^\d{1,2}:\d{2}$")  # 예) "10:00"
+    limit: int = Field(10, ge=1, le=50)
+
+
+class TimetableSection(BaseModel):
+    course_code: str
+    course_name: Optional[str] = None
+    cls: Optional[str] = Field(default=None, serialization_alias="class")
+    professor: Optional[str] = None
+    timeslot: Optional[str] = None
+    credits: int = 0
+    alternatives: List[str] = Field(default_factory=list)  # 같은 시간/학점의 다른 분반
+
+
+class GeneratedTimetable(BaseModel):
+    total_credits: int
+    course_count: int
+    days: int   # 등교 요일 수
+    gaps: int   # 수업 사이 빈 30분 칸 수
+    sections: List[TimetableSection]
+
+
+class TimetableGenerateResponse(BaseModel):
+    timetables: List[GeneratedTimetable]
+    complete: bool                  # false면 시간 예산 안에 모든 조합을 다 보지 못함
+    visited: int
+    elapsed_ms: float
+    not_found: List[str] = Field(default_factory=list)    # 카탈로그에 없는 과목코드
+    unscheduled: List[str] = Field(default_factory=list)  # 강의 시간을 해석하지 못해 뺀 분반 ("코드/분반")
+
+
+def _clock_minutes(value: str) -> int:
+    hour, minute = value.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _blocked_mask(days_off: List[str], earliest_start: Optional[str]) -> int:
+    blocked = 0
+    for day in days_off:
+        blocked |= day_mask(DAYS.index(day))
+    if earliest_start:
+        start = min(max(_clock_minutes(earliest_start), DAY_START_MINUTES), DAY_END_MINUTES)
+        if start > DAY_START_MINUTES:
+            for day in range(len(DAYS)):
+                blocked |= slot_bits(day, DAY_START_MINUTES, start)
+    return blocked
+
+
+def _course_sections(
+    code: str, rows: List[Tuple[Dict[str, Any], Dict[str, Any]]], unscheduled: List[str],
+) -> List[Section]:
+    """
+    (응답 문서, 원본 값) 쌍들 → 분반 목록. 여러 연도 컬렉션에 같은 분반이 있으면 (분반, 시간) 기준으로 하나만.
+    마스크는 원본 값의 timeslot_mask (저장된 값 또는 schedule 등 시간 원본 필드를 해석한 값)를 쓴다.
+    시간 필드가 모두 비어 있으면 고정 시간이 없는 과목(마스크 0)으로, 있는데 해석이 안 되면 뺀다.
+    """
+    sections: List[Section] = []
+    seen: set = set()
+    for pos, (doc, raw) in enumerate(rows):
+        ident = (doc.get("class"), doc.get("timeslot"), raw.get(TIMESLOT_MASK_FIELD))
+        if ident in seen:
+            continue
+        seen.add(ident)
+        mask = raw.get(TIMESLOT_MASK_FIELD)
+        if mask is None:
+            if any(raw.get(k) for k in TIMESLOT_SOURCE_KEYS):
+                unscheduled.append(f"{code}/{doc.get('class') or '-'}")
+                continue
+            mask = 0
+        sections.append(Section(key=str(pos), mask=mask, credits=int(doc.get("credits") or 0)))
+    return sections
+
+
+def _section_out(code: str, doc: Dict[str, Any], alternatives: List[Dict[str, Any]]) -> TimetableSection:
+    return TimetableSection(
+        course_code=code,
+        course_name=doc.get("course_name"),
+        cls=doc.get("class"),
+        professor=doc.get("professor"),
+        timeslot=doc.get("timeslot"),
+        credits=int(doc.get("credits") or 0),
+        alternatives=[a.get("class") or "-" for a in alternatives],
+    )
+
+
+@router.post("/generate", response_model=TimetableGenerateResponse)
+async def generate_timetables(payload: TimetableGenerateRequest):
+    """
+    희망 과목들의 분반 조합 중 서로 겹치지 않고 제약(최대 학점, 공강 요일, 가장 이른 시작 시각)을
+    지키는 시간표를 학점 > 과목 수 > 등교 요일 적은 순 > 공강 적은 순으로 상위 limit개 반환.
+    학점 상한 때문에 일부 과목이 빠진 시간표도 후보가 된다 (required_codes는 항상 포함).
+    """
+    codes = list(dict.fromkeys(c.strip() for c in payload.course_codes + payload.required_codes if c.strip()))
+    required = {c.strip() for c in payload.required_codes}
+    rows = await course_rows_by_code(codes)
+    found = {code: [doc for doc, _ in pairs] for code, pairs in rows.items()}
+
+    not_found: List[str] = []
+    unscheduled: List[str] = []
+    options: List[CourseOptions] = []
+    for code in codes:
+        pairs = rows.get(code) or []
+        if not pairs:
+            not_found.append(code)
+            continue
+        options.append(CourseOptions(code, _course_sections(code, pairs, unscheduled), code in required))
+
+    if any(c in required for c in not_found):
+        return TimetableGenerateResponse(
+            timetables=[], complete=True, visited=0, elapsed_ms=0.0, not_found=not_found, unscheduled=unscheduled,
+        )
+
+    blocked = _blocked_mask(payload.days_off, payload.earliest_start)
+    # CPU만 쓰는 탐색이라 이벤트 루프를 막지 않도록 스레드에서
+    result = await asyncio.to_thread(
+        search_timetables, options, blocked, payload.max_credits, payload.limit, TIMETABLE_SEARCH_BUDGET_MS,
+    )
+    if not result.complete:
+        logger.info("timetable search hit budget courses=%d visited=%d", len(options), result.visited)
+
+    timetables: List[GeneratedTimetable] = []
+    for schedule in result.schedules:
+        credits, count, neg_days, neg_gaps = schedule.score
+        sections = [
+            _section_out(code, found[code][int(s.key)], [found[code][int(a.key)] for a in alts])
+            for code, s, alts in schedule.picks
+        ]
+        timetables.append(GeneratedTimetable(
+            total_credits=credits, course_count=count, days=-neg_days, gaps=-neg_gaps, sections=sections,
+        ))
+    return TimetableGenerateResponse(
+        timetables=timetables,
+        complete=result.complete,
+        visited=result.visited,
+        elapsed_ms=result.elapsed_ms,
+        not_found=not_found,
+        unscheduled=unscheduled,
+    )
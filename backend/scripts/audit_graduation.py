@@ -0,0 +1,178 @@
+# backend/scripts/audit_graduation.py
+#
+# 학과 전체 졸업 사정 보고서. 학생별 졸업요건 현황 API를 학생 수만큼 부르는 대신
+# 학생/COMPLETED 수강 기록을 student_id 순 커서 두 개로 한꺼번에 읽고(database.graduation_audit),
+# 규칙 트리 평가는 프로세스 풀(utils.graduation_audit)에서 묶음 단위로 돌려 CSV(또는 Parquet)로 쓴다.
+# 행마다 통과 여부, 총 학점/평점, 미충족 규칙, 규칙별 부족분("<rule_id>_shortfall") 열이 들어간다.
+# 졸업 사정 전에 cron 등으로 돌리는 배치 작업용.
+# 요약 JSON의 orphan_enrollments는 학생 문서가 없어 보고서에서 빠진 COMPLETED 기록 수다.
+# 0이 아니면 보고서는 쓰되 오류로(종료 코드 1) 끝난다 — 학생 문서의 student_id와 기록의 student_id
+# 타입이 다른 경우(9와 "9") 등이라, 데이터를 고친 뒤 다시 돌려야 한다.
+#   python -m scripts.audit_graduation --output audit.csv
+#   python -m scripts.audit_graduation --student-prefix 2021 --only-failing --output seniors.csv
+#   python -m scripts.audit_graduation --format parquet --output audit.parquet   # pyarrow가 있을 때만
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from database import connection
+from database.course_lookup import course_table_version, load_course_table
+from database.graduation_audit import COURSE_PROJECTION, load_requirement_docs, stream_audit_inputs
+from utils.graduation_audit import (
+    BASE_COLUMNS, audit_chunk, compile_versions, init_worker, shortfall_columns,
+)
+
+
+class _CsvWriter:
+    def __init__(self, path: str, columns: List[str]):
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")   # 엑셀에서 한글이 깨지지 않게 BOM
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, restval="")
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str, columns: List[str]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._columns = columns
+        self._rows: List[Dict[str, Any]] = []
+        self._path = path
+        self._pq = pq
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows.extend(rows)
+
+    def close(self) -> None:
+        table = self._pa.Table.from_pylist(
+            [{c: row.get(c) for c in self._columns} for row in self._rows],
+        )
+        self._pq.write_table(table, self._path)
+
+
+async def run(
+    mongo_uri: str,
+    db_name: str,
+    output: str,
+    fmt: str,
+    student_prefix: Optional[str],
+    requirement_version: Optional[str],
+    only_failing: bool,
+    workers: int,
+    chunk_size: int,
+) -> Dict[str, Any]:
+    connection.MONGO_URL = mongo_uri
+    connection.DB_NAME = db_name
+    await connection.connect_to_mongo()
+    db = connection.get_db()
+    started = time.perf_counter()
+    counts = {"students": 0, "passed": 0, "failed": 0, "errors": 0}
+    stream_stats: Dict[str, int] = {}
+    try:
+        # 읽기 전에 버전을 적어 둔다 (읽는 중에 바뀌면 보고서가 더 옛 버전으로 표시될 뿐)
+        courses_version = await course_table_version()
+        docs_by_version, courses = await asyncio.gather(
+            load_requirement_docs(db), load_course_table(db, COURSE_PROJECTION),
+        )
+        columns = list(BASE_COLUMNS) + shortfall_columns(compile_versions(docs_by_version).values())
+        writer = _ParquetWriter(output, columns) if fmt == "parquet" else _CsvWriter(output, columns)
+
+        def _write(rows: List[Dict[str, Any]]) -> None:
+            for row in rows:
+                counts["students"] += 1
+                if row.get("error"):
+                    counts["errors"] += 1
+                counts["passed" if row["is_passed"] else "failed"] += 1
+            writer.write([r for r in rows if not (only_failing and r["is_passed"])])
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(docs_by_version,)) if workers > 0 else None
+        if pool is None:
+            init_worker(docs_by_version)
+        try:
+            # 제출한 묶음은 순서대로 쓴다 (보고서가 student_id 순). 동시에 떠 있는 묶음은 워커 수의 2배까지
+            in_flight: deque = deque()
+            chunk = []
+
+            async def _submit(students) -> None:
+                if pool is None:
+                    _write(audit_chunk(students))
+                    return
+                in_flight.append(loop.run_in_executor(pool, audit_chunk, students))
+                while len(in_flight) >= workers * 2 or (in_flight and in_flight[0].done()):
+                    _write(await in_flight.popleft())
+
+            async for student in stream_audit_inputs(db, courses, student_prefix, requirement_version, stream_stats):
+                chunk.append(student)
+                if len(chunk) >= chunk_size:
+                    await _submit(chunk)
+                    chunk = []
+            if chunk:
+                await _submit(chunk)
+            while in_flight:
+                _write(await in_flight.popleft())
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            writer.close()
+    finally:
+        await connection.close_mongo_connection()
+
+    summary = {
+        **counts,
+        "orphan_enrollments": stream_stats.get("orphan_enrollments", 0),
+        "output": output,
+        "format": fmt,
+        "workers": workers,
+        "course_table_version": courses_version,
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit graduation requirements for every student and write a report.")
+    parser.add_argument("--output", default="graduation_audit.csv", help="Report path")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv", help="parquet needs pyarrow installed")
+    parser.add_argument("--student-prefix", default=None, help="Only student_ids starting with this (e.g. admission year)")
+    parser.add_argument("--requirement-version", default=None, help="Only students on this requirement_version")
+    parser.add_argument("--only-failing", action="store_true", help="Write only students who do not pass")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Evaluation processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Students per worker task")
+    parser.add_argument("--mongo-uri", default=connection.MONGO_URL, help="Mongo connection string")
+    parser.add_argument("--db", default=connection.DB_NAME, help="Database name")
+    args = parser.parse_args()
+    if args.format == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet needs pyarrow (pip install pyarrow); use --format csv")
+    summary = asyncio.run(run(
+        args.mongo_uri, args.db, args.output, args.format, args.student_prefix, args.requirement_version,
+        args.only_failing, max(0, args.workers), max(1, args.chunk_size),
+    ))
+    orphans = summary["orphan_enrollments"]
+    if orphans:
+        sys.exit(
+            f"error: {orphans} COMPLETED enrollments have no matching student document and are missing from the "
+            "report (student_id stored with a different type, e.g. 9 vs \"9\", or the student was deleted)"
+        )
+
+
+if __name__ == "__main__":
+    main()
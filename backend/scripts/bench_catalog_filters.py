@@ -0,0 +1,141 @@
+# backend/scripts/bench_catalog_filters.py
+#
+# 스냅샷 필터 경로 비교: 행마다 판정 함수를 부르던 방식 vs 열 비트셋 (routers.courses._catalog_select).
+# DB 없이 가짜 과목 행을 만들어 카탈로그 크기 배수별로 count / search(페이지+개수+패싯) / 첫 페이지를 잰다.
+#   python -m scripts.bench_catalog_filters
+#   python -m scripts.bench_catalog_filters --rows 3000 --scales 1,10,100 --repeat 20
+import argparse
+import itertools
+import random
+import time
+
+from bson import ObjectId
+
+from database.course_catalog import TIMESLOT_MASK_FIELD, timeslot_mask_value
+from routers import courses
+from utils.timeslot import FULL_MASK, parse_timeslot, timeslot_mask
+
+GROUPS = ["전공", "교양", "일반선택/교직"]
+CATEGORIES = ["전공필수", "전공선택", "핵심", "균형", "기초", "일반선택"]
+TRACKS = [None, "컴퓨터 과학", "컴퓨터 소프트웨어", "빅데이터"]
+GENERAL_TYPES = [None, "핵심 교양", "균형 교양", "기초 교양"]
+YEARS = [2021, 2022, 2023, 2024, 2025]
+COLLECTIONS = ["courses_2025_major", "courses_2024_major", "core_general", "balance_general", "basic_general"]
+
+QUERIES = {
+    "all": {},
+    "group": {"group": "전공"},
+    "group+year": {"group": "전공", "year": 2024},
+    "category+track": {"category": "전공선택", "major_track": "컴퓨터 과학"},
+    "free_slots": {
+        "group": "교양",
+        TIMESLOT_MASK_FIELD: {"$bitsAllClear": timeslot_mask_value(FULL_MASK & ~parse_timeslot("월1-9/화1-9/수1-9/목1-9"))},
+    },
+}
+
+
+def fake_rows(n: int, seed: int):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        day = rnd.choice("월화수목금")
+        period = rnd.randint(1, 8)
+        raw = {
+            "_id": ObjectId(),
+            "course_code": str(1000 + rnd.randint(0, n // 3 + 1)),
+            "course_name": f"과목{i % 997}",
+            "professor": f"교수{i % 131}",
+            "requirement_id": rnd.choice(["R1", "R2", "R3", None]),
+            "category": rnd.choice(CATEGORIES),
+            "group": rnd.choice(GROUPS),
+            "year": rnd.choice(YEARS),
+            "major_track": rnd.choice(TRACKS),
+            "general_type": rnd.choice(GENERAL_TYPES),
+            "timeslot": f"{day}{period},{period + 1}",
+        }
+        mask = timeslot_mask(raw["timeslot"])
+        if mask is not None:
+            raw[TIMESLOT_MASK_FIELD] = mask
+        doc = dict(raw)
+        doc.pop("_id")
+        doc.pop(TIMESLOT_MASK_FIELD, None)
+        rows.append(courses.CatalogRow(rnd.choice(COLLECTIONS), raw, doc))
+    return rows
+
+
+def row_path(snapshot, match, skip, limit):
+    """이전 방식: 모든 행에 판정 함수를 돌리며 페이지/개수/패싯을 한 번에 센다."""
+    pred = courses._compile_match(match)
+    page, total = [], 0
+    counts = {f: {} for f in courses.FACET_FIELDS}
+    for row in snapshot.rows:
+        if not pred(row.raw):
+            continue
+        total += 1
+        for f in courses.FACET_FIELDS:
+            v = row.raw.get(f)
+            if v is not None and not isinstance(v, (list, dict)):
+                counts[f][v] = counts[f].get(v, 0) + 1
+        if skip <= total - 1 < skip + limit:
+            page.append(row)
+    return page, total, counts
+
+
+def matching_rows(snapshot, match):
+    pred = courses._compile_match(match)
+    return (r for r in snapshot.rows if pred(r.raw))
+
+
+def column_path(match, skip, limit):
+    selection = courses._catalog_select(match, None)
+    page = [r for _, r in itertools.islice(selection.rows(), skip, skip + limit)]
+    return page, selection.count(), selection.facets(courses.FACET_FIELDS)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark row-by-row vs columnar bitset filtering on the course snapshot.")
+    parser.add_argument("--rows", type=int, default=3000, help="Base catalog size (scale 1)")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated catalog size multipliers")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    courses.CATALOG_SNAPSHOT_ENABLED = True
+    print(f"{'rows':>8} {'query':<16} {'op':<7} {'row ms':>9} {'column ms':>10} {'speedup':>8}")
+    for scale in (int(s) for s in args.scales.split(",")):
+        n = args.rows * scale
+        started = time.perf_counter()
+        snapshot = courses.CatalogSnapshot(0, COLLECTIONS, fake_rows(n, args.seed))
+        courses._catalog = snapshot
+        print(f"# {n} rows, snapshot build {(time.perf_counter() - started):.1f}s")
+        for name, match in QUERIES.items():
+            old_page, old_total, old_counts = row_path(snapshot, match, 0, 20)
+            new_page, new_total, new_counts = column_path(match, 0, 20)
+            assert old_total == new_total and old_page == new_page and old_counts == new_counts, name
+            cases = {
+                "count": (
+                    lambda: sum(1 for _ in matching_rows(snapshot, match)),
+                    lambda: courses._catalog_select(match, None).count(),
+                ),
+                "search": (lambda: row_path(snapshot, match, 40, 20), lambda: column_path(match, 40, 20)),
+                "page": (
+                    lambda: list(itertools.islice(matching_rows(snapshot, match), 40, 60)),
+                    lambda: list(itertools.islice(courses._catalog_select(match, None).rows(), 40, 60)),
+                ),
+            }
+            for op, (old, new) in cases.items():
+                old_ms, new_ms = timed(old, args.repeat), timed(new, args.repeat)
+                print(f"{n:>8} {name:<16} {op:<7} {old_ms:>9.2f} {new_ms:>10.2f} {old_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# backend/scripts/bench_course_serialization.py
+#
+# /courses 응답 직렬화 비교 (초당 행 수). 100행 페이지를
+#   - jsonable_encoder + json.dumps        (response_class를 지정한 FastAPI 기본 경로)
+#   - response_model 검증 + dump_json      (FastAPI 기본 경로: 매 요청 재검증)
+#   - FAST_RESPONSES 행 조각 (처음: 검증+인코딩 / 이후: 캐시된 조각 이어 붙이기)
+# 로 만들어 본다.
+#   python -m scripts.bench_course_serialization
+#   python -m scripts.bench_course_serialization --page-size 100 --pages 200
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from routers import courses
+from scripts.bench_catalog_filters import COLLECTIONS, fake_rows
+from utils.fast_response import json_array
+
+
+def measure(label: str, fn, pages, page_size: int, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - started)
+    rows = len(pages) * page_size
+    print(f"{label:<34} {rows / best:>12,.0f} rows/s  {best / len(pages) * 1000:>8.3f} ms/page")
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark course page serialization (rows/second).")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200, help="Distinct pages per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    snapshot = courses.CatalogSnapshot(0, COLLECTIONS, fake_rows(args.page_size * args.pages, 7))
+    rows = snapshot.rows
+    pages = [rows[i:i + args.page_size] for i in range(0, len(rows), args.page_size)]
+    adapter = courses._COURSE_LIST_ADAPTER
+
+    # 결과가 같은지 먼저 확인
+    sample = pages[0]
+    expected = adapter.dump_json(adapter.validate_python([r.doc for r in sample]), by_alias=True)
+    assert json.loads(json_array(courses._row_json(r) for r in sample)) == json.loads(expected)
+
+    def reset(page):
+        for r in page:
+            r.json = None
+
+    def cold(page):
+        reset(page)
+        json_array(courses._row_json(r) for r in page)
+
+    base = measure(
+        "jsonable_encoder + json.dumps",
+        lambda page: json.dumps(jsonable_encoder(
+            [courses.CourseOut.model_validate(r.doc) for r in page], by_alias=True,
+        )).encode("utf-8"),
+        pages, args.page_size, args.repeat,
+    )
+    default = measure(
+        "validate + dump_json (default)",
+        lambda page: adapter.dump_json(adapter.validate_python([r.doc for r in page]), by_alias=True),
+        pages, args.page_size, args.repeat,
+    )
+    measure("fast path, cold fragments", cold, pages, args.page_size, args.repeat)
+    for page in pages:
+        json_array(courses._row_json(r) for r in page)
+    warm = measure(
+        "fast path, cached fragments",
+        lambda page: json_array(courses._row_json(r) for r in page),
+        pages, args.page_size, args.repeat,
+    )
+    print(f"cached fragments: {warm / default:.1f}x default path, {warm / base:.1f}x jsonable_encoder")
+
+
+if __name__ == "__main__":
+    main()
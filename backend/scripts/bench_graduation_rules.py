@@ -0,0 +1,192 @@
+# backend/scripts/bench_graduation_rules.py
+#
+# 졸업요건 규칙 엔진(utils.graduation_rules) 평가 속도 (초당 평가 수). 가짜 요건 문서
+# (기본 규칙 + "N개 중 M개" + 세부 영역 + 트랙 + 요약 버킷)와 학생별 이수 내역(기본 45과목)으로
+#   - 문서를 매번 해석해 규칙마다 이수 내역을 다시 훑는 방식 (비교 기준)
+#   - 컴파일된 트리: tally + evaluate (규칙별 진행도) / tally + passes (처음 실패에서 멈춤)
+#   - 기존 누적값에 계획 과목만 더해 evaluate (what-if 시뮬레이션 경로)
+#   - 학생 한 명의 계획 --plans개: 계획마다 tally / tally_many 한 번 (POST /graduation/simulate)
+# 를 재 본다. 시작 전에 세 방식의 통과 여부가 모든 학생에서 같은지 확인한다.
+#   python -m scripts.bench_graduation_rules
+#   python -m scripts.bench_graduation_rules --students 2000 --courses-per-student 45
+import argparse
+import random
+import time
+
+from utils.category_buckets import bucket_category
+from utils.graduation_rules import compile_rules, transcript_entry
+
+TRACKS = ["컴퓨터 과학", "컴퓨터 소프트웨어", "빅데이터"]
+CATEGORIES = ["MAJOR", "MAJOR", "MAJOR", "GENERAL", "GENERAL", "ELECTIVE", "핵심교양", "균형교양"]
+AREAS = ["문학과문화", "역사와철학", "인간과사회", "생명과환경", "과학과기술", "예술과체육", "융복합"]
+
+
+def fake_catalog(n: int, seed: int):
+    rnd = random.Random(seed)
+    catalog = []
+    for i in range(n):
+        category = rnd.choice(CATEGORIES)
+        catalog.append({
+            "course_code": str(10000 + i),
+            "category": category,
+            "sub_category": rnd.choice(AREAS) if category == "균형교양" else rnd.choice(["전공필수", "전공선택", None]),
+            "credits": rnd.choice([1, 2, 3, 3, 3]),
+        })
+    return catalog
+
+
+def fake_requirements(catalog, seed: int):
+    rnd = random.Random(seed)
+    codes = [c["course_code"] for c in catalog]
+    docs = [
+        {"requirement_id": "MAJOR", "category": "MAJOR", "required_credits": 45},
+        {"requirement_id": "GENERAL", "category": "GENERAL", "required_credits": 24},
+        {"requirement_id": "ELECTIVE", "category": "ELECTIVE", "required_credits": 10},
+        {"requirement_id": "TOTAL", "category": "TOTAL", "required_credits": 120},
+        {"requirement_id": "GPA", "category": "MIN_GPA", "required_gpa": 2.0},
+        {"requirement_id": "QR", "category": "QUAL_REQUIRED", "required_credits": 1},
+        {"requirement_id": "QO", "category": "QUAL_OPTIONAL", "required_credits": 1},
+        {"requirement_id": "CORE", "category": "핵심교양", "required_credits": 9},
+        {"requirement_id": "BASIC", "category": "전공기초", "courses": rnd.sample(codes, 8), "min_courses": 3},
+        {"requirement_id": "CAPSTONE", "category": "캡스톤", "courses": rnd.sample(codes, 4), "min_courses": 1},
+        {"requirement_id": "BALANCE", "category": "균형교양", "sub_areas": {a: 3 for a in AREAS}, "min_areas": 3},
+    ]
+    for track in TRACKS:
+        docs.append({
+            "requirement_id": f"TRACK-{track}", "category": "트랙필수", "major_track": track,
+            "courses": rnd.sample(codes, 6), "min_courses": 2,
+        })
+    return docs
+
+
+def fake_students(catalog, docs, n: int, per_student: int, seed: int):
+    rnd = random.Random(seed)
+    by_code = {c["course_code"]: c for c in catalog}
+    # 과목 목록 규칙에 나오는 과목은 더 자주 듣게 (통과/미통과 학생이 섞이도록)
+    listed = sorted({code for d in docs for code in d.get("courses", ())})
+    students = []
+    for _ in range(n):
+        picks = {c["course_code"]: c for c in rnd.sample(catalog, per_student)}
+        for code in rnd.sample(listed, min(len(listed), per_student // 5)):
+            picks[code] = by_code[code]
+        taken = list(picks.values())
+        entries = [transcript_entry(c["course_code"], c, rnd.choice([None, 2.5, 3.0, 3.5, 4.0, 4.5])) for c in taken]
+        context = {
+            "track": rnd.choice(TRACKS),
+            "certifications": {"required_count": rnd.randint(0, 2), "optional_count": rnd.randint(0, 2)},
+        }
+        students.append((entries, context))
+    return students
+
+
+def interpret(docs, entries, track, certifications) -> bool:
+    """비교 기준: 문서를 매번 해석하고 규칙마다 이수 내역을 다시 훑는다."""
+    ok = True
+    core = {d["category"]: d for d in docs if d["category"] in ("MAJOR", "GENERAL", "ELECTIVE", "TOTAL", "MIN_GPA")}
+    for doc in docs:
+        if doc.get("major_track") and doc["major_track"] != track:
+            continue
+        cat = doc["category"]
+        if doc.get("courses"):
+            codes = set(doc["courses"])
+            ok &= len({e.code for e in entries if e.code in codes}) >= doc.get("min_courses", len(codes))
+        elif doc.get("sub_areas"):
+            filled = sum(
+                1 for area, need in doc["sub_areas"].items()
+                if sum(e.credits for e in entries if area in (e.category, e.sub_category)) >= need
+            )
+            ok &= filled >= doc.get("min_areas", len(doc["sub_areas"]))
+        elif cat == "MIN_GPA":
+            gc = sum(e.gpa_credits for e in entries)
+            gpa = round(sum(e.gpa_points for e in entries) / gc, 2) if gc else 0.0
+            ok &= gpa >= doc["required_gpa"]
+        elif cat == "TOTAL":
+            ok &= sum(e.credits for e in entries) >= doc["required_credits"]
+        elif cat in ("QUAL_REQUIRED", "QUAL_OPTIONAL"):
+            key = "required_count" if cat == "QUAL_REQUIRED" else "optional_count"
+            ok &= certifications.get(key, 0) >= doc["required_credits"]
+        elif cat in core:
+            ok &= sum(e.credits for e in entries if e.category == cat) >= doc["required_credits"]
+        else:
+            bucket = bucket_category(cat)
+            ok &= sum(e.credits for e in entries if bucket_category(e.category) == bucket) >= doc["required_credits"]
+    return ok
+
+
+def measure(label: str, fn, students, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for entries, context in students:
+            fn(entries, context)
+        best = min(best, time.perf_counter() - started)
+    rate = len(students) / best
+    print(f"{label:<36} {rate:>12,.0f} evals/s  {best / len(students) * 1e6:>8.1f} us/eval")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark compiled graduation rule evaluation (evaluations/second).")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--courses-per-student", type=int, default=45)
+    parser.add_argument("--catalog", type=int, default=600, help="Distinct courses")
+    parser.add_argument("--plan-size", type=int, default=5, help="Courses added per what-if plan")
+    parser.add_argument("--plans", type=int, default=500, help="What-if plans for one student (batch tally)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    catalog = fake_catalog(args.catalog, 1)
+    docs = fake_requirements(catalog, 2)
+    students = fake_students(catalog, docs, args.students, args.courses_per_student, 3)
+
+    started = time.perf_counter()
+    tree = compile_rules(docs)
+    print(f"compile: {len(tree.rules)} rules in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    # 결과가 같은지 먼저 확인
+    passed = 0
+    for entries, context in students:
+        tally = tree.tally(entries)
+        expected = interpret(docs, entries, **context)
+        assert tree.passes(tally, **context) == expected
+        assert tree.evaluate(tally, **context).is_passed == expected
+        passed += expected
+    print(f"students: {len(students)} ({passed} passing)")
+
+    base = measure("interpret documents per student", lambda e, ctx: interpret(docs, e, **ctx), students, args.repeat)
+    full = measure("compiled: tally + evaluate", lambda e, ctx: tree.evaluate(tree.tally(e), **ctx), students, args.repeat)
+    measure("compiled: tally + passes", lambda e, ctx: tree.passes(tree.tally(e), **ctx), students, args.repeat)
+
+    rnd = random.Random(4)
+    tallies = {id(e): tree.tally(e) for e, _ in students}
+    plans = {id(e): [transcript_entry(c["course_code"], c, 4.0) for c in rnd.sample(catalog, args.plan_size)]
+             for e, _ in students}
+    measure(
+        "what-if plan on cached tally",
+        lambda e, ctx: tree.evaluate(tree.tally(plans[id(e)], start=tallies[id(e)]), **ctx),
+        students, args.repeat,
+    )
+    print(f"compiled evaluate: {full / base:.1f}x interpreting documents")
+
+    # 한 학생의 계획 여러 개 (후보 과목 몇십 개에서 골라 같은 과목이 여러 계획에 나온다)
+    entries, context = students[0]
+    start = tree.tally(entries)
+    pool = rnd.sample(catalog, min(len(catalog), 60))
+    batch = [[transcript_entry(c["course_code"], c, 4.0) for c in rnd.sample(pool, args.plan_size)]
+             for _ in range(args.plans)]
+    assert [t.values for t in tree.tally_many(batch, start=start)] == [tree.tally(p, start=start).values for p in batch]
+    for label, fn in (
+        ("tally per plan", lambda: [tree.tally(p, start=start) for p in batch]),
+        ("tally_many", lambda: tree.tally_many(batch, start=start)),
+    ):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for tally in fn():
+                tree.evaluate(tally, **context)
+            best = min(best, time.perf_counter() - started)
+        print(f"{args.plans} plans, {label:<22} {best * 1000:>8.2f} ms (tally + evaluate)")
+
+
+if __name__ == "__main__":
+    main()
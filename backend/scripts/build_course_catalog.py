@@ -0,0 +1,44 @@
+# backend/scripts/build_course_catalog.py
+#
+# 여러 과목 컬렉션을 정규화된 course_catalog 하나로 합친다.
+#   python -m scripts.build_course_catalog
+#   python -m scripts.build_course_catalog --sources courses_2025_major,core_general
+# 실행 중인 서버는 data_versions 폴링으로 새 카탈로그를 다시 적재한다.
+import argparse
+import asyncio
+import json
+
+from database import connection
+from database.course_catalog import build_course_catalog
+
+
+async def run(mongo_uri: str, db_name: str, sources, batch_size: int):
+    connection.MONGO_URL = mongo_uri
+    connection.DB_NAME = db_name
+    await connection.connect_to_mongo()
+    try:
+        result = await build_course_catalog(connection.get_db(), sources=sources, batch_size=batch_size)
+    finally:
+        await connection.close_mongo_connection()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the unified course_catalog collection from the per-year/per-type course collections."
+    )
+    parser.add_argument(
+        "--sources",
+        default=None,
+        help="Comma-separated source collections (default: same policy as the API, COURSE_COLLECTIONS or auto-detect)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="insert_many batch size")
+    parser.add_argument("--mongo-uri", default=connection.MONGO_URL, help="Mongo connection string")
+    parser.add_argument("--db", default=connection.DB_NAME, help="Database name")
+    args = parser.parse_args()
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()] if args.sources else None
+    asyncio.run(run(args.mongo_uri, args.db, sources, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# backend/scripts/mark_course_table_changed.py
+#
+# db.courses를 시드/수정한 뒤 돌린다. data_versions의 "course_table" 카운터를 올려
+# db.courses를 메모리에 들고 있는 워커(졸업요건 추천 색인)가 RECOMMEND_INDEX_CHECK_SECONDS 안에 다시 읽게 한다.
+# (과목 카탈로그 courses_*는 scripts.build_course_catalog가 따로 "courses" 카운터를 올린다)
+#   python -m scripts.mark_course_table_changed
+import argparse
+import asyncio
+import json
+
+from database import connection
+from database.course_lookup import COURSE_TABLE_VERSION_KEY, course_table_changed
+
+
+async def run(mongo_uri: str, db_name: str):
+    connection.MONGO_URL = mongo_uri
+    connection.DB_NAME = db_name
+    await connection.connect_to_mongo()
+    try:
+        version = await course_table_changed()
+    finally:
+        await connection.close_mongo_connection()
+    print(json.dumps({"key": COURSE_TABLE_VERSION_KEY, "version": version}, ensure_ascii=False, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bump the db.courses version counter after seeding or editing db.courses.")
+    parser.add_argument("--mongo-uri", default=connection.MONGO_URL, help="Mongo connection string")
+    parser.add_argument("--db", default=connection.DB_NAME, help="Database name")
+    args = parser.parse_args()
+    asyncio.run(run(args.mongo_uri, args.db))
+
+
+if __name__ == "__main__":
+    main()
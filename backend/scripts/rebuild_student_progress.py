@@ -0,0 +1,145 @@
+# backend/scripts/rebuild_student_progress.py
+#
+# student_progress(학생별 이수 합계) 문서를 원본 enrollments에서 다시 만든다.
+# 수강 기록을 API 밖에서 넣었거나(scripts.seed_enrollments 등) $inc 반영이 어긋났을 때 실행.
+# 다시 만들기 전에 수강 기록을 고친다:
+#   - 문자열로 저장된 year/semester("2024", "1") → 정수
+#   - 과목 스냅샷(progress_course)이 없는 기록 → 지금 과목 정보로 남김
+#     (--refresh-course-snapshots면 모든 기록을 지금 과목 정보로 다시 — 과목 학점/카테고리를 고친 뒤)
+#   python -m scripts.rebuild_student_progress
+#   python -m scripts.rebuild_student_progress --student 20231234
+#   python -m scripts.rebuild_student_progress --refresh-course-snapshots
+#   python -m scripts.rebuild_student_progress --check      # 쓰지 않고 어긋난 학생/고칠 기록 수만 보고
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from database import connection
+from database.course_lookup import course_table_version, load_course_table
+from database.student_progress import (
+    PROGRESS_COLLECTION, PROGRESS_COURSE_FIELD, compute_student_progress, course_snapshot, parse_progress,
+    rebuild_student_progress,
+)
+
+
+def _as_int_field(value: Any) -> Optional[int]:
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value.strip())
+    return None
+
+
+async def _repair_enrollments(
+    db, courses: Dict[str, Dict[str, Any]], student: Optional[str], refresh: bool, check: bool,
+) -> Dict[str, int]:
+    """year/semester 문자열 → 정수, 과목 스냅샷 채우기. check면 고칠 기록 수만 센다."""
+    counts = {"year_semester_fixed": 0, "snapshots_stamped": 0}
+    query: Dict[str, Any] = {"student_id": student} if student else {}
+    projection = {"year": 1, "semester": 1, "course_code": 1, PROGRESS_COURSE_FIELD: 1}
+    async for e in db.enrollments.find(query, projection):
+        updates: Dict[str, Any] = {}
+        for field in ("year", "semester"):
+            fixed = _as_int_field(e.get(field))
+            if fixed is not None:
+                updates[field] = fixed
+        if updates:
+            counts["year_semester_fixed"] += 1
+        if refresh or not isinstance(e.get(PROGRESS_COURSE_FIELD), dict):
+            snapshot = course_snapshot(courses.get(str(e.get("course_code"))))
+            if snapshot is not None and snapshot != e.get(PROGRESS_COURSE_FIELD):
+                updates[PROGRESS_COURSE_FIELD] = snapshot
+                counts["snapshots_stamped"] += 1
+        if updates and not check:
+            await db.enrollments.update_one({"_id": e["_id"]}, {"$set": updates})
+    return counts
+
+
+def _same(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    pa, pb = parse_progress(a), parse_progress(b)
+    if pa.buckets != pb.buckets or [s[:3] for s in pa.semesters] != [s[:3] for s in pb.semesters]:
+        return False
+    if any(abs(x.gpa_points - y.gpa_points) > 1e-6 for x, y in zip(pa.semesters, pb.semesters)):
+        return False
+    cats = set(pa.categories) | set(pb.categories)
+    for cat in cats:
+        x, y = pa.categories.get(cat, (0, 0.0, 0)), pb.categories.get(cat, (0, 0.0, 0))
+        if x[0] != y[0] or x[2] != y[2] or abs(x[1] - y[1]) > 1e-6:
+            return False
+    return True
+
+
+async def run(
+    mongo_uri: str, db_name: str, student: Optional[str], check: bool, concurrency: int, refresh_snapshots: bool,
+):
+    connection.MONGO_URL = mongo_uri
+    connection.DB_NAME = db_name
+    await connection.connect_to_mongo()
+    db = connection.get_db()
+    started = time.perf_counter()
+    try:
+        if student:
+            student_ids: List[str] = [student]
+        else:
+            # 이수 기록이 있는 학생 + 이미 문서가 있는 학생 (기록이 다 지워졌으면 빈 합계로)
+            student_ids = sorted(
+                set(await db.enrollments.distinct("student_id")) | set(await db[PROGRESS_COLLECTION].distinct("_id"))
+            )
+        courses_version = await course_table_version()
+        courses = await load_course_table(db, {"course_code": 1, "category": 1, "credits": 1})
+        repaired = await _repair_enrollments(db, courses, student, refresh_snapshots, check)
+        stored = {}
+        if check:
+            async for doc in db[PROGRESS_COLLECTION].find({"_id": {"$in": student_ids}}):
+                stored[doc["_id"]] = doc
+
+        semaphore = asyncio.Semaphore(concurrency)
+        drifted: List[str] = []
+
+        async def _one(student_id: str) -> None:
+            async with semaphore:
+                if not check:
+                    await rebuild_student_progress(db, student_id, courses)
+                    return
+                # 확인만: 다시 계산한 값을 저장하지 않고 비교
+                fresh = await compute_student_progress(db, student_id, courses)
+                current = stored.get(student_id)
+                if current is None or not _same(current, fresh):
+                    drifted.append(student_id)
+
+        await asyncio.gather(*(_one(s) for s in student_ids))
+    finally:
+        await connection.close_mongo_connection()
+
+    result = {
+        "students": len(student_ids),
+        "mode": "check" if check else "rebuild",
+        "course_table_version": courses_version,
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+        # check면 고쳐야 할 기록 수 (쓰지 않음)
+        **repaired,
+    }
+    if check:
+        result["drifted"] = sorted(drifted)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-student progress documents from raw enrollments.")
+    parser.add_argument("--student", default=None, help="Only this student_id")
+    parser.add_argument("--check", action="store_true", help="Report drifted students without writing")
+    parser.add_argument("--concurrency", type=int, default=16, help="Students processed concurrently")
+    parser.add_argument(
+        "--refresh-course-snapshots", action="store_true",
+        help="Re-stamp every enrollment's course snapshot from current course data before rebuilding",
+    )
+    parser.add_argument("--mongo-uri", default=connection.MONGO_URL, help="Mongo connection string")
+    parser.add_argument("--db", default=connection.DB_NAME, help="Database name")
+    args = parser.parse_args()
+    asyncio.run(run(
+        args.mongo_uri, args.db, args.student, args.check, max(1, args.concurrency), args.refresh_course_snapshots,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# backend/tests/conftest.py
+#
+# 테스트 공용 픽스처. MongoDB 대신 mongomock_motor의 메모리 DB를 쓰고,
+# DB 왕복(find/find_one/쓰기 명령) 횟수를 세는 프록시로 감싸 connection.db에 꽂는다.
+#   cd backend && python -m pytest -q
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from database import connection  # noqa: E402
+
+# 서버로 한 번 나가는 명령 (find는 결과가 한 배치에 들어온다고 보고 한 번으로 센다)
+ROUND_TRIP_METHODS = {
+    "find", "find_one", "aggregate", "count_documents", "distinct",
+    "insert_one", "insert_many", "replace_one", "update_one", "update_many",
+    "delete_one", "delete_many", "find_one_and_update", "find_one_and_delete", "bulk_write",
+}
+
+
+class CountingCollection:
+    def __init__(self, collection, calls: Counter):
+        self._collection = collection
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in ROUND_TRIP_METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self._calls[f"{self._collection.name}.{name}"] += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+class CountingDb:
+    """db.<컬렉션> / db["<컬렉션>"]으로 꺼낸 컬렉션의 명령 횟수를 calls에 센다."""
+
+    def __init__(self, db):
+        self._db = db
+        self.calls: Counter = Counter()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return CountingCollection(self._db[name], self.calls)
+
+    def __getitem__(self, name):
+        return CountingCollection(self._db[name], self.calls)
+
+    def list_collection_names(self, *args, **kwargs):
+        # 과목 레지스트리 갱신용 DB 수준 명령 (컬렉션 명령이 아니라 세지 않는다)
+        return self._db.list_collection_names(*args, **kwargs)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+
+@pytest.fixture
+def new_db(monkeypatch):
+    """빈 메모리 DB를 새로 만들어 connection.db로 꽂는다 (한 테스트 안에서 여러 번 불러도 된다)."""
+    def make() -> CountingDb:
+        client = mongomock_motor.AsyncMongoMockClient()
+        counting = CountingDb(client["gnu_sys_test"])
+        monkeypatch.setattr(connection, "client", client)
+        monkeypatch.setattr(connection, "db", counting)
+        return counting
+
+    return make
+
+
+@pytest.fixture
+def db(new_db) -> CountingDb:
+    return new_db()
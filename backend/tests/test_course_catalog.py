@@ -0,0 +1,64 @@
+# backend/tests/test_course_catalog.py
+#
+# course_catalog(database.course_catalog)에서 읽을 때: 적재할 때 정규화를 끝냈으므로 읽는 쪽은
+# coerce_and_fill/normalize_course를 다시 부르지 않고, 원본 컬렉션을 읽은 것과 같은 응답 문서를 낸다.
+import asyncio
+
+import pytest
+
+from database import connection, course_registry
+from database.course_catalog import build_course_catalog
+from routers import courses
+
+COLLECTION = "courses_2025_major_bd"
+SOURCE_DOCS = [
+    # 숫자로 저장된 코드, 컬렉션명에서 채우는 year/group/major_track/source_collection
+    {"course_code": 10001, "requirement_id": 7, "course_name": "데이터베이스", "class": "01",
+     "timeslot": "월 09:00-10:30", "credits": 3},
+    {"course_code": "10002", "requirement_id": "7", "course_name": "머신러닝", "class": "02", "credits": 3,
+     "year": 2024},
+    {"course_code": "10003", "requirement_id": "7", "credits": 1},   # 과목명이 없어 응답에서 빠진다
+]
+CODES = ["10001", "10002", "10003"]
+
+
+@pytest.fixture
+def source_db(db, monkeypatch):
+    monkeypatch.setattr(connection, "COURSE_COLLECTIONS", [COLLECTION])
+    monkeypatch.setattr(course_registry, "_registry", None)
+    monkeypatch.setattr(courses, "_catalog", None)
+    asyncio.run(db._db[COLLECTION].insert_many([dict(d) for d in SOURCE_DOCS]))
+    return db
+
+
+def _read_all():
+    async def go():
+        await course_registry.refresh_registry()
+        by_code = await courses.courses_by_code(CODES)
+        snapshot = await courses._load_catalog_snapshot(1)
+        return by_code, [r.doc for r in snapshot.rows if r.doc]
+
+    return asyncio.run(go())
+
+
+def _no_read_normalization(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("catalog documents are normalized at build time")
+
+    monkeypatch.setattr(courses, "_coerce_and_fill", fail)
+    monkeypatch.setattr(courses, "_normalize_course_for_response", fail)
+
+
+def test_catalog_reads_match_source_reads_without_renormalizing(source_db, monkeypatch):
+    from_sources, snapshot_sources = _read_all()
+    assert [d["course_code"] for d in snapshot_sources] == ["10001", "10002"]
+    assert from_sources["10001"][0]["course_name"] == "데이터베이스"
+    assert from_sources["10003"] == []
+
+    result = asyncio.run(build_course_catalog(source_db, [COLLECTION]))
+    assert result["total"] == len(SOURCE_DOCS)
+    _no_read_normalization(monkeypatch)
+    from_catalog, snapshot_catalog = _read_all()
+
+    assert from_catalog == from_sources
+    assert snapshot_catalog == snapshot_sources
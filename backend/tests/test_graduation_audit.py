@@ -0,0 +1,90 @@
+# backend/tests/test_graduation_audit.py
+#
+# 일괄 졸업 사정 merge join(database.graduation_audit.stream_audit_inputs)이 MongoDB 정렬 순서대로
+# 학생과 COMPLETED 기록을 맞추는지, 주인 없는 기록은 orphan_enrollments로 세고 스크립트가 실패하는지.
+import asyncio
+import sys
+
+import pytest
+
+from database import connection
+from database.graduation_audit import stream_audit_inputs
+from scripts import audit_graduation
+
+COURSES = {"1001": {"course_code": "1001", "category": "MAJOR", "credits": 3}}
+
+
+def _stream(db, **kwargs):
+    async def go():
+        stats = {}
+        rows = [s async for s in stream_audit_inputs(db, COURSES, stats=stats, **kwargs)]
+        return rows, stats
+
+    return asyncio.run(go())
+
+
+def _seed(db, students, enrollments):
+    async def go():
+        await db._db.students.insert_many(
+            [s if isinstance(s, dict) else {"student_id": s, "requirement_version": "2021"} for s in students]
+        )
+        await db._db.enrollments.insert_many([
+            {"student_id": sid, "course_code": "1001", "status": "COMPLETED", "grade_point": 4.0} for sid in enrollments
+        ])
+
+    asyncio.run(go())
+
+
+def _entries(rows):
+    return {r.student_id: len(r.entries) for r in rows}
+
+
+def test_numeric_ids_of_different_lengths(db):
+    # 문자열로 비교하면 "10" < "9"라 MongoDB 정렬(9 < 10)과 어긋난다
+    _seed(db, [9, 10], [9, 10, 10])
+    rows, stats = _stream(db)
+    assert [r.student_id for r in rows] == ["9", "10"]
+    assert _entries(rows) == {"9": 1, "10": 2}
+    assert stats == {"orphan_enrollments": 0}
+
+
+def test_mixed_int_and_str_ids(db):
+    _seed(db, [9, 10, "10", "9", "20210001"], [9, 10, "10", "10", "9", "20210001", 10])
+    rows, stats = _stream(db)
+    # 숫자 먼저(수 크기 순), 그다음 문자열
+    assert [r.student_id for r in rows] == ["9", "10", "10", "20210001", "9"]
+    assert [len(r.entries) for r in rows] == [1, 2, 2, 1, 1]
+    assert stats == {"orphan_enrollments": 0}
+
+
+def test_unmatched_enrollments_are_counted(db):
+    # 타입이 다른 id는 MongoDB 동등 비교처럼 다른 학생이고, 학생 문서가 없는 기록은 마지막 학생 뒤에 남는다
+    _seed(db, ["20210001", "20210002"], [20210002, "20210001", "20210002", "20219999", "20219999"])
+    rows, stats = _stream(db)
+    assert _entries(rows) == {"20210001": 1, "20210002": 1}
+    assert stats == {"orphan_enrollments": 3}
+
+
+def test_version_filter_does_not_orphan_other_versions(db):
+    _seed(db, [{"student_id": "20210001", "requirement_version": "2021"},
+               {"student_id": "20210002", "requirement_version": "2022"}],
+          ["20210001", "20210002"])
+    rows, stats = _stream(db, requirement_version="2021")
+    assert [r.student_id for r in rows] == ["20210001"]
+    assert stats == {"orphan_enrollments": 0}
+
+
+def test_script_fails_on_orphans(db, monkeypatch, tmp_path, capsys):
+    _seed(db, ["20210001"], ["20210001", 20210001])
+
+    async def connect():
+        return None
+
+    monkeypatch.setattr(connection, "connect_to_mongo", connect)
+    monkeypatch.setattr(connection, "close_mongo_connection", connect)
+    monkeypatch.setattr(sys, "argv", ["audit_graduation", "--workers", "0", "--output", str(tmp_path / "audit.csv")])
+    with pytest.raises(SystemExit) as exc:
+        audit_graduation.main()
+    assert "1 COMPLETED enrollments have no matching student" in str(exc.value.code)
+    assert '"orphan_enrollments": 1' in capsys.readouterr().out
+    assert (tmp_path / "audit.csv").exists()
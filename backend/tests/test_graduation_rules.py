@@ -0,0 +1,79 @@
+# backend/tests/test_graduation_rules.py
+#
+# 규칙 엔진(utils.graduation_rules): 계획 여러 개를 한 표로 더하는 tally_many가
+# 계획마다 tally(plan, start=...)를 부른 것과 같은지 (NumPy 행렬 곱 / 없을 때의 희소 행 합 둘 다).
+import random
+
+import pytest
+
+from scripts.bench_graduation_rules import fake_catalog, fake_requirements, fake_students
+from utils import graduation_rules
+from utils.graduation_rules import TranscriptEntry, compile_rules, transcript_entry
+
+
+def test_tally_many_matches_tally_per_plan():
+    catalog = fake_catalog(200, 1)
+    docs = fake_requirements(catalog, 2)
+    tree = compile_rules(docs)
+    entries, context = fake_students(catalog, docs, 1, 30, 3)[0]
+    base = tree.tally(entries)
+
+    rnd = random.Random(4)
+    listed = [c for c in catalog if any(c["course_code"] in d.get("courses", ()) for d in docs)]
+    pool = rnd.sample(catalog, 20) + listed
+    plans = [
+        [transcript_entry(c["course_code"], c, rnd.choice([None, 3.0, 4.5])) for c in rnd.sample(pool, rnd.randint(1, 8))]
+        for _ in range(200)
+    ]
+    plans.append([])
+    # 이미 센 과목코드를 다시 넣은 계획, 과목코드 없는 합계 줄
+    plans.append([transcript_entry(e.code, {"category": e.category, "credits": e.credits}, 4.0) for e in entries[:3]])
+    plans.append([TranscriptEntry(None, "MAJOR", None, 3, 12.0, 3)])
+
+    batched = tree.tally_many(plans, start=base)
+    for plan, tally in zip(plans, batched):
+        expected = tree.tally(plan, start=base)
+        assert tally.values == expected.values
+        assert tally.seen == expected.seen
+        assert tree.evaluate(tally, **context) == tree.evaluate(expected, **context)
+    assert base.values == tree.tally(entries).values   # start는 바뀌지 않는다
+
+
+def test_tally_many_without_start():
+    tree = compile_rules([{"requirement_id": "BASIC", "category": "전공기초", "courses": ["1", "2"], "min_courses": 1}])
+    plan = [TranscriptEntry("1", "MAJOR", None, 3, 0.0, 0), TranscriptEntry("1", "MAJOR", None, 3, 0.0, 0)]
+    [tally] = tree.tally_many([plan])
+    assert tally.values == tree.tally(plan).values
+    assert tally.seen == {"1"}
+
+
+@pytest.mark.parametrize("use_numpy", [True, False], ids=["numpy", "sparse-rows"])
+@pytest.mark.parametrize("seed", range(5))
+def test_tally_many_random_plans(monkeypatch, seed, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(graduation_rules, "np", None)
+    rnd = random.Random(seed)
+    catalog = fake_catalog(rnd.randint(30, 300), seed)
+    docs = fake_requirements(catalog, seed + 1)
+    tree = compile_rules(docs)
+    entries, context = fake_students(catalog, docs, 1, rnd.randint(0, 40), seed + 2)[0]
+    base = tree.tally(entries) if entries else None
+
+    # 같은 과목을 여러 계획에/한 계획에 두 번, 이미 들은 과목, 평점이 다른 같은 과목
+    pool = rnd.sample(catalog, min(len(catalog), 25))
+    grades = [None, 2.5, 3.0, 3.5, 4.0, 4.5]
+    plans = [
+        [transcript_entry(c["course_code"], c, rnd.choice(grades)) for c in rnd.choices(pool, k=rnd.randint(0, 12))]
+        + [e for e in entries if rnd.random() < 0.05]
+        for _ in range(rnd.randint(1, 300))
+    ]
+
+    batched = tree.tally_many(plans, start=base)
+    assert len(batched) == len(plans)
+    for plan, tally in zip(plans, batched):
+        expected = tree.tally(plan, start=base)
+        assert tally.values == expected.values
+        assert tally.seen == expected.seen
+        assert tree.evaluate(tally, **context) == tree.evaluate(expected, **context)
@@ -0,0 +1,129 @@
+# backend/tests/test_graduation_simulate.py
+#
+# 졸업 what-if 시뮬레이션(POST /graduation/simulate): 계획 전체를 tally_many로 한 번에 더하고
+# 계획별 현황을 dict로 바로 직렬화한 응답이, 계획마다 tally → 응답 모델을 만든 것과 바이트까지 같은지.
+import asyncio
+import random
+
+from pydantic import TypeAdapter
+
+from database.course_lookup import course_resolver
+from database.requirement_cache import get_requirements, invalidate_requirements
+from routers.graduation import (
+    GraduationSimulateRequest,
+    GraduationSimulateResponse,
+    SimulatedPlanResult,
+    _build_status,
+    _evaluate,
+    _load_transcript,
+    _passed_items,
+    simulate_graduation,
+)
+from utils.graduation_rules import transcript_entry
+
+VERSION = "2021"
+STUDENT = {
+    "student_id": "20210001", "requirement_version": VERSION, "major_track": "빅데이터",
+    "certifications": {"required_count": 1},
+}
+REQUIREMENTS = [
+    {"requirement_id": "MAJOR", "category": "MAJOR", "required_credits": 30},
+    {"requirement_id": "GENERAL", "category": "GENERAL", "required_credits": 12},
+    {"requirement_id": "ELECTIVE", "category": "ELECTIVE", "required_credits": 6},
+    {"requirement_id": "TOTAL", "category": "TOTAL", "required_credits": 60},
+    {"requirement_id": "GPA", "category": "MIN_GPA", "required_gpa": 3.0},
+    {"requirement_id": "QR", "category": "QUAL_REQUIRED", "required_credits": 1},
+    {"requirement_id": "BASIC", "category": "전공기초", "courses": ["10000", "10001", "10002", "10003"], "min_courses": 2},
+    {"requirement_id": "TRACK", "category": "트랙필수", "major_track": "빅데이터", "courses": ["10004", "10005"]},
+    {"requirement_id": "CORE", "category": "핵심교양", "required_credits": 6},
+]
+CATEGORIES = ["MAJOR", "GENERAL", "ELECTIVE", "핵심교양"]
+
+
+def _seed(db, rnd: random.Random):
+    courses = [
+        {"course_code": str(10000 + i), "category": rnd.choice(CATEGORIES), "credits": rnd.choice([1, 2, 3])}
+        for i in range(40)
+    ]
+
+    async def go():
+        raw = db._db
+        await raw.students.insert_one(dict(STUDENT))
+        await raw.requirements.insert_many([{**r, "requirement_version": VERSION} for r in REQUIREMENTS])
+        await raw.courses.insert_many([dict(c) for c in courses])
+        await raw.enrollments.insert_many([
+            {"student_id": STUDENT["student_id"], "course_code": c["course_code"], "status": "COMPLETED",
+             "grade_point": rnd.choice([None, 2.5, 3.5, 4.5])}
+            for c in rnd.sample(courses, 12)
+        ])
+
+    asyncio.run(go())
+    return courses
+
+
+def _random_request(rnd: random.Random) -> GraduationSimulateRequest:
+    plans = []
+    for i in range(rnd.randint(50, 200)):
+        courses = [
+            {"course_code": str(10000 + rnd.randrange(45)), "grade_point": rnd.choice([None, 3.0, 4.0])}
+            for _ in range(rnd.randint(1, 8))
+        ]
+        if rnd.random() < 0.2:
+            courses.append({"course_code": "X999", "credits": 3, "category": "GENERAL"})
+        plans.append({"name": f"plan-{i}", "courses": courses})
+    return GraduationSimulateRequest.model_validate({"plans": plans})
+
+
+def _expected(db, payload: GraduationSimulateRequest, body: GraduationSimulateResponse) -> GraduationSimulateResponse:
+    """계획마다 tally(plan, start=현재) → 검증한 응답 모델 (tally_many 도입 전 방식)."""
+    async def go():
+        requirements = await get_requirements(db, VERSION)
+        resolver = course_resolver(db)
+        transcript = await _load_transcript(db, STUDENT["student_id"], requirements, resolver)
+        courses = await resolver.load_many({c.course_code for p in payload.plans for c in p.courses})
+        return requirements, transcript, courses
+
+    requirements, transcript, courses = asyncio.run(go())
+    rules = requirements.rules
+    base = rules.tally(transcript)
+    current = _evaluate(STUDENT, requirements, base)
+    plans = []
+    for plan, got in zip(payload.plans, body.plans):
+        skipped = set(got.already_completed) | set(got.not_found)
+        rows, seen = [], set()
+        for c in plan.courses:
+            if c.course_code in seen or c.course_code in skipped:
+                continue
+            seen.add(c.course_code)
+            course = courses.get(c.course_code) or {}
+            credits = c.credits if c.credits is not None else course["credits"]
+            rows.append(transcript_entry(
+                c.course_code, {**course, "credits": credits, "category": c.category or course["category"]}, c.grade_point,
+            ))
+        evaluation = _evaluate(STUDENT, requirements, rules.tally(rows, start=base))
+        now = _passed_items(current)
+        plans.append(SimulatedPlanResult(
+            name=plan.name,
+            status=_build_status(evaluation),
+            added_credits=sum(r.credits for r in rows),
+            newly_passed=[k for k, ok in _passed_items(evaluation).items() if ok and not now.get(k)],
+            already_completed=got.already_completed,
+            not_found=got.not_found,
+        ))
+    return GraduationSimulateResponse(current=_build_status(current), plans=plans)
+
+
+def test_simulate_matches_per_plan_models(db):
+    adapter = TypeAdapter(GraduationSimulateResponse)
+    _seed(db, random.Random(0))
+    for seed in range(3):
+        invalidate_requirements()
+        payload = _random_request(random.Random(seed))
+        response = asyncio.run(simulate_graduation(
+            payload, user={"student_id": STUDENT["student_id"]}, resolver=course_resolver(db),
+        ))
+
+        body = adapter.validate_json(response.body)   # 응답 모델 스키마에 맞는다
+        assert len(body.plans) == len(payload.plans)
+        assert any(p.not_found for p in body.plans) and any(p.already_completed for p in body.plans)
+        assert response.body == adapter.dump_json(_expected(db, payload, body))
@@ -0,0 +1,97 @@
+# backend/tests/test_graduation_status.py
+#
+# 졸업요건 현황(GET /graduation/status)의 DB 왕복 횟수가 이수 기록 수와 상관없이 고정인지.
+# (예전에는 수강 기록마다 db.courses.find_one을 따로 보냈다)
+import asyncio
+
+import pytest
+
+from database.course_lookup import course_resolver
+from database.requirement_cache import invalidate_requirements
+from routers.graduation import get_graduation_status
+
+VERSION = "2021"
+BASE_REQUIREMENTS = [
+    {"requirement_id": "MAJOR", "category": "MAJOR", "required_credits": 60},
+    {"requirement_id": "GENERAL", "category": "GENERAL", "required_credits": 30},
+    {"requirement_id": "ELECTIVE", "category": "ELECTIVE", "required_credits": 10},
+    {"requirement_id": "TOTAL", "category": "TOTAL", "required_credits": 130},
+    {"requirement_id": "GPA", "category": "MIN_GPA", "required_gpa": 2.0},
+]
+# 과목 단위 규칙이 있으면 이수 기록에 과목 정보를 붙여 평가한다
+COURSE_LIST_REQUIREMENT = {
+    "requirement_id": "BASIC", "category": "전공기초", "courses": ["10000", "10001", "10002"], "min_courses": 2,
+}
+
+
+def _seed(db, rows: int, requirements):
+    async def go():
+        raw = db._db
+        await raw.students.insert_one({"student_id": "20210001", "requirement_version": VERSION})
+        await raw.requirements.insert_many([{**r, "requirement_version": VERSION} for r in requirements])
+        await raw.courses.insert_many([
+            {"course_code": str(10000 + i), "category": ("MAJOR", "GENERAL", "ELECTIVE")[i % 3], "credits": 3}
+            for i in range(rows)
+        ])
+        await raw.enrollments.insert_many([
+            {"student_id": "20210001", "course_code": str(10000 + i), "status": "COMPLETED",
+             "grade_point": 4.0, "year": 2021 + i // 12, "semester": 1 + i % 2}
+            for i in range(rows)
+        ])
+
+    asyncio.run(go())
+
+
+def _status_round_trips(db):
+    async def go():
+        db.calls.clear()
+        status = await get_graduation_status(user={"student_id": "20210001"}, resolver=course_resolver(db))
+        return status, db.round_trips
+
+    invalidate_requirements()
+    return asyncio.run(go())
+
+
+@pytest.mark.parametrize("requirements", [BASE_REQUIREMENTS, BASE_REQUIREMENTS + [COURSE_LIST_REQUIREMENT]],
+                         ids=["category-totals", "course-rules"])
+def test_status_round_trips_do_not_grow_with_transcript(new_db, requirements):
+    counts = {}
+    for rows in (1, 45):
+        db = new_db()
+        _seed(db, rows, requirements)
+        status, trips = _status_round_trips(db)
+        assert status.total.acquired == rows * 3
+        counts[rows] = trips
+    assert counts[1] == counts[45]
+
+
+def test_status_reads_progress_document_without_course_rules(db):
+    _seed(db, 45, BASE_REQUIREMENTS)
+    _status_round_trips(db)   # 첫 조회가 student_progress 문서를 만든다
+    status, trips = _status_round_trips(db)
+
+    # 학생, 요건 카운터, 요건, 이수 합계 문서 한 번씩
+    assert dict(db.calls) == {
+        "students.find_one": 1,
+        "data_versions.find_one": 1,
+        "requirements.find": 1,
+        "student_progress.find_one": 1,
+    }
+    assert trips == 4
+    assert status.gpa.current == 4.0
+
+
+def test_status_reads_each_collection_once_with_course_rules(db):
+    _seed(db, 45, BASE_REQUIREMENTS + [COURSE_LIST_REQUIREMENT])
+    status, trips = _status_round_trips(db)
+
+    # 학생, 요건 카운터, 요건, COMPLETED 기록, 과목 $in 한 번씩
+    assert dict(db.calls) == {
+        "students.find_one": 1,
+        "data_versions.find_one": 1,
+        "requirements.find": 1,
+        "enrollments.find": 1,
+        "courses.find": 1,
+    }
+    assert trips == 5
+    assert next(r for r in status.rules if r.rule_id == "BASIC").is_passed
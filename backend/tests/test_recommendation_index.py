@@ -0,0 +1,68 @@
+# backend/tests/test_recommendation_index.py
+#
+# 추천 색인(routers.graduation)이 db.courses 버전 카운터("course_table")가 바뀔 때 다시 만들어지는지.
+import asyncio
+
+import pytest
+
+from database.connection import bump_data_version
+from database.course_lookup import course_table_changed
+from database.requirement_cache import invalidate_requirements
+from routers import graduation
+from routers.courses import CATALOG_VERSION_KEY
+
+USER = {"student_id": "20210001"}
+
+
+@pytest.fixture
+def seeded(db, monkeypatch):
+    monkeypatch.setattr(graduation, "RECOMMEND_INDEX_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(graduation, "_recommend_indexes", {})
+    monkeypatch.setattr(graduation, "_courses_version", None)
+    invalidate_requirements()
+
+    async def go():
+        raw = db._db
+        await raw.students.insert_one({"student_id": USER["student_id"], "requirement_version": "2021"})
+        await raw.requirements.insert_many([
+            {"requirement_id": "MAJOR", "requirement_version": "2021", "category": "MAJOR", "required_credits": 60},
+            {"requirement_id": "GENERAL", "requirement_version": "2021", "category": "GENERAL", "required_credits": 30},
+        ])
+        await raw.courses.insert_many([
+            {"course_code": "1001", "name": "자료구조", "category": "MAJOR", "sub_category": "전공필수", "credits": 3},
+            {"course_code": "2001", "name": "글쓰기", "category": "GENERAL", "sub_category": "핵심교양필수", "credits": 2},
+        ])
+
+    asyncio.run(go())
+    return db
+
+
+async def _credits(code: str) -> int:
+    response = await graduation.get_recommended_courses(limit=50, group=None, user=USER)
+    return next(c.credits for c in response.courses if c.course_code == code)
+
+
+def test_index_rebuilt_after_course_edit(seeded):
+    async def go():
+        assert await _credits("1001") == 3
+        await seeded._db.courses.update_one({"course_code": "1001"}, {"$set": {"credits": 4}})
+
+        # 카운터를 올리기 전에는 캐시된 색인, 과목 카탈로그 카운터는 db.courses와 상관없다
+        assert await _credits("1001") == 3
+        await bump_data_version(CATALOG_VERSION_KEY)
+        assert await _credits("1001") == 3
+
+        await course_table_changed()
+        assert await _credits("1001") == 4
+
+    asyncio.run(go())
+
+
+def test_index_reused_while_course_table_unchanged(seeded):
+    async def go():
+        await _credits("1001")
+        seeded.calls.clear()
+        await _credits("2001")
+        assert "courses.find" not in seeded.calls
+
+    asyncio.run(go())
@@ -0,0 +1,137 @@
+# backend/tests/test_student_progress.py
+#
+# 이수 합계 문서(database.student_progress)가 수강 기록 쓰기와 재구성이 겹쳐도 기록을 한 번만 세는지.
+import asyncio
+import time
+
+from database.course_lookup import course_resolver
+from database.student_progress import (
+    PENDING_WRITE_TIMEOUT_SECONDS,
+    PROGRESS_COLLECTION,
+    compute_student_progress,
+    load_student_progress,
+    parse_progress,
+    progress_increments,
+    progress_write,
+    rebuild_student_progress,
+)
+from routers import enrollments as enrollments_router
+
+STUDENT = "20210001"
+USER = {"student_id": STUDENT}
+
+
+class _RebuildAfterInsert:
+    """enrollments.insert_one이 끝난 직후(기여분을 더하기 전)에 재구성을 끼워 넣는 DB 래퍼."""
+
+    def __init__(self, db):
+        self._db = db
+        self.rebuilt = []
+
+    def __getattr__(self, name):
+        if name == "enrollments":
+            return _InsertHook(self._db.enrollments, self)
+        return getattr(self._db, name)
+
+    def __getitem__(self, name):
+        return self._db[name]
+
+
+class _InsertHook:
+    def __init__(self, collection, outer: _RebuildAfterInsert):
+        self._collection = collection
+        self._outer = outer
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def insert_one(self, doc):
+        res = await self._collection.insert_one(doc)
+        self._outer.rebuilt.append(await rebuild_student_progress(self._outer._db, doc["student_id"]))
+        return res
+
+
+def _seed(db):
+    async def go():
+        await db._db.courses.insert_many([
+            {"course_code": "1001", "name": "자료구조", "category": "MAJOR", "credits": 3},
+            {"course_code": "2001", "name": "글쓰기", "category": "GENERAL", "credits": 2},
+        ])
+        await db._db.enrollments.insert_one({
+            "student_id": STUDENT, "course_code": "2001", "status": "COMPLETED", "grade_point": 4.0,
+            "year": 2021, "semester": 1, "credits": 2,
+        })
+
+    asyncio.run(go())
+
+
+async def _stored_matches_fresh(db) -> bool:
+    stored = await db[PROGRESS_COLLECTION].find_one({"_id": STUDENT})
+    fresh = await compute_student_progress(db, STUDENT)
+    return not stored.get("partial") and parse_progress(stored) == parse_progress(fresh)
+
+
+def test_rebuild_between_enrollment_insert_and_increment(db, monkeypatch):
+    _seed(db)
+    hooked = _RebuildAfterInsert(db)
+    monkeypatch.setattr(enrollments_router, "get_db", lambda: hooked)
+
+    async def go():
+        await load_student_progress(db, STUDENT)   # 문서가 이미 있는 상태에서
+        payload = enrollments_router.EnrollmentCreate(
+            course_code="1001", year=2021, semester=2, status="COMPLETED", grade_point=3.0,
+        )
+        await enrollments_router.create_enrollment(payload, user=USER, resolver=course_resolver(db))
+
+        # 끼어든 재구성은 새 기록까지 센 값을 계산했지만 저장하지 않았고, 쓰기가 기여분을 한 번 더했다
+        assert hooked.rebuilt[0]["categories"]["MAJOR"]["credits"] == 3
+        assert await _stored_matches_fresh(db)
+        progress = await load_student_progress(db, STUDENT)
+        assert progress.categories["MAJOR"] == (3, 9.0, 3)
+        assert await _stored_matches_fresh(db)
+
+    asyncio.run(go())
+
+
+def test_write_outliving_stale_token_marks_partial(db):
+    _seed(db)
+
+    async def go():
+        await load_student_progress(db, STUDENT)
+        doc = {"student_id": STUDENT, "course_code": "1001", "status": "COMPLETED", "grade_point": 3.0,
+               "year": 2021, "semester": 2, "credits": 3,
+               "progress_course": {"category": "MAJOR", "credits": 3}}
+        async with progress_write(db, STUDENT) as write:
+            # 쓰던 프로세스가 멈춘 것처럼 토큰을 오래된 것으로 만들고 재구성이 먼저 저장하게 한다
+            await db._db[PROGRESS_COLLECTION].update_one(
+                {"_id": STUDENT}, {"$set": {"pending.0.at": time.time() - PENDING_WRITE_TIMEOUT_SECONDS - 1}},
+            )
+            await db.enrollments.insert_one(doc)
+            await rebuild_student_progress(db, STUDENT)
+            write.delta = progress_increments(doc, doc["progress_course"])
+
+        stored = await db[PROGRESS_COLLECTION].find_one({"_id": STUDENT})
+        assert stored["partial"] is True and not stored.get("pending")
+        assert (await load_student_progress(db, STUDENT)).categories["MAJOR"] == (3, 9.0, 3)
+        assert await _stored_matches_fresh(db)
+
+    asyncio.run(go())
+
+
+def test_failed_write_marks_partial(db):
+    _seed(db)
+
+    async def go():
+        await load_student_progress(db, STUDENT)
+        try:
+            async with progress_write(db, STUDENT):
+                raise RuntimeError("enrollment write failed")
+        except RuntimeError:
+            pass
+        stored = await db[PROGRESS_COLLECTION].find_one({"_id": STUDENT})
+        assert stored["partial"] is True and stored["pending"] == []
+        assert await _stored_matches_fresh(db) is False
+        await load_student_progress(db, STUDENT)
+        assert await _stored_matches_fresh(db)
+
+    asyncio.run(go())
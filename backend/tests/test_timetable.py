@@ -0,0 +1,66 @@
+# backend/tests/test_timetable.py
+#
+# 시간표 생성(POST /timetable/generate)이 분반 시간을 응답 문서가 아니라 원본 값의 마스크로 보는지.
+# (응답 투영에는 schedule/time 같은 원본 필드가 없어, 그 필드에만 시간이 있는 분반이 "시간 없음"으로 섞였다)
+import asyncio
+
+import pytest
+
+from database import connection, course_registry
+from routers import courses
+from routers.timetable import TimetableGenerateRequest, generate_timetables
+
+COLLECTION = "courses_2025"
+SECTIONS = [
+    # 시간이 schedule 배열에만 있는 분반 (월 09:00-10:30)
+    {"course_code": "A100", "course_name": "자료구조", "class": "01", "credits": 3,
+     "schedule": [{"day": "MON", "start": "09:00", "end": "10:30"}]},
+    # 같은 시간에 겹치는 분반
+    {"course_code": "B200", "course_name": "선형대수", "class": "01", "credits": 3, "timeslot": "월 09:30-11:00"},
+    # 시간 원본 필드가 모두 비어 있는 분반 (고정 시간 없음)
+    {"course_code": "C300", "course_name": "현장실습", "class": "01", "credits": 2},
+]
+
+
+@pytest.fixture
+def catalog_db(db, monkeypatch):
+    monkeypatch.setattr(connection, "COURSE_COLLECTIONS", [COLLECTION])
+    monkeypatch.setattr(course_registry, "_registry", None)
+    monkeypatch.setattr(courses, "_catalog", None)
+    asyncio.run(db._db[COLLECTION].insert_many([dict(s) for s in SECTIONS]))
+    return db
+
+
+def _generate(codes):
+    return asyncio.run(generate_timetables(TimetableGenerateRequest(course_codes=codes)))
+
+
+def _load_snapshot(monkeypatch):
+    monkeypatch.setattr(courses, "_catalog", asyncio.run(courses._load_catalog_snapshot(1)))
+
+
+@pytest.mark.parametrize("snapshot", [False, True], ids=["collections", "snapshot"])
+def test_schedule_only_section_does_not_overlap(catalog_db, monkeypatch, snapshot):
+    if snapshot:
+        _load_snapshot(monkeypatch)
+    result = _generate(["A100", "B200", "C300"])
+
+    assert result.unscheduled == [] and result.not_found == []
+    assert result.timetables
+    for table in result.timetables:
+        codes = {s.course_code for s in table.sections}
+        assert not {"A100", "B200"} <= codes
+    # 고정 시간이 없는 과목은 어느 쪽과도 함께 들어간다
+    assert {s.course_code for s in result.timetables[0].sections} in ({"A100", "C300"}, {"B200", "C300"})
+
+
+@pytest.mark.parametrize("snapshot", [False, True], ids=["collections", "snapshot"])
+def test_unparsable_source_field_is_unscheduled(catalog_db, monkeypatch, snapshot):
+    asyncio.run(catalog_db._db[COLLECTION].insert_one(
+        {"course_code": "D400", "course_name": "캡스톤", "class": "02", "credits": 3, "time": "추후 공지"},
+    ))
+    if snapshot:
+        _load_snapshot(monkeypatch)
+    result = _generate(["D400"])
+
+    assert result.unscheduled == ["D400/02"]
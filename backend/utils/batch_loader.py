@@ -0,0 +1,70 @@
+"""
+DataLoader 방식의 배치 로더.
+
+같은 이벤트 루프 틱 안에서 load()된 키들을 모아 batch_fn 한 번으로 조회하고,
+결과는 로더 인스턴스(보통 요청 하나)가 살아 있는 동안 메모해 둔다.
+
+    loader = BatchLoader(fetch_by_codes)
+    a, b = await asyncio.gather(loader.load("A1"), loader.load("B2"))  # batch_fn(["A1", "B2"]) 한 번
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]], max_batch_size: int = 500):
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._memo: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self.batches = 0  # batch_fn 호출 횟수 (디버깅/측정용)
+
+    async def load(self, key: K) -> Optional[V]:
+        """key의 값 (batch_fn 결과에 없으면 None)."""
+        future = self._memo.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._memo[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # 지금 실행 대기 중인 코루틴들이 load를 마칠 때까지 기다렸다가 한 번에 보낸다
+                loop.call_soon(self._dispatch)
+        # 기다리던 요청 하나가 취소돼도 공유 future는 취소되지 않게
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, Optional[V]]:
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(k) for k in keys))
+        return dict(zip(keys, values))
+
+    def prime(self, key: K, value: V) -> None:
+        """이미 알고 있는 값을 메모에 넣어 조회를 생략."""
+        if key not in self._memo:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._memo[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        for i in range(0, len(keys), self._max_batch_size):
+            asyncio.ensure_future(self._run(keys[i:i + self._max_batch_size]))
+
+    async def _run(self, keys: List[K]) -> None:
+        self.batches += 1
+        try:
+            results = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                # 실패한 키는 메모에서 빼서 다음 load 때 다시 시도
+                future = self._memo.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._memo[key]
+            if not future.done():
+                future.set_result(results.get(key))
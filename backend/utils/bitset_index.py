@@ -0,0 +1,118 @@
+"""
+열 단위 비트셋 색인 (행 위치 비트셋으로 필터/개수/패싯 계산).
+
+행 n개짜리 표에서 열 값마다 "그 값을 가진 행 위치" 비트셋(파이썬 정수)을 만들어 둔다.
+조건은 비트셋끼리 AND/OR 하고 개수는 bit_count()로 세므로, 행마다 dict를 보거나
+판정 함수를 부르지 않고 C 수준에서 64행씩 처리된다.
+
+- 값 열: 동등 비교. 배열 값은 원소마다 등록 (Mongo처럼 원소 중 하나만 같아도 일치)
+- 비트 열: 정수 비트마스크(강의 시간 등). 비트 위치마다 "그 비트가 켜진 행" 비트셋을 두고
+  bits_all_clear(mask) = 값이 있는 행 & ~(mask의 각 비트 행 비트셋 OR)
+
+    index = BitsetIndex(len(rows))
+    index.add_values("group", [r.get("group") for r in rows])
+    bits = index.eq("group", "전공") & index.eq("year", 2025)
+    total = bits.bit_count()
+"""
+import sys
+from array import array
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence
+
+
+def from_positions(positions: Sequence[int], size: int) -> int:
+    # 1 << pos 를 하나씩 OR하면 O(n²)이므로 바이트 배열에 찍고 한 번에 변환
+    buf = bytearray((size + 7) // 8)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_positions(bits: int, start: int = 0) -> Iterator[int]:
+    """
+    비트셋의 켜진 위치를 작은 것부터 (start 이상만).
+    큰 정수를 한 비트씩 시프트하면 위치마다 O(n)이므로 64비트 워드 배열로 한 번 바꿔서 훑는다.
+    """
+    if start:
+        bits >>= start
+    nbytes = (bits.bit_length() + 63) // 64 * 8
+    words = array("Q", bits.to_bytes(nbytes, "little"))
+    if sys.byteorder == "big":
+        words.byteswap()
+    for i, word in enumerate(words):
+        base = start + i * 64
+        while word:
+            low = word & -word
+            yield base + low.bit_length() - 1
+            word ^= low
+
+
+class BitsetIndex:
+    def __init__(self, size: int):
+        self.size = size
+        self.all = (1 << size) - 1
+        self._values: Dict[str, Dict[Hashable, int]] = {}
+        self._multi: Dict[str, int] = {}           # 배열 값을 가진 행 (패싯에서 제외)
+        self._bits: Dict[str, List[int]] = {}      # 비트 열: 비트 위치 → 행 비트셋
+        self._bits_present: Dict[str, int] = {}    # 비트 열 값(정수)이 있는 행
+
+    def has_values(self, field: str) -> bool:
+        return field in self._values
+
+    def has_bits(self, field: str) -> bool:
+        return field in self._bits
+
+    def add_values(self, field: str, values: Sequence[Any]) -> None:
+        positions: Dict[Hashable, List[int]] = {}
+        multi: List[int] = []
+        for pos, value in enumerate(values):
+            if isinstance(value, list):
+                multi.append(pos)
+                items = value
+            else:
+                items = [value]
+            for item in items:
+                try:
+                    positions.setdefault(item, []).append(pos)
+                except TypeError:
+                    pass  # dict 등 해시 불가 값은 동등 비교 대상에서 제외
+        self._values[field] = {v: from_positions(p, self.size) for v, p in positions.items()}
+        self._multi[field] = from_positions(multi, self.size)
+
+    def add_bits(self, field: str, values: Sequence[Optional[int]]) -> None:
+        per_bit: List[List[int]] = []
+        present: List[int] = []
+        for pos, value in enumerate(values):
+            if value is None:
+                continue
+            present.append(pos)
+            for bit in iter_positions(value):
+                while len(per_bit) <= bit:
+                    per_bit.append([])
+                per_bit[bit].append(pos)
+        self._bits[field] = [from_positions(p, self.size) for p in per_bit]
+        self._bits_present[field] = from_positions(present, self.size)
+
+    def eq(self, field: str, value: Any) -> int:
+        return self._values[field].get(value, 0)
+
+    def bits_all_clear(self, field: str, mask: int) -> int:
+        """mask의 비트가 하나도 켜져 있지 않은 (값이 있는) 행."""
+        per_bit = self._bits[field]
+        hit = 0
+        for pos in iter_positions(mask):
+            if pos >= len(per_bit):
+                break
+            hit |= per_bit[pos]
+        return self._bits_present[field] & ~hit
+
+    def count_by(self, field: str, bits: int) -> Dict[Any, int]:
+        """bits 안에서 값별 행 수 (None, 배열 값 제외. 0개인 값은 빠짐)."""
+        scalar = bits & ~self._multi[field]
+        counts: Dict[Any, int] = {}
+        for value, rows in self._values[field].items():
+            if value is None:
+                continue
+            n = (rows & scalar).bit_count()
+            if n:
+                counts[value] = n
+        return counts
@@ -0,0 +1,29 @@
+"""
+MongoDB $sort의 타입 간 비교 순서를 흉내 낸 정렬 키.
+
+null < 숫자 < 문자열 < ... < ObjectId < bool < 날짜. 같은 타입끼리는 값으로 비교한다
+(숫자는 수 크기로: 9 < 10). DB 커서 순서와 메모리 정렬/비교를 맞출 때 쓴다.
+
+    sorted(values, key=bson_order)
+    bson_order(9) < bson_order(10) < bson_order("10") < bson_order("9")
+"""
+from datetime import datetime
+from typing import Any, Tuple
+
+from bson import ObjectId
+
+
+def bson_order(value: Any) -> Tuple[int, Any]:
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (8, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, ObjectId):
+        return (7, value)
+    if isinstance(value, datetime):
+        return (9, value)
+    return (5, str(value))
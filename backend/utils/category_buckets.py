@@ -0,0 +1,66 @@
+"""
+과목/수강 카테고리 → 마이페이지 학점 요약 버킷 (전공필수/전공선택/핵심교양/균형교양) 매핑.
+
+원본 데이터의 카테고리 표기가 제각각(MAJOR, 전공-필수, 글쓰기(필수) 등)이라
+요약 버킷 하나로 모은다. 매핑에 없는 카테고리는 None.
+"""
+from typing import Optional
+
+SUMMARY_BUCKETS = [
+    ("MAJOR_REQUIRED", "전공필수"),
+    ("MAJOR_ELECTIVE", "전공선택"),
+    ("CORE_GENERAL", "핵심교양"),
+    ("BALANCE_GENERAL", "균형교양"),
+]
+SUMMARY_KEYS = [key for key, _ in SUMMARY_BUCKETS]
+SUMMARY_KEY_SET = set(SUMMARY_KEYS)
+
+CATEGORY_BUCKETS = {
+    "MAJOR": "MAJOR_REQUIRED",
+    "MAJOR_REQUIRED": "MAJOR_REQUIRED",
+    "MAJOR MANDATORY": "MAJOR_REQUIRED",
+    "전공필수": "MAJOR_REQUIRED",
+    "전공-필수": "MAJOR_REQUIRED",
+    "MAJOR_ELECTIVE": "MAJOR_ELECTIVE",
+    "MAJOR ELECTIVE": "MAJOR_ELECTIVE",
+    "전공선택": "MAJOR_ELECTIVE",
+    "전공": "MAJOR_ELECTIVE",
+    "GENERAL": "CORE_GENERAL",
+    "CORE_GENERAL": "CORE_GENERAL",
+    "LIBERAL": "CORE_GENERAL",
+    "기초교양": "CORE_GENERAL",
+    "핵심교양": "CORE_GENERAL",
+    "글쓰기": "CORE_GENERAL",
+    "글쓰기(필수)": "CORE_GENERAL",
+    "영어": "CORE_GENERAL",
+    "영어(필수)": "CORE_GENERAL",
+    "디지털리터러시": "CORE_GENERAL",
+    "BALANCE_GENERAL": "BALANCE_GENERAL",
+    "균형교양": "BALANCE_GENERAL",
+    "문학과문화": "BALANCE_GENERAL",
+    "역사와철학": "BALANCE_GENERAL",
+    "인간과사회": "BALANCE_GENERAL",
+    "생명과환경": "BALANCE_GENERAL",
+    "과학과기술": "BALANCE_GENERAL",
+    "예술과체육": "BALANCE_GENERAL",
+    "진로와개척": "BALANCE_GENERAL",
+    "융복합": "BALANCE_GENERAL",
+}
+
+
+def bucket_category(raw: Optional[str]) -> Optional[str]:
+    if not raw:
+        return None
+    normalized = raw.strip()
+    if not normalized:
+        return None
+    normalized_key = normalized.upper().replace(" ", "_")
+    if normalized_key in SUMMARY_KEY_SET:
+        return normalized_key
+    mapped = CATEGORY_BUCKETS.get(normalized) or CATEGORY_BUCKETS.get(normalized_key)
+    if not mapped:
+        return None
+    mapped_key = mapped.upper().replace(" ", "_")
+    if mapped_key in SUMMARY_KEY_SET:
+        return mapped_key
+    return None
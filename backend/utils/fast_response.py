@@ -0,0 +1,46 @@
+"""
+응답 직렬화 빠른 경로 (opt-in: FAST_RESPONSES=1).
+
+FastAPI는 엔드포인트가 돌려준 값을 response_model로 다시 검증한 뒤 직렬화한다.
+이미 모델로 만든(또는 한 번 검증해 JSON으로 만들어 둔) 데이터는 pydantic-core
+직렬화기(TypeAdapter.dump_json, Rust)로 바로 바이트를 만들어 Response로 돌려주면
+재검증과 직렬화를 건너뛴다. 데코레이터의 response_model은 그대로 두므로 OpenAPI 스키마는 같다.
+
+    adapter = TypeAdapter(List[EnrollmentPublic])
+    if FAST_RESPONSES_ENABLED:
+        return json_response(adapter.dump_json(items, by_alias=True), response)
+    return items
+"""
+import json
+import os
+from typing import Any, Iterable, Optional
+
+from fastapi import Response
+
+FAST_RESPONSES_ENABLED = os.getenv("FAST_RESPONSES", "0").lower() in ("1", "true", "yes")
+
+
+def json_response(content: bytes, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    JSON 바이트를 그대로 담은 응답. response(엔드포인트에 주입된 Response)에 설정한 헤더
+    (커서, ETag 등)를 옮겨 싣는다 — Response를 직접 돌려주면 FastAPI가 합쳐 주지 않는다.
+    """
+    out = Response(content=content, media_type="application/json", status_code=status_code)
+    if response is not None:
+        out.headers.raw.extend(response.headers.raw)
+    return out
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    """미리 인코딩한 원소 JSON들을 배열 하나로."""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def json_object(members: Iterable[tuple]) -> bytes:
+    """(키, 이미 인코딩한 값 JSON) 쌍들을 객체 하나로. 키 순서는 모델 필드 순서대로 넘길 것."""
+    return b"{" + b",".join(json.dumps(key, ensure_ascii=False).encode("utf-8") + b":" + value for key, value in members) + b"}"
+
+
+def dumps(value: Any) -> bytes:
+    """str/int/None 같은 단순 값용 (FastAPI 기본 출력과 같은 UTF-8 그대로)."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
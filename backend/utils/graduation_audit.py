@@ -0,0 +1,89 @@
+"""
+학과 전체 졸업 사정(일괄 감사)용 평가 워커. DB를 모르는 순수 함수라 프로세스 풀에서 돌린다.
+
+워커마다 init_worker로 requirement_version별 문서를 받아 규칙 트리(utils.graduation_rules)를
+한 번 컴파일해 두고, audit_chunk가 학생 묶음을 받아 보고서 행(dict)을 돌려준다.
+행에는 규칙마다 "<rule_id>_shortfall" (남은 학점/평점/횟수/과목 수, 충족이면 0)이 들어간다.
+
+    init_worker({"2021": docs_2021, "2022": docs_2022})
+    rows = audit_chunk([AuditInput("20211234", "2021", "빅데이터", {"required_count": 1}, entries)])
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from utils.graduation_rules import RuleTree, TranscriptEntry, compile_rules
+
+BASE_COLUMNS = (
+    "student_id", "requirement_version", "major_track", "is_passed",
+    "total_credits", "gpa", "failed_rules", "error",
+)
+
+
+class AuditInput(NamedTuple):
+    student_id: str
+    requirement_version: Optional[str]
+    major_track: Optional[str]
+    certifications: Dict[str, Any]
+    entries: List[TranscriptEntry]
+
+
+_trees: Dict[str, RuleTree] = {}
+
+
+def compile_versions(docs_by_version: Dict[str, List[Dict[str, Any]]]) -> Dict[str, RuleTree]:
+    return {version: compile_rules(docs) for version, docs in docs_by_version.items() if docs}
+
+
+def init_worker(docs_by_version: Dict[str, List[Dict[str, Any]]]) -> None:
+    """ProcessPoolExecutor initializer: 버전별 규칙 트리를 이 프로세스에 컴파일해 둔다."""
+    global _trees
+    _trees = compile_versions(docs_by_version)
+
+
+def shortfall_columns(trees: Iterable[RuleTree]) -> List[str]:
+    """모든 버전 규칙의 "<rule_id>_shortfall" 열 (처음 나온 순서)."""
+    columns: Dict[str, None] = {}
+    for tree in trees:
+        for rule in tree.rules:
+            for rule_id in _rule_ids(rule):
+                columns.setdefault(f"{rule_id}_shortfall", None)
+    return list(columns)
+
+
+def _rule_ids(rule) -> List[str]:
+    # 영역 규칙은 영역별 진행도도 따로 보고된다
+    return [c.rule_id for c in getattr(rule, "children", ())] + [rule.rule_id]
+
+
+def audit_row(tree: Optional[RuleTree], student: AuditInput) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "student_id": student.student_id,
+        "requirement_version": student.requirement_version or "",
+        "major_track": student.major_track or "",
+    }
+    if not student.requirement_version:
+        row.update(is_passed=False, error="requirement_version not set")
+        return row
+    if tree is None:
+        row.update(is_passed=False, error="no requirements for version")
+        return row
+
+    result = tree.evaluate(tree.tally(student.entries), student.major_track, student.certifications)
+    failed: List[str] = []
+    for r in result.rules.values():
+        shortfall = round(max(r.required - r.acquired, 0), 2)
+        row[f"{r.rule_id}_shortfall"] = shortfall
+        if not r.is_passed and r.kind != "AREA":   # 영역 하나 미달은 AREAS 규칙으로 판단
+            failed.append(f"{r.rule_id}({r.acquired:g}/{r.required:g})")
+    row.update(
+        is_passed=result.is_passed,
+        total_credits=result.rules["TOTAL"].acquired,
+        gpa=result.rules["GPA"].acquired,
+        failed_rules="; ".join(failed),
+        error="",
+    )
+    return row
+
+
+def audit_chunk(students: List[AuditInput]) -> List[Dict[str, Any]]:
+    """학생 묶음 → 보고서 행 (init_worker로 컴파일해 둔 트리 사용)."""
+    return [audit_row(_trees.get(s.requirement_version or ""), s) for s in students]
@@ -0,0 +1,435 @@
+"""
+졸업요건 규칙 엔진: requirement 문서들을 실행 가능한 규칙 트리로 컴파일하고, 학생 이수 내역을 한 번 훑어 평가.
+
+문서 하나가 규칙 하나가 된다.
+    category MAJOR/GENERAL/ELECTIVE + required_credits   → 카테고리 학점
+    category TOTAL                                       → 전체 학점 (문서가 없으면 세 카테고리 요구 학점 합)
+    category MIN_GPA + required_gpa                      → 평점
+    category QUAL_REQUIRED/QUAL_OPTIONAL                 → 자격인증 횟수 (학생 문서의 certifications)
+    courses + min_courses                                → "이 과목들 중 N개" (min_courses가 없으면 전부)
+    sub_areas {영역: 학점} (+ min_areas)                 → 영역별 최소 학점 (min_areas면 그 수만큼의 영역만 채우면 됨)
+    그 밖의 category + required_credits                   → 요약 버킷(전공필수/핵심교양 등, utils.category_buckets) 학점
+    major_track이 있는 문서                               → 그 트랙 학생에게만 적용
+
+컴파일하면 규칙이 읽는 값마다 누적 칸(slot)이 정해진다. 평가는
+    1) 이수 내역을 한 번 훑어 칸을 채우고 (과목코드/영역/버킷 조회는 그런 규칙이 있을 때만)
+    2) 트리를 따라 칸 값을 요구치와 비교한다.
+passes()는 싼 규칙부터 보고 처음 실패에서 멈추고, evaluate()는 규칙별 진행도를 모두 돌려준다.
+
+    tree = compile_rules(requirement_docs)
+    tally = tree.tally(transcript)                                   # 한 번 훑기
+    result = tree.evaluate(tally, track="빅데이터", certifications={"required_count": 2})
+    ok = tree.passes(tree.tally(plan_entries, start=tally), ...)     # 기존 합계에 과목만 더해 다시
+    plan_tallies = tree.tally_many([plan_a, plan_b], start=tally)     # 계획 여러 개를 한 표로
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from utils.category_buckets import bucket_category
+
+try:
+    import numpy as np
+except ImportError:   # 없으면 tally_many는 계획마다 희소 행을 더한다
+    np = None
+
+CORE_CATEGORIES = ("MAJOR", "GENERAL", "ELECTIVE")
+QUAL_COUNTS = {"QUAL_REQUIRED": "required_count", "QUAL_OPTIONAL": "optional_count"}
+
+# 고정 칸: 전체 학점, Σ평점×학점, 평점 계산 학점
+_TOTAL, _GPA_POINTS, _GPA_CREDITS = 0, 1, 2
+
+
+class TranscriptEntry(NamedTuple):
+    code: Optional[str]          # 없으면 카테고리 합계 한 줄 (totals_transcript)
+    category: str
+    sub_category: Optional[str]
+    credits: int
+    gpa_points: float            # 평점×학점 (평점 없는 과목은 0)
+    gpa_credits: int             # 평점 계산에 들어가는 학점
+
+
+class RuleProgress(NamedTuple):
+    rule_id: str
+    kind: str                    # CREDITS / TOTAL / GPA / QUAL / BUCKET / COURSES / AREA / AREAS
+    target: str                  # 카테고리·버킷·영역 이름 등
+    acquired: float
+    required: float
+    is_passed: bool
+    track: Optional[str] = None
+
+
+class Evaluation(NamedTuple):
+    is_passed: bool
+    rules: Dict[str, RuleProgress]   # rule_id → 진행도 (영역 규칙은 "id/영역"도 함께)
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def transcript_entry(code: str, course: Dict[str, Any], grade_point: Optional[float]) -> TranscriptEntry:
+    """과목 문서 + 받은 평점 → 이수 내역 한 줄 (student_progress categories와 같은 규칙)."""
+    credits = _as_int(course.get("credits"))
+    graded = grade_point is not None
+    return TranscriptEntry(
+        code,
+        course.get("category") or "OTHER",
+        course.get("sub_category"),
+        credits,
+        grade_point * credits if graded else 0.0,
+        credits if graded else 0,
+    )
+
+
+def totals_transcript(categories: Dict[str, Tuple[int, float, int]]) -> List[TranscriptEntry]:
+    """카테고리 → (학점, Σ평점×학점, 평점 계산 학점) 합계를 카테고리당 한 줄로 (과목 단위 규칙이 없을 때)."""
+    return [TranscriptEntry(None, cat, None, credits, points, gpa_credits)
+            for cat, (credits, points, gpa_credits) in categories.items()]
+
+
+class Tally:
+    """한 번 훑은 누적값. seen은 과목 목록 규칙에 이미 센 과목코드 (재수강 중복 방지)."""
+
+    __slots__ = ("values", "seen")
+
+    def __init__(self, values: List[float], seen: Set[str]):
+        self.values = values
+        self.seen = seen
+
+
+# --- 규칙 노드 ---
+
+class _Rule:
+    kind = ""
+    cost = 0     # passes()에서 싼 규칙부터 보도록
+
+    def __init__(self, rule_id: str, target: str, required: float, track: Optional[str] = None):
+        self.rule_id = rule_id
+        self.target = target
+        self.required = required
+        self.track = track
+
+    def acquired(self, values: List[float], certifications: Dict[str, Any]) -> float:
+        raise NotImplementedError
+
+    def check(self, values: List[float], certifications: Dict[str, Any]) -> bool:
+        return self.required <= 0 or self.acquired(values, certifications) >= self.required
+
+    def report(self, values: List[float], certifications: Dict[str, Any], out: Dict[str, RuleProgress]) -> bool:
+        acquired = self.acquired(values, certifications)
+        passed = self.required <= 0 or acquired >= self.required
+        out[self.rule_id] = RuleProgress(self.rule_id, self.kind, self.target, acquired, self.required, passed, self.track)
+        return passed
+
+
+class _SlotRule(_Rule):
+    def __init__(self, kind: str, slot: int, rule_id: str, target: str, required: float, track: Optional[str] = None):
+        super().__init__(rule_id, target, required, track)
+        self.kind = kind
+        self.slot = slot
+        self.cost = 1 if kind in ("COURSES", "AREA") else 0
+
+    def acquired(self, values, certifications):
+        return int(values[self.slot])
+
+
+class _GpaRule(_Rule):
+    kind = "GPA"
+
+    def acquired(self, values, certifications):
+        # 상태 응답처럼 반올림한 평점으로 비교
+        if values[_GPA_CREDITS] > 0:
+            return round(values[_GPA_POINTS] / values[_GPA_CREDITS], 2)
+        return 0.0
+
+
+class _QualRule(_Rule):
+    kind = "QUAL"
+
+    def __init__(self, count_key: str, rule_id: str, required: float, track: Optional[str] = None):
+        super().__init__(rule_id, rule_id, required, track)
+        self.count_key = count_key
+
+    def acquired(self, values, certifications):
+        return _as_int(certifications.get(self.count_key))
+
+
+class _AreasRule(_Rule):
+    """영역별 최소 학점. min_areas가 없으면 전 영역, 있으면 그 수만큼의 영역을 채우면 통과."""
+
+    kind = "AREAS"
+    cost = 2
+
+    def __init__(self, children: List[_SlotRule], min_areas: Optional[int], rule_id: str, target: str, track: Optional[str] = None):
+        needed = len(children) if min_areas is None else min(max(min_areas, 0), len(children))
+        super().__init__(rule_id, target, needed, track)
+        self.children = children
+
+    def acquired(self, values, certifications):
+        return sum(1 for c in self.children if c.check(values, certifications))
+
+    def check(self, values, certifications):
+        needed = self.required
+        if needed <= 0:
+            return True
+        left = len(self.children)
+        for c in self.children:
+            left -= 1
+            if c.check(values, certifications):
+                needed -= 1
+                if needed <= 0:
+                    return True
+            elif needed > left:
+                return False   # 남은 영역을 다 채워도 모자람
+        return False
+
+    def report(self, values, certifications, out):
+        passed_count = sum(1 for c in self.children if c.report(values, certifications, out))
+        passed = passed_count >= self.required
+        out[self.rule_id] = RuleProgress(self.rule_id, self.kind, self.target, passed_count, self.required, passed, self.track)
+        return passed
+
+
+# --- 컴파일 ---
+
+class RuleTree:
+    def __init__(self):
+        self._nslots = 3
+        self._category_slots: Dict[str, int] = {}
+        self._area_slots: Dict[str, int] = {}
+        self._bucket_slots: Dict[str, int] = {}
+        self._code_slots: Dict[str, List[int]] = {}
+        self._bucket_of: Dict[str, Optional[str]] = {}
+        self.rules: List[_Rule] = []          # 보고 순서 (문서 순, 기본 규칙 먼저)
+        self._checks: List[_Rule] = []        # passes() 순서 (싼 것부터)
+
+    @property
+    def needs_courses(self) -> bool:
+        """과목코드/세부 영역이 필요한 규칙이 있는지 (없으면 카테고리 합계만으로 평가할 수 있다)."""
+        return bool(self._code_slots or self._area_slots)
+
+    def _slot(self, table: Dict[str, int], key: str) -> int:
+        slot = table.get(key)
+        if slot is None:
+            slot = table[key] = self._nslots
+            self._nslots += 1
+        return slot
+
+    def _add(self, rule: _Rule) -> None:
+        self.rules.append(rule)
+
+    def _finish(self) -> "RuleTree":
+        self._checks = sorted(self.rules, key=lambda r: r.cost)   # sorted는 안정 정렬
+        return self
+
+    # --- 평가 ---
+
+    def tally(self, entries: Iterable[TranscriptEntry], start: Optional[Tally] = None) -> Tally:
+        """이수 내역을 한 번 훑어 칸을 채운다. start를 주면 그 누적값에 이어서 (start는 바꾸지 않음)."""
+        if start is None:
+            values, seen = [0.0] * self._nslots, set()
+        else:
+            values, seen = start.values.copy(), set(start.seen)
+        category_slots = self._category_slots
+        area_slots = self._area_slots
+        bucket_slots = self._bucket_slots
+        code_slots = self._code_slots
+        bucket_of = self._bucket_of
+        for e in entries:
+            credits = e.credits
+            values[_TOTAL] += credits
+            values[_GPA_POINTS] += e.gpa_points
+            values[_GPA_CREDITS] += e.gpa_credits
+            slot = category_slots.get(e.category)
+            if slot is not None:
+                values[slot] += credits
+            if area_slots:
+                slot = area_slots.get(e.category)
+                if slot is not None:
+                    values[slot] += credits
+                if e.sub_category and e.sub_category != e.category:
+                    slot = area_slots.get(e.sub_category)
+                    if slot is not None:
+                        values[slot] += credits
+            if bucket_slots:
+                if e.category in bucket_of:
+                    bucket = bucket_of[e.category]
+                else:
+                    bucket = bucket_of[e.category] = bucket_category(e.category)
+                if bucket is not None:
+                    slot = bucket_slots.get(bucket)
+                    if slot is not None:
+                        values[slot] += credits
+            if code_slots and e.code is not None:
+                slots = code_slots.get(e.code)
+                if slots and e.code not in seen:
+                    seen.add(e.code)
+                    for slot in slots:
+                        values[slot] += 1
+        return Tally(values, seen)
+
+    def tally_many(self, plans: Iterable[Iterable[TranscriptEntry]], start: Optional[Tally] = None) -> List[Tally]:
+        """
+        계획 여러 개를 한 번에: start 값 + (계획 × 과목 표) @ (과목 × 칸 표).
+          - 과목 × 칸: 서로 다른 이수 내역 줄마다 카테고리/영역/버킷/평점 칸 기여분 한 행,
+            과목 목록 규칙에 나오는 과목코드마다 그 칸들에 1씩 한 행
+          - 계획 × 과목: 계획마다 더할 행 번호 (과목코드 행은 start.seen에 없고 계획에서 처음 나올 때만)
+        NumPy가 있으면 두 표를 배열로 만들어 행렬 곱 한 번, 없으면 계획마다 희소 행을 더한다.
+        결과는 계획마다 tally(plan, start=start)와 같다 (NumPy 경로의 평점×학점 칸은 더하는 순서가 달라
+        마지막 자리가 다를 수 있다).
+        """
+        base_values = start.values if start is not None else [0.0] * self._nslots
+        base_seen = start.seen if start is not None else set()
+        code_slots = self._code_slots
+        contributions: List[List[Tuple[int, float]]] = []   # 과목 × 칸 표 (행마다 0이 아닌 (칸, 값))
+        code_rows: Dict[str, Optional[int]] = {}            # 과목코드 → 과목코드 행 (과목 목록 규칙에 없으면 None)
+        entry_rows: Dict[TranscriptEntry, Tuple[int, Optional[int]]] = {}   # 이수 내역 줄 → (기여분 행, 과목코드 행)
+        incidence: List[List[int]] = []                     # 계획 × 과목 표 (계획마다 더할 행 번호)
+        seen_sets: List[Set[str]] = []
+        for plan in plans:
+            picked: List[int] = []
+            seen = set(base_seen)
+            for e in plan:
+                rows = entry_rows.get(e)
+                if rows is None:
+                    row = len(contributions)
+                    delta = self.tally((e._replace(code=None),)).values
+                    contributions.append([(slot, v) for slot, v in enumerate(delta) if v])
+                    code_row = None
+                    if code_slots and e.code is not None:
+                        if e.code not in code_rows:
+                            slots = code_slots.get(e.code)
+                            code_rows[e.code] = len(contributions) if slots else None
+                            if slots:
+                                contributions.append([(slot, 1) for slot in slots])
+                        code_row = code_rows[e.code]
+                    rows = entry_rows[e] = (row, code_row)
+                picked.append(rows[0])
+                if rows[1] is not None and e.code not in seen:
+                    seen.add(e.code)
+                    picked.append(rows[1])
+            incidence.append(picked)
+            seen_sets.append(seen)
+
+        if np is not None and contributions:
+            matrix = np.zeros((len(contributions), self._nslots))
+            for row, contribution in enumerate(contributions):
+                for slot, v in contribution:
+                    matrix[row, slot] += v
+            cells = [p * len(contributions) + row for p, picked in enumerate(incidence) for row in picked]
+            counts = np.bincount(cells, minlength=len(incidence) * len(contributions))
+            table = (counts.reshape(len(incidence), len(contributions)) @ matrix + base_values).tolist()
+        else:
+            table = []
+            for picked in incidence:
+                values = base_values.copy()
+                for row in picked:
+                    for slot, v in contributions[row]:
+                        values[slot] += v
+                table.append(values)
+        return [Tally(values, seen) for values, seen in zip(table, seen_sets)]
+
+    def passes(self, tally: Tally, track: Optional[str] = None, certifications: Optional[Dict[str, Any]] = None) -> bool:
+        """모든 규칙 충족 여부. 처음 실패한 규칙에서 멈춘다."""
+        certifications = certifications or {}
+        values = tally.values
+        for rule in self._checks:
+            if rule.track is not None and rule.track != track:
+                continue
+            if not rule.check(values, certifications):
+                return False
+        return True
+
+    def evaluate(self, tally: Tally, track: Optional[str] = None, certifications: Optional[Dict[str, Any]] = None) -> Evaluation:
+        """규칙별 진행도 (다른 트랙 규칙은 빼고)."""
+        certifications = certifications or {}
+        values = tally.values
+        out: Dict[str, RuleProgress] = {}
+        passed = True
+        for rule in self.rules:
+            if rule.track is not None and rule.track != track:
+                continue
+            if not rule.report(values, certifications, out):
+                passed = False
+        return Evaluation(passed, out)
+
+
+def compile_rules(docs: Iterable[Dict[str, Any]]) -> RuleTree:
+    """한 requirement_version의 문서들 → 규칙 트리. 해석할 수 없는 문서(요구치 없음)는 건너뛴다."""
+    tree = RuleTree()
+    core: Dict[str, Dict[str, Any]] = {}
+    extra: List[Tuple[int, Dict[str, Any]]] = []
+    for i, doc in enumerate(docs):
+        cat = doc.get("category")
+        if (cat in CORE_CATEGORIES or cat in ("TOTAL", "MIN_GPA") or cat in QUAL_COUNTS) \
+                and not doc.get("major_track") and not doc.get("courses") and not doc.get("sub_areas"):
+            core[cat] = doc   # 같은 category가 여럿이면 마지막 것 (RequirementSet.docs와 같게)
+        else:
+            extra.append((i, doc))
+
+    # 기본 규칙: 문서가 없어도 항상 있다 (요구치 0 = 통과)
+    core_required = 0
+    for cat in CORE_CATEGORIES:
+        required = _as_int((core.get(cat) or {}).get("required_credits"))
+        core_required += required
+        tree._add(_SlotRule("CREDITS", tree._slot(tree._category_slots, cat), cat, cat, required))
+    total = _as_int(core["TOTAL"].get("required_credits")) if "TOTAL" in core else core_required
+    tree._add(_SlotRule("TOTAL", _TOTAL, "TOTAL", "TOTAL", total))
+    tree._add(_GpaRule("GPA", "GPA", float((core.get("MIN_GPA") or {}).get("required_gpa", 0.0) or 0.0)))
+    for cat, count_key in QUAL_COUNTS.items():
+        tree._add(_QualRule(count_key, cat, _as_int((core.get(cat) or {}).get("required_credits"))))
+
+    used_ids = {r.rule_id for r in tree.rules}
+    for i, doc in extra:
+        rule = _compile_doc(tree, doc, i, used_ids)
+        if rule is not None:
+            used_ids.add(rule.rule_id)
+            tree._add(rule)
+    return tree._finish()
+
+
+def _compile_doc(tree: RuleTree, doc: Dict[str, Any], index: int, used_ids: Set[str]) -> Optional[_Rule]:
+    cat = doc.get("category") or ""
+    track = doc.get("major_track") or None
+    rule_id = str(doc.get("requirement_id") or f"{cat or 'RULE'}#{index}")
+    if rule_id in used_ids:
+        rule_id = f"{rule_id}#{index}"
+
+    codes = doc.get("courses")
+    if codes:
+        codes = list(dict.fromkeys(str(c) for c in codes))
+        slot = tree._nslots
+        tree._nslots += 1
+        for code in codes:
+            tree._code_slots.setdefault(code, []).append(slot)
+        min_courses = doc.get("min_courses")
+        required = len(codes) if min_courses is None else min(_as_int(min_courses), len(codes))
+        return _SlotRule("COURSES", slot, rule_id, cat or rule_id, required, track)
+
+    areas = doc.get("sub_areas")
+    if isinstance(areas, dict) and areas:
+        children = [
+            _SlotRule("AREA", tree._slot(tree._area_slots, area), f"{rule_id}/{area}", area, _as_int(credits), track)
+            for area, credits in areas.items()
+        ]
+        min_areas = doc.get("min_areas")
+        return _AreasRule(children, None if min_areas is None else _as_int(min_areas), rule_id, cat or rule_id, track)
+
+    required = _as_int(doc.get("required_credits"))
+    if cat == "MIN_GPA":
+        return _GpaRule(rule_id, cat, float(doc.get("required_gpa", 0.0) or 0.0), track)
+    if cat in QUAL_COUNTS:
+        return _QualRule(QUAL_COUNTS[cat], rule_id, required, track)
+    if cat == "TOTAL":
+        return _SlotRule("TOTAL", _TOTAL, rule_id, cat, required, track)
+    if cat in CORE_CATEGORIES:
+        return _SlotRule("CREDITS", tree._slot(tree._category_slots, cat), rule_id, cat, required, track)
+    bucket = bucket_category(cat)
+    if bucket and required > 0:
+        return _SlotRule("BUCKET", tree._slot(tree._bucket_slots, bucket), rule_id, bucket, required, track)
+    if cat and required > 0:
+        # 버킷에 없는 카테고리는 과목 category 그대로
+        return _SlotRule("CREDITS", tree._slot(tree._category_slots, cat), rule_id, cat, required, track)
+    return None
@@ -0,0 +1,64 @@
+"""
+한글 음절 → 자모 분해 / 초성 추출.
+
+유니코드 한글 음절(가~힣)은 (초성 * 21 + 중성) * 28 + 종성 + 0xAC00 으로 계산되므로
+산술로 바로 분해한다. 겹모음/겹받침(ㅘ, ㄳ 등)은 키보드 입력 순서대로 풀어서
+자모 한 개를 잘못 친 경우가 편집 거리 1이 되도록 한다.
+"""
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 겹모음/겹받침 → 입력 순서 자모
+_COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+# 호환용 자음(ㄱ~ㅎ) — 초성 검색어 판별용
+_CONSONANTS = set(CHOSEONG) | set(JONGSEONG.strip())
+
+
+def _split(jamo: str) -> str:
+    return _COMPOUND.get(jamo, jamo)
+
+
+def decompose(text: str) -> str:
+    """'자료구조' → 'ㅈㅏㄹㅛㄱㅜㅈㅗ'. 한글 외 문자는 소문자로 그대로, 공백은 제거."""
+    out = []
+    for ch in text.lower():
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            idx = code - _SYLLABLE_BASE
+            cho, rest = divmod(idx, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            out.append(CHOSEONG[cho])
+            out.append(_split(JUNGSEONG[jung]))
+            if jong:
+                out.append(_split(JONGSEONG[jong]))
+        elif not ch.isspace():
+            out.append(_split(ch))
+    return "".join(out)
+
+
+def chosung(text: str) -> str:
+    """'자료 구조' → 'ㅈㄹㄱㅈ'. 한글 외 문자는 소문자로 그대로, 공백은 제거."""
+    out = []
+    for ch in text.lower():
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            out.append(CHOSEONG[(code - _SYLLABLE_BASE) // (21 * 28)])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung_query(text: str) -> bool:
+    """공백을 빼고 전부 자음(ㄱ~ㅎ)으로만 된 검색어인지."""
+    stripped = [ch for ch in text if not ch.isspace()]
+    return bool(stripped) and all(ch in _CONSONANTS for ch in stripped)
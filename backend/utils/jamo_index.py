@@ -0,0 +1,134 @@
+"""
+초성 접두 검색 + 자모 단위 오타 허용(편집 거리) 검색 색인.
+
+- 초성: 필드 값의 각 단어 시작 위치부터의 초성 문자열을 정렬 배열로 들고 있다가
+  이진 탐색으로 접두 범위를 찾는다. ('ㅈㄹㄱㅈ' → '자료구조', '고급 자료구조')
+- 오타 허용: 자모로 분해한 값의 2-gram 포스팅으로 후보를 거른 뒤(q-gram 개수 필터),
+  남은 후보만 근사 부분 문자열 편집 거리(Sellers)로 검증한다.
+  편집 k번 안에 들어오는 부분 문자열이 있으려면 질의어 2-gram 위치 중
+  최소 (m - 1) - 2k개가 값 안에 나타나야 하므로, 대부분의 값은 DP 없이 탈락한다.
+"""
+import bisect
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.hangul import chosung, decompose
+
+Q = 2
+
+
+def _bigrams(text: str) -> List[str]:
+    return [text[i:i + Q] for i in range(len(text) - Q + 1)]
+
+
+def substring_distance(pattern: str, text: str, limit: int) -> Optional[int]:
+    """text의 어떤 부분 문자열과 pattern 사이의 최소 편집 거리. limit를 넘으면 None."""
+    m = len(pattern)
+    prev = list(range(m + 1))
+    best = prev[m]
+    for ch in text:
+        cur = [0] * (m + 1)  # 부분 문자열은 text 어디서든 시작할 수 있음
+        for i in range(1, m + 1):
+            cost = 0 if pattern[i - 1] == ch else 1
+            cur[i] = min(prev[i] + 1, cur[i - 1] + 1, prev[i - 1] + cost)
+        best = min(best, cur[m])
+        if best == 0:
+            return 0
+        prev = cur
+    return best if best <= limit else None
+
+
+class JamoIndex:
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+        self._value_ids: Dict[Tuple[str, str], int] = {}
+        self._value_field: List[str] = []
+        self._value_jamo: List[str] = []
+        self._value_chosung: List[str] = []
+        self._value_docs: List[List[int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._chosung_keys: List[Tuple[str, int]] = []
+        self._keys_sorted = True
+
+    def add(self, doc_id: int, field: str, text: Optional[str]) -> None:
+        if field not in self.weights or not isinstance(text, str) or not text.strip():
+            return
+        key = (field, text.strip().lower())
+        vid = self._value_ids.get(key)
+        if vid is None:
+            vid = len(self._value_jamo)
+            self._value_ids[key] = vid
+            jamo = decompose(text)
+            self._value_field.append(field)
+            self._value_jamo.append(jamo)
+            self._value_chosung.append(chosung(text))
+            self._value_docs.append([])
+            for g in _bigrams(jamo):
+                self._postings.setdefault(g, set()).add(vid)
+            words = text.split()
+            for i in range(len(words)):
+                self._chosung_keys.append((chosung(" ".join(words[i:])), vid))
+            self._keys_sorted = False
+        self._value_docs[vid].append(doc_id)
+
+    def _scores(self, hits: Dict[int, float]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for vid, factor in hits.items():
+            weight = self.weights[self._value_field[vid]] * factor
+            for doc_id in self._value_docs[vid]:
+                if weight > scores.get(doc_id, 0.0):
+                    scores[doc_id] = weight
+        return scores
+
+    def search_chosung(self, query: str) -> Dict[int, float]:
+        """초성 접두 일치 문서별 점수(필드 가중치, 값 맨 앞에서 일치하면 우대)."""
+        if not self._keys_sorted:
+            self._chosung_keys.sort()
+            self._keys_sorted = True
+        prefix = chosung(query)
+        if not prefix:
+            return {}
+        keys = self._chosung_keys
+        lo = bisect.bisect_left(keys, (prefix,))
+        hits: Dict[int, float] = {}
+        for i in range(lo, len(keys)):
+            key, vid = keys[i]
+            if not key.startswith(prefix):
+                break
+            # 첫 단어부터 일치하면 1.0, 중간 단어부터면 0.5
+            factor = 1.0 if self._value_chosung[vid].startswith(prefix) else 0.5
+            hits[vid] = max(hits.get(vid, 0.0), factor)
+        return self._scores(hits)
+
+    def search_fuzzy(self, query: str, max_distance: Optional[int] = None) -> Dict[int, float]:
+        """
+        자모 편집 거리 max_distance 이내로 부분 일치하는 문서별 점수.
+        max_distance를 안 주면 질의어 자모 길이에 따라 1(10자모 미만) 또는 2.
+        """
+        pattern = decompose(query)
+        m = len(pattern)
+        if m == 0:
+            return {}
+        k = max_distance if max_distance is not None else (1 if m < 10 else 2)
+        grams = _bigrams(pattern)
+        need = len(grams) - Q * k
+
+        if need <= 0:
+            # 질의어가 너무 짧으면 q-gram 필터가 통하지 않으므로 정확 부분 일치만 허용
+            k, need = 0, len(grams)
+            if need <= 0:
+                candidates = [vid for vid, jamo in enumerate(self._value_jamo) if pattern in jamo]
+                return self._scores({vid: 1.0 for vid in candidates})
+
+        counts: Dict[int, int] = {}
+        for g in grams:
+            for vid in self._postings.get(g, ()):
+                counts[vid] = counts.get(vid, 0) + 1
+
+        hits: Dict[int, float] = {}
+        for vid, n in counts.items():
+            if n < need:
+                continue
+            dist = substring_distance(pattern, self._value_jamo[vid], k)
+            if dist is not None:
+                hits[vid] = 1.0 - dist / (k + 1)
+        return self._scores(hits)
@@ -0,0 +1,79 @@
+"""
+문자 n-gram(1~3글자) 역색인.
+
+Mongo $regex(비앵커, 대소문자 무시)는 인덱스를 못 타고, 텍스트 인덱스는 한글을
+토큰화하지 못한다. 여기서는 필드 값(중복 제거)마다 1/2/3-gram을 뽑아 두고,
+질의어의 n-gram 포스팅을 교집합한 뒤 실제 부분 문자열 포함 여부로 검증한다.
+결과는 $regex로 리터럴 질의어를 검색한 것과 같은 집합이다.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MAX_N = 3
+
+
+def _grams(text: str, n: int) -> Iterable[str]:
+    return (text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class NgramIndex:
+    def __init__(self, weights: Dict[str, float], exact_fields: Tuple[str, ...] = (), exact_boost: float = 1000.0):
+        self.weights = weights
+        self.exact_fields = exact_fields
+        self.exact_boost = exact_boost
+        self._value_ids: Dict[Tuple[str, str], int] = {}
+        self._value_field: List[str] = []
+        self._value_text: List[str] = []
+        self._value_docs: List[List[int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+
+    def add(self, doc_id: int, field: str, text: Optional[str]) -> None:
+        if field not in self.weights or not isinstance(text, str) or not text:
+            return
+        lowered = text.lower()
+        key = (field, lowered)
+        vid = self._value_ids.get(key)
+        if vid is None:
+            vid = len(self._value_text)
+            self._value_ids[key] = vid
+            self._value_field.append(field)
+            self._value_text.append(lowered)
+            self._value_docs.append([])
+            for n in range(1, MAX_N + 1):
+                for g in _grams(lowered, n):
+                    self._postings.setdefault(g, set()).add(vid)
+        self._value_docs[vid].append(doc_id)
+
+    def _matching_values(self, query: str) -> List[int]:
+        n = min(len(query), MAX_N)
+        postings = []
+        for g in set(_grams(query, n)):
+            p = self._postings.get(g)
+            if not p:
+                return []
+            postings.append(p)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates &= p
+            if not candidates:
+                return []
+        # n-gram 교집합은 후보일 뿐이므로 실제 포함 여부로 검증
+        return [vid for vid in candidates if query in self._value_text[vid]]
+
+    def search(self, query: str) -> Dict[int, float]:
+        """
+        질의어(리터럴)를 부분 문자열로 포함하는 문서별 점수.
+        점수는 일치한 필드들의 가중치 합이고, exact_fields 값과 완전히 같으면 exact_boost를 더한다.
+        """
+        query = query.lower()
+        if not query:
+            return {}
+        scores: Dict[int, float] = {}
+        for vid in self._matching_values(query):
+            field = self._value_field[vid]
+            weight = self.weights[field]
+            if field in self.exact_fields and self._value_text[vid] == query:
+                weight += self.exact_boost
+            for doc_id in self._value_docs[vid]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        return scores
@@ -0,0 +1,74 @@
+"""
+자동완성용 접두 색인 (정렬 배열 + 이진 탐색).
+
+키는 자모 분해 + 공백 제거한 문자열이라 입력 중인 음절도 그대로 접두가 된다
+('잘' → 'ㅈㅏㄹ' 은 '자료구조' 'ㅈㅏㄹㅛ...' 의 접두). 자음만 입력하면 초성 키로 찾는다.
+여러 단어로 된 값은 단어 시작마다 키를 둬서 중간 단어로도 찾을 수 있다.
+"""
+import bisect
+import heapq
+from typing import Dict, List, Tuple
+
+from utils.hangul import chosung, decompose, is_chosung_query
+
+# 범위가 이보다 크면(1~2글자 접두) 결과를 메모해 둔다
+_MEMO_THRESHOLD = 256
+_MEMO_MAX = 4096
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], int] = {}   # (kind, text) → entry id
+        self._text: List[str] = []
+        self._kind: List[str] = []
+        self._weight: List[int] = []
+        self._keys: List[Tuple[str, int]] = []
+        self._chosung_keys: List[Tuple[str, int]] = []
+        self._memo: Dict[Tuple[str, bool, int], List[int]] = {}
+
+    def add(self, kind: str, text: str, weight: int = 1) -> None:
+        """같은 (kind, text)를 여러 번 넣으면 가중치(예: 분반 수)가 누적된다."""
+        text = text.strip()
+        if not text:
+            return
+        eid = self._entries.get((kind, text))
+        if eid is None:
+            eid = len(self._text)
+            self._entries[(kind, text)] = eid
+            self._text.append(text)
+            self._kind.append(kind)
+            self._weight.append(0)
+            words = text.split()
+            for i in range(len(words)):
+                tail = " ".join(words[i:])
+                self._keys.append((decompose(tail), eid))
+                self._chosung_keys.append((chosung(tail), eid))
+        self._weight[eid] += weight
+
+    def freeze(self) -> "PrefixIndex":
+        self._keys.sort()
+        self._chosung_keys.sort()
+        self._memo.clear()
+        return self
+
+    def _rank(self, eid: int) -> Tuple[int, int, str]:
+        # 가중치 큰 순 → 짧은 순 → 가나다 순
+        return (-self._weight[eid], len(self._text[eid]), self._text[eid])
+
+    def complete(self, prefix: str, k: int = 10) -> List[Tuple[str, str, int]]:
+        """접두 일치 상위 k개 (kind, text, weight)."""
+        use_chosung = is_chosung_query(prefix)
+        key = chosung(prefix) if use_chosung else decompose(prefix)
+        if not key or k <= 0:
+            return []
+        memo_key = (key, use_chosung, k)
+        eids = self._memo.get(memo_key)
+        if eids is None:
+            keys = self._chosung_keys if use_chosung else self._keys
+            lo = bisect.bisect_left(keys, (key,))
+            hi = bisect.bisect_left(keys, (key + "\U0010ffff",), lo)
+            candidates = {eid for _, eid in keys[lo:hi]}
+            eids = heapq.nsmallest(k, candidates, key=self._rank)
+            if hi - lo > _MEMO_THRESHOLD and len(self._memo) < _MEMO_MAX:
+                self._memo[memo_key] = eids
+        return [(self._kind[e], self._text[e], self._weight[e]) for e in eids]
@@ -0,0 +1,116 @@
+"""
+졸업요건 기반 추천 후보 색인 (requirement_version마다 미리 만들어 두는 정렬된 후보 목록).
+
+추천 점수는 과목의 정적 속성(category, sub_category)과 학생 상태 두 가지
+(전공 학점이 남았는지, 교양 학점이 남았는지)로만 정해진다. 그래서 상태 4가지마다 점수를
+미리 매겨 MUST/HIGH/EXPLORE 버킷별로 점수 순 정렬해 두면, 요청마다 할 일은
+이미 들은 과목을 건너뛰며 앞에서부터 limit개를 꺼내는 것뿐이다 (전체 정렬 없음).
+
+    index = RecommendationIndex(course_docs, major_required=60, general_required=30)
+    picks = index.top(major_open=True, general_open=False, taken={"1001"}, limit=20)
+"""
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+GROUPS = ("MUST", "HIGH", "EXPLORE")
+# 응답에 싣는 과목 필드 (db.courses에서 이것만 읽는다)
+COURSE_FIELDS = ("course_code", "name", "professor", "category", "sub_category", "credits", "schedule")
+
+State = Tuple[bool, bool]  # (전공 학점이 남았는지, 교양 학점이 남았는지)
+_STATES: Tuple[State, ...] = ((True, True), (True, False), (False, True), (False, False))
+
+
+class Candidate(NamedTuple):
+    code: str
+    score: float
+    group: str
+    course: Dict[str, Any]   # COURSE_FIELDS (credits는 int로, course_code는 str로)
+
+
+def course_score(category: str, sub_category: str, major_open: bool, general_open: bool) -> float:
+    score = 0.0
+    # 전공필수/핵심교양필수 등 "Must" 후보
+    if sub_category == "전공필수" and major_open:
+        score += 4.0
+    if sub_category == "핵심교양필수" and general_open:
+        score += 3.5
+    # 전공/교양 부족분에 따른 가점, 이미 충분히 채웠으면 감점
+    if category == "MAJOR":
+        score += 2.0 if major_open else -1.5
+    if category == "GENERAL":
+        score += 1.5 if general_open else -1.0
+    return score
+
+
+def score_group(score: float) -> str:
+    if score >= 5.0:
+        return "MUST"
+    if score >= 3.0:
+        return "HIGH"
+    return "EXPLORE"
+
+
+def _course_fields(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    code = doc.get("course_code")
+    if code is None or code == "":
+        return None
+    try:
+        credits = int(doc.get("credits") or 0)
+    except (TypeError, ValueError):
+        credits = 0
+    return {
+        "course_code": str(code),
+        "name": doc.get("name") or "",
+        "professor": doc.get("professor"),
+        "category": doc.get("category") or "",
+        "sub_category": doc.get("sub_category") or "",
+        "credits": credits,
+        "schedule": doc.get("schedule"),
+    }
+
+
+class RecommendationIndex:
+    def __init__(self, courses: Iterable[Dict[str, Any]], major_required: int, general_required: int):
+        self.major_required = major_required
+        self.general_required = general_required
+        fields = [f for f in (_course_fields(d) for d in courses) if f is not None]
+        self.size = len(fields)
+        # 상태 → 그룹 → 점수 내림차순 후보 (같은 점수는 db.courses 순서 그대로)
+        self._buckets: Dict[State, Dict[str, List[Candidate]]] = {}
+        for state in _STATES:
+            buckets: Dict[str, List[Candidate]] = {g: [] for g in GROUPS}
+            for course in fields:
+                score = course_score(course["category"], course["sub_category"], *state)
+                # 점수가 너무 낮으면 추천에서 제외
+                if score <= 0:
+                    continue
+                group = score_group(score)
+                buckets[group].append(Candidate(course["course_code"], round(score, 2), group, course))
+            for items in buckets.values():
+                items.sort(key=lambda c: -c.score)
+            self._buckets[state] = buckets
+
+    def _ordered(self, state: State, group: Optional[str]) -> Iterator[Candidate]:
+        buckets = self._buckets[state]
+        # MUST(≥5) > HIGH(≥3) > EXPLORE 이므로 버킷을 이어 붙이면 전체가 점수 순
+        for g in ((group,) if group else GROUPS):
+            yield from buckets[g]
+
+    def top(
+        self,
+        major_open: bool,
+        general_open: bool,
+        taken: Set[str],
+        limit: int,
+        group: Optional[str] = None,
+    ) -> List[Candidate]:
+        """점수 상위 limit개 (이미 들은 과목 제외). 읽는 후보 수는 limit + 건너뛴 과목 수."""
+        out: List[Candidate] = []
+        if limit <= 0:
+            return out
+        for c in self._ordered((major_open, general_open), group):
+            if c.code in taken:
+                continue
+            out.append(c)
+            if len(out) >= limit:
+                break
+        return out
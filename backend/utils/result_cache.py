@@ -0,0 +1,108 @@
+"""
+조회 결과 캐시 (LRU + TTL + singleflight).
+
+같은 키를 동시에 요청하면 첫 요청만 loader를 실행하고 나머지는 그 결과를 기다린다.
+loader는 별도 태스크로 돌리므로 첫 요청이 끊겨도 기다리던 요청들은 결과를 받는다.
+invalidate() 이전에 시작된 로드 결과는 저장하지 않는다(세대 번호로 구분).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ResultCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0   # 진행 중인 로드를 기다린 요청 수
+        self.evictions = 0   # 크기 초과로 밀려난 항목 수
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """캐시에 있으면 바로, 없으면 loader 결과를 (cacheable이면) 저장하고 반환."""
+        if not self.enabled:
+            return await loader()
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        generation = self._generation
+        future = asyncio.ensure_future(loader())
+        self._inflight[key] = future
+
+        def _done(f: asyncio.Future) -> None:
+            if self._inflight.get(key) is f:
+                del self._inflight[key]
+            if f.cancelled() or f.exception() is not None:
+                return
+            result = f.result()
+            if generation == self._generation and (cacheable is None or cacheable(result)):
+                self.put(key, result)
+
+        future.add_done_callback(_done)
+        return await asyncio.shield(future)
+
+    def invalidate(self) -> None:
+        """데이터가 바뀌었을 때: 모든 항목을 버리고 진행 중인 로드 결과도 저장하지 않게 한다."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,140 @@
+"""
+강의 시간(timeslot) 문자열 → 주간 비트마스크.
+
+월~금 × 08:00~22:00을 30분 칸으로 나눈 140칸을 정수 하나의 비트로 표현한다
+(비트 위치 = 요일 * SLOTS_PER_DAY + 칸). 두 과목이 겹치는지는 a & b != 0,
+과목이 내 빈 시간 안에 들어가는지는 course & ~free == 0 으로 바로 판정된다.
+
+받는 형식 (여러 요일은 공백, '/', ';' 로 구분, 괄호 안 강의실 표기는 무시):
+    월1,2,3 / 화 3-4 / 수1,2교시     교시: n교시 = (8+n)시부터 1시간 (1교시 = 9시)
+    월 09:00-10:30 / 목10:30~12:00   시각 범위
+    월수 3,4                         요일을 붙여 쓰면 같은 시간
+대시보드 schedule 배열([{"day": "MON", "start": "09:00", "end": "10:30"}, ...])도 받는다.
+"""
+import re
+from typing import Any, List, Optional
+
+DAYS = "월화수목금"
+DAY_START_MINUTES = 8 * 60
+DAY_END_MINUTES = 22 * 60
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = (DAY_END_MINUTES - DAY_START_MINUTES) // SLOT_MINUTES
+SLOT_COUNT = len(DAYS) * SLOTS_PER_DAY
+FULL_MASK = (1 << SLOT_COUNT) - 1
+# BSON BinData로 저장할 때의 바이트 수 (리틀 엔디언: 비트 위치가 Mongo $bitsAllClear와 같음)
+MASK_BYTES = (SLOT_COUNT + 7) // 8
+
+_DAY_INDEX = {
+    "월": 0, "화": 1, "수": 2, "목": 3, "금": 4,
+    "MON": 0, "TUE": 1, "WED": 2, "THU": 3, "FRI": 4,
+}
+_DAY_RE = re.compile(r"MON|TUE|WED|THU|FRI|SAT|SUN|[월화수목금토일]", re.IGNORECASE)
+_NOISE_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]|요일|교시")
+_RANGE_RE = re.compile(r"(\d{1,2}):(\d{2})\s*[-~]\s*(\d{1,2}):(\d{2})")
+_PERIOD_RE = re.compile(r"(\d{1,2})(?:\s*[-~]\s*(\d{1,2}))?")
+_SEPARATORS = set(" \t,/;·")
+
+
+def slot_bits(day: int, start: int, end: int) -> int:
+    """day 요일의 [start, end) 분 구간이 걸치는 칸들의 비트."""
+    if not (0 <= day < len(DAYS)):
+        raise ValueError(f"day out of range: {day}")
+    if not (DAY_START_MINUTES <= start < end <= DAY_END_MINUTES):
+        raise ValueError(f"time out of range: {start}-{end}")
+    first = (start - DAY_START_MINUTES) // SLOT_MINUTES
+    last = -(-(end - DAY_START_MINUTES) // SLOT_MINUTES)  # 올림
+    return ((1 << (last - first)) - 1) << (day * SLOTS_PER_DAY + first)
+
+
+def _period_minutes(period: int) -> int:
+    return (8 + period) * 60
+
+
+def _spec_ranges(spec: str) -> List[tuple]:
+    """요일 뒤의 시간 부분 → [(시작 분, 끝 분), ...]"""
+    ranges = []
+    rest = spec
+    for m in _RANGE_RE.finditer(spec):
+        h1, m1, h2, m2 = (int(g) for g in m.groups())
+        ranges.append((h1 * 60 + m1, h2 * 60 + m2))
+        rest = rest.replace(m.group(0), " ", 1)
+    if not ranges:
+        rest = spec
+        for m in _PERIOD_RE.finditer(spec):
+            first = int(m.group(1))
+            last = int(m.group(2)) if m.group(2) else first
+            if first < 1 or last < first:
+                raise ValueError(f"invalid period: {m.group(0)}")
+            ranges.append((_period_minutes(first), _period_minutes(last) + 60))
+            rest = rest.replace(m.group(0), " ", 1)
+    if any(ch not in _SEPARATORS for ch in rest):
+        raise ValueError(f"unrecognized time: {spec.strip()}")
+    return ranges
+
+
+def parse_timeslot(text: str) -> int:
+    """timeslot 문자열 → 비트마스크. 형식을 모르거나 주말/범위 밖 시간이면 ValueError."""
+    text = _NOISE_RE.sub(" ", text)
+    days = list(_DAY_RE.finditer(text))
+    if not days or text[:days[0].start()].strip(" \t,/;·"):
+        raise ValueError(f"unrecognized timeslot: {text.strip()}")
+
+    mask = 0
+    pending: List[int] = []  # 시간이 아직 안 나온 요일 ('월수 3,4'의 '월')
+    for i, m in enumerate(days):
+        day = _DAY_INDEX.get(m.group(0).upper())
+        if day is None:
+            raise ValueError(f"weekend slot not supported: {m.group(0)}")
+        end = days[i + 1].start() if i + 1 < len(days) else len(text)
+        spec = text[m.end():end]
+        pending.append(day)
+        ranges = _spec_ranges(spec)
+        if not ranges:
+            continue
+        for d in pending:
+            for start, stop in ranges:
+                mask |= slot_bits(d, start, stop)
+        pending = []
+    if pending:
+        raise ValueError(f"missing time for day: {text.strip()}")
+    return mask
+
+
+def _clock_minutes(value: str) -> int:
+    hour, _, minute = value.strip().partition(":")
+    return int(hour) * 60 + int(minute or 0)
+
+
+def schedule_mask(schedule: List[Any]) -> int:
+    """[{"day": "MON", "start": "09:00", "end": "10:30"}, ...] → 비트마스크."""
+    mask = 0
+    for item in schedule:
+        if not isinstance(item, dict):
+            raise ValueError("schedule item must be an object")
+        day = _DAY_INDEX.get(str(item.get("day", "")).strip().upper())
+        if day is None:
+            raise ValueError(f"unsupported day: {item.get('day')}")
+        mask |= slot_bits(day, _clock_minutes(str(item.get("start", ""))), _clock_minutes(str(item.get("end", ""))))
+    return mask
+
+
+def timeslot_mask(value: Any) -> Optional[int]:
+    """문자열/schedule 배열 → 비트마스크. 비었거나 해석할 수 없으면 None (시간 필터에서 제외)."""
+    try:
+        if isinstance(value, str) and value.strip():
+            mask = parse_timeslot(value)
+        elif isinstance(value, list) and value:
+            mask = schedule_mask(value)
+        else:
+            return None
+    except ValueError:
+        return None
+    return mask or None
+
+
+def mask_to_bytes(mask: int) -> bytes:
+    return mask.to_bytes(MASK_BYTES, "little")
+
+
+def mask_from_bytes(data: bytes) -> int:
+    return int.from_bytes(data, "little")
@@ -0,0 +1,183 @@
+"""
+충돌 없는 시간표 조합 탐색 (비트마스크 백트래킹 + 가지치기 + 시간 예산).
+
+과목마다 분반 하나를 고르거나(필수가 아니면) 빼면서 깊이 우선으로 내려간다.
+분반 시간은 utils.timeslot 주간 비트마스크라 충돌 검사는 AND 한 번이다.
+
+- 같은 시간/학점의 분반은 하나의 선택지로 묶는다 (결과에는 대안 분반으로 함께 표시)
+- 선택지가 적은 과목부터 본다 (필수 과목 우선)
+- 남은 과목을 다 넣었다고 쳐도 (학점, 과목 수, -지금까지 등교 요일 수) 상한이
+  상위 N개의 최저 점수를 넘지 못하면 가지를 자른다 (요일은 과목을 더할수록 늘기만 함)
+- 아직 못 넣은 필수 과목이 현재 시간표와 모두 겹치면 가지를 자른다
+- 시간 예산을 넘기면 그때까지 찾은 상위 N개를 돌려준다 (complete=False)
+
+점수는 (총 학점, 과목 수, -등교 요일 수, -공강 칸 수) 순으로 큰 것이 좋다.
+"""
+import heapq
+import itertools
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.timeslot import DAYS, SLOTS_PER_DAY
+
+_DAY_BITS = (1 << SLOTS_PER_DAY) - 1
+# 시간 예산 확인 주기 (방문 노드 수)
+_CLOCK_EVERY = 1024
+
+
+class Section(NamedTuple):
+    key: str        # 분반 식별자 (응답에서 그대로 돌려줌)
+    mask: int       # 주간 비트마스크 (시간 없는 과목은 0)
+    credits: int
+
+
+class CourseOptions(NamedTuple):
+    code: str
+    sections: List[Section]
+    required: bool = False
+
+
+class Schedule(NamedTuple):
+    score: Tuple[int, int, int, int]
+    # (과목코드, 고른 분반, 같은 시간/학점의 대안 분반들)
+    picks: List[Tuple[str, Section, List[Section]]]
+    mask: int
+    credits: int
+
+
+class SearchResult(NamedTuple):
+    schedules: List[Schedule]
+    complete: bool     # 시간 예산 안에 탐색을 끝냈는지
+    visited: int       # 방문한 노드 수
+    elapsed_ms: float
+
+
+_DAY_MASKS = [_DAY_BITS << (d * SLOTS_PER_DAY) for d in range(len(DAYS))]
+
+
+def day_mask(day: int) -> int:
+    return _DAY_MASKS[day]
+
+
+def _days_used(mask: int) -> int:
+    return sum(1 for m in _DAY_MASKS if mask & m)
+
+
+def _day_stats(mask: int) -> Tuple[int, int]:
+    """(등교 요일 수, 첫 수업~마지막 수업 사이 빈 칸 수 합)"""
+    days = gaps = 0
+    for day in range(len(DAYS)):
+        bits = (mask >> (day * SLOTS_PER_DAY)) & _DAY_BITS
+        if not bits:
+            continue
+        days += 1
+        span = bits.bit_length() - ((bits & -bits).bit_length() - 1)
+        gaps += span - bin(bits).count("1")
+    return days, gaps
+
+
+def _group_sections(sections: Sequence[Section], blocked: int, max_credits: Optional[int]) -> List[List[Section]]:
+    """막힌 칸과 겹치거나 학점 상한을 넘는 분반을 빼고, 같은 (시간, 학점)끼리 묶는다."""
+    groups: Dict[Tuple[int, int], List[Section]] = {}
+    for s in sections:
+        if s.mask & blocked or (max_credits is not None and s.credits > max_credits):
+            continue
+        groups.setdefault((s.mask, s.credits), []).append(s)
+    return list(groups.values())
+
+
+def search_timetables(
+    courses: Sequence[CourseOptions],
+    blocked: int = 0,
+    max_credits: Optional[int] = None,
+    top_n: int = 10,
+    budget_ms: float = 1500,
+) -> SearchResult:
+    """
+    courses의 분반 조합 중 서로 겹치지 않고 blocked 칸을 피하는 시간표 상위 top_n개.
+    필수 과목을 넣을 분반이 하나도 없으면 빈 결과 (complete=True).
+    """
+    started = time.monotonic()
+    deadline = started + budget_ms / 1000 if budget_ms > 0 else None
+
+    options = [(c, _group_sections(c.sections, blocked, max_credits)) for c in courses]
+    options = [(c, g) for c, g in options if g or c.required]
+    if any(c.required and not g for c, g in options):
+        return SearchResult([], True, 0, 0.0)
+    # 필수 과목 먼저, 그다음 선택지가 적은 과목부터
+    options.sort(key=lambda t: (not t[0].required, len(t[1])))
+    n = len(options)
+    # 분반 그룹은 학점 큰 것부터 시도 (좋은 해를 빨리 찾아 가지치기가 일찍 먹히도록)
+    for _, groups in options:
+        groups.sort(key=lambda g: -g[0].credits)
+    # suffix_credits[i] = i번째 이후 과목들을 다 넣었을 때 더할 수 있는 최대 학점
+    # suffix_min_credits[i] = i번째 이후 과목 분반의 최소 학점 (학점 상한으로 넣을 수 있는 과목 수 상한용)
+    suffix_credits = [0] * (n + 1)
+    suffix_min_credits = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_credits[i] = suffix_credits[i + 1] + max(g[0].credits for g in options[i][1])
+        least = min(g[0].credits for g in options[i][1])
+        suffix_min_credits[i] = least if i == n - 1 else min(least, suffix_min_credits[i + 1])
+    required_after = [[j for j in range(i, n) if options[j][0].required] for i in range(n + 1)]
+
+    heap: List[Tuple[Tuple[int, int, int, int], int, Schedule]] = []  # 최소 힙 (최악이 맨 앞)
+    counter = itertools.count()
+    chosen: List[Tuple[str, List[Section]]] = []
+    visited = 0
+    timed_out = False
+
+    def record(mask: int, credits: int) -> None:
+        if not chosen:
+            return
+        days, gaps = _day_stats(mask)
+        score = (credits, len(chosen), -days, -gaps)
+        if len(heap) >= top_n and score <= heap[0][0]:
+            return
+        picks = [(code, group[0], group[1:]) for code, group in chosen]
+        entry = (score, next(counter), Schedule(score, picks, mask, credits))
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heapreplace(heap, entry)
+
+    def dfs(i: int, mask: int, credits: int) -> None:
+        nonlocal visited, timed_out
+        visited += 1
+        if visited % _CLOCK_EVERY == 0 and deadline is not None and time.monotonic() > deadline:
+            timed_out = True
+        if timed_out:
+            return
+        if len(heap) >= top_n:
+            bound_credits = credits + suffix_credits[i]
+            bound_count = len(chosen) + n - i
+            if max_credits is not None:
+                bound_credits = min(bound_credits, max_credits)
+                if i < n and suffix_min_credits[i] > 0:
+                    bound_count = min(bound_count, len(chosen) + (max_credits - credits) // suffix_min_credits[i])
+            # record()는 최저 점수보다 큰 것만 받으므로 같아도 자른다
+            if (bound_credits, bound_count, -_days_used(mask), 0) <= heap[0][0]:
+                return
+        # 남은 필수 과목 중 현재 시간표에 넣을 수 있는 분반이 없는 게 있으면 중단
+        for j in required_after[i]:
+            if not any(not (g[0].mask & mask) for g in options[j][1]):
+                return
+        if i == n:
+            record(mask, credits)
+            return
+
+        course, groups = options[i]
+        for group in groups:
+            s = group[0]
+            if s.mask & mask or (max_credits is not None and credits + s.credits > max_credits):
+                continue
+            chosen.append((course.code, group))
+            dfs(i + 1, mask | s.mask, credits + s.credits)
+            chosen.pop()
+            if timed_out:
+                return
+        if not course.required:
+            dfs(i + 1, mask, credits)
+
+    dfs(0, 0, 0)
+    schedules = [entry[2] for entry in sorted(heap, key=lambda e: (e[0], -e[1]), reverse=True)]
+    return SearchResult(schedules, not timed_out, visited, round((time.monotonic() - started) * 1000, 1))
@@ -1,4 +1,4 @@
-import { request } from './client';
+import { request, buildUrl } from './client';
 
 // 강의 출력 자료형태
 export type CourseOut = {
@@ -30,6 +30,16 @@ export type ListCoursesParams = {
   limit?: number;
   skip?: number;
   collection?: string;
+  cursor?: string;
+  mode?: 'auto' | 'substring' | 'chosung' | 'fuzzy'; // 초성/오타 허용 검색
+  free_slots?: string; // 이 시간 안에 들어가는 과목만 (예: '월1,2,3/수09:00-12:00')
+  exclude_conflicts_with?: string; // 내 시간표와 겹치는 과목 제외 (같은 형식)
+  fields?: string; // 응답에 담을 필드만 (예: 'course_name,professor,credits')
+};
+
+export type CoursePage = {
+  items: CourseOut[];
+  nextCursor: string | null; // 없으면 마지막 페이지
 };
 
 export async function listCourses(params: ListCoursesParams = {}): Promise<CourseOut[]> {
@@ -41,7 +51,27 @@ export async function listCourses(params: ListCoursesParams = {}): Promise<Cours
   return request<CourseOut[]>(path, { method: 'GET' });
 }
 
-export async function countCourses(params: Omit<ListCoursesParams, 'limit' | 'skip'> = {}): Promise<number> {
+// 무한 스크롤용: 응답 헤더 X-Next-Cursor 를 다음 요청의 cursor 로 넘긴다
+export async function listCoursesPage(params: ListCoursesParams = {}): Promise<CoursePage> {
+  const qs = new URLSearchParams();
+  Object.entries(params).forEach(([k, v]) => {
+    if (v !== undefined && v !== null && v !== '') qs.append(k, String(v));
+  });
+  const res = await fetch(buildUrl(`/courses${qs.toString() ? `?${qs.toString()}` : ''}`), {
+    credentials: 'include',
+    headers: { "Content-Type": "application/json" },
+  });
+  if (!res.ok) {
+    const msg = await res.text().catch(() => "");
+    throw new Error(`${res.status} ${res.statusText}${msg ? ` - ${msg}` : ""}`);
+  }
+  return {
+    items: (await res.json()) as CourseOut[],
+    nextCursor: res.headers.get('X-Next-Cursor'),
+  };
+}
+
+export async function countCourses(params: Omit<ListCoursesParams, 'limit' | 'skip' | 'cursor' | 'fields'> = {}): Promise<number> {
   const qs = new URLSearchParams();
   Object.entries(params).forEach(([k, v]) => {
     if (v !== undefined && v !== null && v !== '') qs.append(k, String(v));
@@ -50,3 +80,43 @@ export async function countCourses(params: Omit<ListCoursesParams, 'limit' | 'sk
   return request<number>(path, { method: 'GET' });
 }
 
+export type FacetValue = { value: string | number; count: number };
+
+export type CourseSearchResult = {
+  items: CourseOut[];
+  total: number;
+  // group / category / year / major_track / general_type → 값별 개수 (많은 순)
+  facets: Record<string, FacetValue[]>;
+  next_cursor: string | null;
+};
+
+// 목록 + 전체 개수 + 필터 칩 개수를 한 번에
+export async function searchCourses(params: ListCoursesParams = {}): Promise<CourseSearchResult> {
+  const qs = new URLSearchParams();
+  Object.entries(params).forEach(([k, v]) => {
+    if (v !== undefined && v !== null && v !== '') qs.append(k, String(v));
+  });
+  const path = `/courses/search${qs.toString() ? `?${qs.toString()}` : ''}`;
+  return request<CourseSearchResult>(path, { method: 'GET' });
+}
+
+
+export type CourseSuggestion = {
+  text: string;
+  kind: 'course_name' | 'professor' | 'course_code';
+  count: number; // 같은 값을 가진 분반 수
+};
+
+// 검색창 자동완성 (초성 입력 지원)
+export async function suggestCourses(prefix: string, limit = 10): Promise<CourseSuggestion[]> {
+  const qs = new URLSearchParams({ prefix, limit: String(limit) });
+  return request<CourseSuggestion[]>(`/courses/suggest?${qs.toString()}`, { method: 'GET' });
+}
+
+// 과목코드 목록 → 코드별 분반 목록 (없는 코드는 빈 배열), 최대 200개
+export async function batchCourses(codes: string[]): Promise<Record<string, CourseOut[]>> {
+  return request<Record<string, CourseOut[]>>('/courses/batch', {
+    method: 'POST',
+    body: JSON.stringify({ codes }),
+  });
+}
@@ -0,0 +1,45 @@
+import { request } from './client';
+
+export type TimetableGenerateParams = {
+  course_codes: string[]; // 넣고 싶은 과목들 (최대 15개)
+  required_codes?: string[]; // 반드시 넣을 과목
+  max_credits?: number;
+  days_off?: Array<'월' | '화' | '수' | '목' | '금'>;
+  earliest_start?: string; // 예: '10:00'
+  limit?: number;
+};
+
+export type TimetableSection = {
+  course_code: string;
+  course_name?: string;
+  class?: string;
+  professor?: string;
+  timeslot?: string;
+  credits: number;
+  alternatives: string[]; // 같은 시간/학점의 다른 분반
+};
+
+export type GeneratedTimetable = {
+  total_credits: number;
+  course_count: number;
+  days: number; // 등교 요일 수
+  gaps: number; // 수업 사이 빈 30분 칸 수
+  sections: TimetableSection[];
+};
+
+export type TimetableGenerateResult = {
+  timetables: GeneratedTimetable[];
+  complete: boolean; // false면 시간 예산 안에 모든 조합을 다 보지 못함
+  visited: number;
+  elapsed_ms: number;
+  not_found: string[];
+  unscheduled: string[];
+};
+
+// 희망 과목들로 겹치지 않는 시간표 후보 생성
+export async function generateTimetables(params: TimetableGenerateParams): Promise<TimetableGenerateResult> {
+  return request<TimetableGenerateResult>('/timetable/generate', {
+    method: 'POST',
+    body: JSON.stringify(params),
+  });
+}